@@ -0,0 +1,57 @@
+"""Add unique constraint on graph edge endpoints and type
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-01-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fold duplicate edges into the lowest id before adding the constraint
+    op.execute(
+        """
+        UPDATE graph_edges g
+        SET occurrence_count = d.total
+        FROM (
+            SELECT min(id) AS keep_id, sum(occurrence_count) AS total
+            FROM graph_edges
+            GROUP BY source_id, target_id, edge_type
+            HAVING count(*) > 1
+        ) d
+        WHERE g.id = d.keep_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM graph_edges g
+        USING graph_edges k
+        WHERE g.source_id = k.source_id
+          AND g.target_id = k.target_id
+          AND g.edge_type = k.edge_type
+          AND g.id > k.id
+        """
+    )
+    op.create_unique_constraint(
+        'uq_graph_edges_source_target_type',
+        'graph_edges',
+        ['source_id', 'target_id', 'edge_type']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        'uq_graph_edges_source_target_type',
+        'graph_edges',
+        type_='unique'
+    )
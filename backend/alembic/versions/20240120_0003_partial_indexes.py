@@ -0,0 +1,56 @@
+"""Add partial indexes for hot filter paths
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-01-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_trend_active_volume', 'trends', [sa.text('volume DESC')],
+        postgresql_where=sa.text("is_active = 'active'")
+    )
+    op.create_index(
+        'idx_trend_active_growth', 'trends', [sa.text('growth_rate DESC')],
+        postgresql_where=sa.text(
+            "is_active = 'active' AND growth_rate IS NOT NULL"
+        )
+    )
+    op.create_index(
+        'idx_post_unprocessed', 'posts', ['created_at'],
+        postgresql_where=sa.text('is_processed = false')
+    )
+    op.create_index(
+        'idx_datasource_active', 'data_sources', ['id'],
+        postgresql_where=sa.text('is_active = true')
+    )
+    op.create_index(
+        'idx_graphnode_pagerank', 'graph_nodes', [sa.text('pagerank DESC')],
+        postgresql_where=sa.text('pagerank IS NOT NULL')
+    )
+    op.create_index(
+        'idx_graphnode_betweenness', 'graph_nodes',
+        [sa.text('betweenness_centrality DESC')],
+        postgresql_where=sa.text('betweenness_centrality IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_graphnode_betweenness', table_name='graph_nodes')
+    op.drop_index('idx_graphnode_pagerank', table_name='graph_nodes')
+    op.drop_index('idx_datasource_active', table_name='data_sources')
+    op.drop_index('idx_post_unprocessed', table_name='posts')
+    op.drop_index('idx_trend_active_growth', table_name='trends')
+    op.drop_index('idx_trend_active_volume', table_name='trends')
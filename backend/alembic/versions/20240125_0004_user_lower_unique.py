@@ -0,0 +1,33 @@
+"""Add case-insensitive unique indexes on user email and username
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-01-25 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'users_email_lower_idx', 'users', [sa.text('lower(email)')],
+        unique=True
+    )
+    op.create_index(
+        'users_username_lower_idx', 'users', [sa.text('lower(username)')],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('users_username_lower_idx', table_name='users')
+    op.drop_index('users_email_lower_idx', table_name='users')
@@ -0,0 +1,68 @@
+"""Server-side timestamp defaults and timezone-aware datetime columns
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-01-30 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMPED_TABLES = (
+    'users', 'data_sources', 'authors', 'posts', 'analyses',
+    'analysis_results', 'trends', 'graph_nodes', 'graph_edges',
+    'dashboards',
+)
+
+# Extra naive columns converted alongside the timestamps
+EXTRA_COLUMNS = (
+    ('posts', 'posted_at', True),
+    ('trends', 'peak_time', True),
+)
+
+
+def _to_timestamptz(table: str, column: str, nullable: bool) -> None:
+    # Existing values were written as naive UTC
+    op.alter_column(
+        table, column,
+        type_=sa.DateTime(timezone=True),
+        existing_type=sa.DateTime(),
+        existing_nullable=nullable,
+        postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+    )
+
+
+def _to_timestamp(table: str, column: str, nullable: bool) -> None:
+    op.alter_column(
+        table, column,
+        type_=sa.DateTime(),
+        existing_type=sa.DateTime(timezone=True),
+        existing_nullable=nullable,
+        postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+    )
+
+
+def upgrade() -> None:
+    for table in TIMESTAMPED_TABLES:
+        for column in ('created_at', 'updated_at'):
+            _to_timestamptz(table, column, False)
+            op.alter_column(table, column, server_default=sa.func.now())
+    for table, column, nullable in EXTRA_COLUMNS:
+        _to_timestamptz(table, column, nullable)
+
+
+def downgrade() -> None:
+    for table, column, nullable in EXTRA_COLUMNS:
+        _to_timestamp(table, column, nullable)
+    for table in TIMESTAMPED_TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column, server_default=None)
+            _to_timestamp(table, column, False)
@@ -0,0 +1,58 @@
+"""Convert string timestamp columns to timestamptz
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2024-02-05 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STRING_TIMESTAMPS = (
+    ('analyses', 'started_at'),
+    ('analyses', 'completed_at'),
+    ('data_sources', 'last_sync_at'),
+    ('graph_edges', 'first_seen'),
+    ('graph_edges', 'last_seen'),
+)
+
+
+def upgrade() -> None:
+    for table, column in STRING_TIMESTAMPS:
+        # Stored values are naive UTC ISO strings; blanks become NULL
+        op.alter_column(
+            table, column,
+            type_=sa.DateTime(timezone=True),
+            existing_type=sa.String(length=50),
+            existing_nullable=True,
+            postgresql_using=(
+                f"NULLIF({column}, '')::timestamp AT TIME ZONE 'UTC'"
+            )
+        )
+    op.create_index(
+        op.f('ix_analyses_started_at'), 'analyses', ['started_at']
+    )
+    op.create_index(
+        op.f('ix_graph_edges_last_seen'), 'graph_edges', ['last_seen']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_graph_edges_last_seen'), table_name='graph_edges')
+    op.drop_index(op.f('ix_analyses_started_at'), table_name='analyses')
+    for table, column in STRING_TIMESTAMPS:
+        op.alter_column(
+            table, column,
+            type_=sa.String(length=50),
+            existing_type=sa.DateTime(timezone=True),
+            existing_nullable=True,
+            postgresql_using=f"{column}::text"
+        )
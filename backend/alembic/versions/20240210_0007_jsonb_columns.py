@@ -0,0 +1,73 @@
+"""Convert JSON columns to JSONB and add GIN indexes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2024-02-10 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = {
+    'authors': ('extra_data',),
+    'data_sources': ('credentials', 'collection_config'),
+    'graph_nodes': ('attributes',),
+    'analyses': ('config', 'query_filters', 'summary'),
+    'dashboards': ('layout', 'widgets', 'filters'),
+    'graph_edges': ('attributes',),
+    'posts': ('media_urls', 'hashtags', 'mentions'),
+    'analysis_results': (
+        'emotions', 'keywords', 'topics', 'entities', 'raw_results'
+    ),
+    'trends': (
+        'keywords', 'hashtags', 'sentiment_distribution', 'time_series',
+        'geo_distribution', 'top_authors', 'top_posts'
+    ),
+}
+
+GIN_INDEXES = (
+    ('ix_analysis_results_emotions_gin', 'analysis_results', 'emotions'),
+    ('ix_posts_hashtags_gin', 'posts', 'hashtags'),
+    ('ix_trends_keywords_gin', 'trends', 'keywords'),
+)
+
+
+def upgrade() -> None:
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table, column,
+                type_=postgresql.JSONB(),
+                existing_type=sa.JSON(),
+                existing_nullable=True,
+                postgresql_using=f'{column}::jsonb'
+            )
+    for name, table, column in GIN_INDEXES:
+        op.create_index(
+            name, table, [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'jsonb_path_ops'}
+        )
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(GIN_INDEXES):
+        op.drop_index(name, table_name=table)
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table, column,
+                type_=sa.JSON(),
+                existing_type=postgresql.JSONB(),
+                existing_nullable=True,
+                postgresql_using=f'{column}::json'
+            )
@@ -0,0 +1,36 @@
+"""Add composite indexes for joint filter predicates
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2024-02-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_role_id', 'users', ['role', 'id'])
+    op.create_index(
+        'ix_analyses_user_status', 'analyses', ['user_id', 'status']
+    )
+    op.create_index(
+        'ix_posts_processed_platform', 'posts', ['is_processed', 'platform']
+    )
+    op.create_index(
+        'ix_edges_src_type', 'graph_edges', ['source_id', 'edge_type']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_edges_src_type', table_name='graph_edges')
+    op.drop_index('ix_posts_processed_platform', table_name='posts')
+    op.drop_index('ix_analyses_user_status', table_name='analyses')
+    op.drop_index('ix_users_role_id', table_name='users')
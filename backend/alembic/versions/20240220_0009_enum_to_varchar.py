@@ -0,0 +1,66 @@
+"""Store enum columns as VARCHAR with CHECK constraints
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2024-02-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, enum type, check constraint, allowed values)
+ENUM_COLUMNS = (
+    ('users', 'role', 'userrole', 'ck_users_role',
+     ('admin', 'analyst', 'viewer')),
+    ('data_sources', 'platform', 'sourceplatform', 'ck_data_sources_platform',
+     ('twitter', 'instagram', 'telegram', 'linkedin', 'youtube', 'news',
+      'forum', 'custom')),
+    ('analyses', 'analysis_type', 'analysistype', 'ck_analyses_analysis_type',
+     ('sentiment', 'emotion', 'summarization', 'topic_modeling',
+      'keyword_extraction', 'entity_recognition', 'trend_detection',
+      'graph_analysis', 'full')),
+    ('analyses', 'status', 'analysisstatus', 'ck_analyses_status',
+     ('pending', 'queued', 'processing', 'completed', 'failed',
+      'cancelled')),
+)
+
+
+def upgrade() -> None:
+    for table, column, type_name, check_name, values in ENUM_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.String(length=32),
+            existing_type=sa.Enum(*values, name=type_name),
+            existing_nullable=False,
+            postgresql_using=f'{column}::text'
+        )
+        op.execute(f'DROP TYPE IF EXISTS {type_name}')
+        allowed = ', '.join(f"'{v}'" for v in values)
+        op.create_check_constraint(check_name, table, f'{column} IN ({allowed})')
+    op.create_index(
+        'idx_analysis_pending', 'analyses', ['created_at'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_analysis_pending', table_name='analyses')
+    for table, column, type_name, check_name, values in reversed(ENUM_COLUMNS):
+        op.drop_constraint(check_name, table, type_='check')
+        enum_type = sa.Enum(*values, name=type_name)
+        enum_type.create(op.get_bind(), checkfirst=True)
+        op.alter_column(
+            table, column,
+            type_=enum_type,
+            existing_type=sa.String(length=32),
+            existing_nullable=False,
+            postgresql_using=f'{column}::{type_name}'
+        )
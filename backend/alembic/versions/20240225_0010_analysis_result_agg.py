@@ -0,0 +1,114 @@
+"""Add analysis_result_agg rollup maintained by triggers
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2024-02-25 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Transition tables allow only one event per trigger
+TRIGGERS = (
+    ('analysis_result_agg_ins', 'INSERT', 'NEW TABLE AS new_rows'),
+    ('analysis_result_agg_upd', 'UPDATE',
+     'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('analysis_result_agg_del', 'DELETE', 'OLD TABLE AS old_rows'),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'analysis_result_agg',
+        sa.Column('sentiment_label', sa.String(length=20), nullable=False),
+        sa.Column('dominant_emotion', sa.String(length=50), nullable=False),
+        sa.Column('result_count', sa.BigInteger(), nullable=False),
+        sa.Column('score_sum', sa.Float(), nullable=False),
+        sa.Column('score_count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('sentiment_label', 'dominant_emotion')
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION analysis_result_agg_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO analysis_result_agg AS a (
+                    sentiment_label, dominant_emotion,
+                    result_count, score_sum, score_count
+                )
+                SELECT coalesce(sentiment_label, ''), coalesce(dominant_emotion, ''),
+                       count(*), coalesce(sum(sentiment_score), 0),
+                       count(sentiment_score)
+                FROM new_rows
+                GROUP BY 1, 2
+                ORDER BY 1, 2
+                ON CONFLICT (sentiment_label, dominant_emotion) DO UPDATE SET
+                    result_count = a.result_count + EXCLUDED.result_count,
+                    score_sum = a.score_sum + EXCLUDED.score_sum,
+                    score_count = a.score_count + EXCLUDED.score_count;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                PERFORM 1 FROM analysis_result_agg
+                WHERE (sentiment_label, dominant_emotion) IN (
+                    SELECT coalesce(sentiment_label, ''), coalesce(dominant_emotion, '')
+                    FROM old_rows
+                )
+                ORDER BY sentiment_label, dominant_emotion
+                FOR UPDATE;
+                UPDATE analysis_result_agg AS a SET
+                    result_count = a.result_count - o.result_count,
+                    score_sum = a.score_sum - o.score_sum,
+                    score_count = a.score_count - o.score_count
+                FROM (
+                    SELECT coalesce(sentiment_label, '') AS sentiment_label,
+                           coalesce(dominant_emotion, '') AS dominant_emotion,
+                           count(*) AS result_count,
+                           coalesce(sum(sentiment_score), 0) AS score_sum,
+                           count(sentiment_score) AS score_count
+                    FROM old_rows
+                    GROUP BY 1, 2
+                ) AS o
+                WHERE a.sentiment_label = o.sentiment_label
+                  AND a.dominant_emotion = o.dominant_emotion;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Block writes so no result lands between the backfill and the triggers
+    op.execute('LOCK TABLE analysis_results IN SHARE ROW EXCLUSIVE MODE')
+    op.execute(
+        """
+        INSERT INTO analysis_result_agg (
+            sentiment_label, dominant_emotion,
+            result_count, score_sum, score_count
+        )
+        SELECT coalesce(sentiment_label, ''), coalesce(dominant_emotion, ''),
+               count(*), coalesce(sum(sentiment_score), 0),
+               count(sentiment_score)
+        FROM analysis_results
+        GROUP BY 1, 2
+        """
+    )
+    for name, event, tables in TRIGGERS:
+        op.execute(
+            f'CREATE TRIGGER {name} AFTER {event} ON analysis_results '
+            f'REFERENCING {tables} FOR EACH STATEMENT '
+            f'EXECUTE FUNCTION analysis_result_agg_apply()'
+        )
+
+
+def downgrade() -> None:
+    for name, _, _ in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {name} ON analysis_results')
+    op.execute('DROP FUNCTION IF EXISTS analysis_result_agg_apply()')
+    op.drop_table('analysis_result_agg')
@@ -1,28 +1,77 @@
-from typing import AsyncGenerator, Optional
-from fastapi import Depends, HTTPException, status
+import asyncio
+from typing import Any, Callable, Iterable, Optional, Type, TypeVar
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import AsyncSessionLocal
+# Endpoints share app.database.get_db, which bumps cache table versions
+from app.database import get_db
 from app.core.security import decode_token
 from app.models.user import User, UserRole
-from app.crud import user as user_crud
+from app.services.auth_service import auth_service
 
 # Security scheme
 security = HTTPBearer()
 
+SchemaType = TypeVar("SchemaType", bound=BaseModel)
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency for getting async database session."""
-    async with AsyncSessionLocal() as session:
+# Bodies above this size are validated off the event loop
+JSON_BODY_OFFLOAD_BYTES = 256 * 1024
+
+
+def json_body(schema: Type[SchemaType]) -> Callable:
+    """
+    Dependency that validates the raw JSON body with pydantic-core.
+    
+    Skips FastAPI's json.loads-to-dict step, which dominates on large bulk
+    payloads, and validates large bodies in a worker thread so other
+    requests keep being served. Pair with `json_body_openapi(schema)` to
+    keep the docs.
+    """
+    async def parse(request: Request) -> SchemaType:
+        body = await request.body()
         try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+            if len(body) > JSON_BODY_OFFLOAD_BYTES:
+                return await asyncio.to_thread(schema.model_validate_json, body)
+            return schema.model_validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError([
+                {**err, "loc": ("body", *err["loc"])}
+                for err in e.errors(include_url=False, include_context=False)
+            ])
+    
+    return parse
+
+
+def json_body_openapi(schema: Type[BaseModel]) -> dict:
+    """`openapi_extra` describing a body parsed by `json_body(schema)`."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": schema.model_json_schema(
+                        ref_template="#/components/schemas/{model}"
+                    )
+                }
+            },
+        }
+    }
+
+
+def adapter_response(adapter: TypeAdapter, items: Iterable[Any]) -> Response:
+    """
+    Serialize trusted schema instances with a prebuilt list adapter.
+    
+    Returning a Response skips FastAPI's per-request response_model
+    re-validation; the route's response_model still drives the docs.
+    """
+    return Response(
+        content=adapter.dump_json(list(items)),
+        media_type="application/json"
+    )
 
 
 async def get_current_user(
@@ -36,20 +85,9 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    token = credentials.credentials
-    payload = decode_token(token)
-    
-    if payload is None:
-        raise credentials_exception
-    
-    if payload.get("type") != "access":
-        raise credentials_exception
-    
-    user_id = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
-    
-    user = await user_crud.get(db, int(user_id))
+    user = await auth_service.get_token_user(
+        db, token=credentials.credentials
+    )
     
     if user is None:
         raise credentials_exception
@@ -150,11 +188,6 @@ class PaginationParams:
     ):
         self.page = max(1, page)
         self.page_size = min(max(1, page_size), max_page_size)
-    
-    @property
-    def skip(self) -> int:
-        return (self.page - 1) * self.page_size
-    
-    @property
-    def limit(self) -> int:
-        return self.page_size
+        # Plain attributes: read on every paginated query
+        self.skip = (self.page - 1) * self.page_size
+        self.limit = self.page_size
@@ -1,9 +1,18 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
 
-from app.api.deps import get_db, get_current_user, get_current_analyst, PaginationParams
+from app.api.deps import (
+    get_db,
+    get_current_user,
+    get_current_analyst,
+    adapter_response,
+    PaginationParams
+)
 from app.crud import analysis as analysis_crud
+from app.database import AsyncSessionLocal, run_after_commit
 from app.crud import analysis_result as result_crud
 from app.models.user import User
 from app.models.analysis import AnalysisType, AnalysisStatus
@@ -19,7 +28,8 @@ from app.schemas.analysis import (
 )
 from app.schemas.analysis_result import (
     AnalysisResultResponse,
-    AnalysisSummary
+    AnalysisSummary,
+    ANALYSIS_RESULT_LIST_ADAPTER
 )
 from app.schemas.base import MessageResponse
 
@@ -59,7 +69,7 @@ async def get_analyses(
             limit=pagination.limit
         )
     
-    return [AnalysisResponse.model_validate(a) for a in analyses]
+    return [AnalysisResponse.from_orm_trusted(a) for a in analyses]
 
 
 @router.get("/stats")
@@ -84,7 +94,7 @@ async def get_pending_analyses(
     Get pending analyses (analyst only).
     """
     analyses = await analysis_crud.get_pending(db, limit=limit)
-    return [AnalysisResponse.model_validate(a) for a in analyses]
+    return [AnalysisResponse.from_orm_trusted(a) for a in analyses]
 
 
 @router.get("/{analysis_id}", response_model=AnalysisWithUser)
@@ -103,7 +113,7 @@ async def get_analysis(
             detail="Analysis not found"
         )
     
-    return AnalysisWithUser.model_validate(analysis)
+    return AnalysisWithUser.from_orm_trusted(analysis)
 
 
 @router.get("/{analysis_id}/progress")
@@ -139,10 +149,18 @@ async def get_analysis_results(
     analysis_id: int,
     db: AsyncSession = Depends(get_db),
     pagination: PaginationParams = Depends(),
+    layout: Literal["rows", "columnar"] = Query(
+        default="rows",
+        alias="format",
+        description="`columnar` returns numeric fields one list per column"
+    ),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get results for an analysis.
+    
+    With `format=columnar` the numeric fields are returned as an
+    AnalysisResultColumnar object for bulk consumers.
     """
     analysis = await analysis_crud.get(db, analysis_id)
     if not analysis:
@@ -151,6 +169,15 @@ async def get_analysis_results(
             detail="Analysis not found"
         )
     
+    if layout == "columnar":
+        columns = await result_crud.get_columns_by_analysis(
+            db,
+            analysis_id=analysis_id,
+            skip=pagination.skip,
+            limit=pagination.limit
+        )
+        return ORJSONResponse(columns)
+    
     results = await result_crud.get_by_analysis(
         db,
         analysis_id=analysis_id,
@@ -158,7 +185,10 @@ async def get_analysis_results(
         limit=pagination.limit
     )
     
-    return [AnalysisResultResponse.model_validate(r) for r in results]
+    return adapter_response(
+        ANALYSIS_RESULT_LIST_ADAPTER,
+        map(AnalysisResultResponse.from_orm_trusted, results)
+    )
 
 
 @router.get("/{analysis_id}/summary")
@@ -180,8 +210,8 @@ async def get_analysis_summary(
     if analysis.summary:
         return analysis.summary
     
-    # Generate summary if not exists
-    summary = await analysis_service.generate_summary(db, analysis_id=analysis_id)
+    # Live summary while the analysis has none stored yet
+    summary = await analysis_service.get_summary(db, analysis_id=analysis_id)
     return summary
 
 
@@ -201,7 +231,7 @@ async def create_analysis(
         user_id=current_user.id
     )
     
-    return AnalysisResponse.model_validate(analysis)
+    return AnalysisResponse.from_orm_trusted(analysis)
 
 
 @router.post("/{analysis_id}/start", response_model=MessageResponse)
@@ -221,22 +251,44 @@ async def start_analysis(
             detail="Analysis not found"
         )
     
-    if analysis.status != AnalysisStatus.PENDING:
+    # A QUEUED analysis may be started again in case its task was lost;
+    # the worker's claim lets only one queued task run it
+    if analysis.status not in (AnalysisStatus.PENDING, AnalysisStatus.QUEUED):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Analysis is already {analysis.status.value}"
         )
     
-    # Queue task for processing
     config_dict = config.model_dump() if config else None
-    process_analysis.delay(analysis_id, config_dict)
     
-    # Update status to queued
-    await analysis_crud.update_status(
-        db,
-        analysis_id=analysis_id,
-        status=AnalysisStatus.QUEUED
-    )
+    async def enqueue() -> None:
+        try:
+            process_analysis.delay(analysis_id, config_dict)
+        except Exception as e:
+            # Nothing will claim it; put it back so it can be started again
+            logger.error(f"Failed to queue analysis {analysis_id}: {e}")
+            async with AsyncSessionLocal() as session:
+                await analysis_crud.update_status(
+                    session,
+                    analysis_id=analysis_id,
+                    status=AnalysisStatus.PENDING,
+                    from_status=AnalysisStatus.QUEUED
+                )
+                await session.commit()
+    
+    if analysis.status == AnalysisStatus.QUEUED:
+        # Rewriting QUEUED could overwrite a worker's claim
+        await enqueue()
+    else:
+        await analysis_crud.update_status(
+            db,
+            analysis_id=analysis_id,
+            status=AnalysisStatus.QUEUED,
+            from_status=AnalysisStatus.PENDING
+        )
+        # Queue the task once QUEUED is committed; the worker only claims
+        # PENDING/QUEUED analyses, so this write must not land after its claim
+        run_after_commit(db, enqueue)
     
     return MessageResponse(message="Analysis queued for processing")
 
@@ -279,7 +331,7 @@ async def update_analysis(
         )
     
     updated = await analysis_crud.update(db, db_obj=analysis, obj_in=analysis_in)
-    return AnalysisResponse.model_validate(updated)
+    return AnalysisResponse.from_orm_trusted(updated)
 
 
 @router.delete("/{analysis_id}", response_model=MessageResponse)
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_user
 from app.services.auth_service import auth_service
+from app.services.dashboard_service import dashboard_service
 from app.schemas.auth import (
     LoginRequest,
     TokenResponse,
@@ -18,6 +19,7 @@ router = APIRouter()
 @router.post("/login", response_model=AuthResponse)
 async def login(
     login_data: LoginRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -39,8 +41,11 @@ async def login(
     
     tokens = await auth_service.create_tokens(user)
     
+    # Dashboard is usually the next page; fill its cache after responding
+    background_tasks.add_task(dashboard_service.warm_default_widgets)
+    
     return AuthResponse(
-        user=UserResponse.model_validate(user),
+        user=UserResponse.from_orm_trusted(user),
         tokens=tokens
     )
 
@@ -64,7 +69,7 @@ async def register(
     tokens = await auth_service.create_tokens(user)
     
     return AuthResponse(
-        user=UserResponse.model_validate(user),
+        user=UserResponse.from_orm_trusted(user),
         tokens=tokens
     )
 
@@ -99,7 +104,7 @@ async def get_current_user_info(
     """
     Get current authenticated user information.
     """
-    return UserResponse.model_validate(current_user)
+    return UserResponse.from_orm_trusted(current_user)
 
 
 @router.post("/logout", response_model=MessageResponse)
@@ -2,14 +2,15 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_user, PaginationParams
+from app.api.deps import get_db, get_current_user, adapter_response, PaginationParams
 from app.crud import author as author_crud
 from app.models.user import User
 from app.schemas.author import (
     AuthorCreate,
     AuthorUpdate,
     AuthorResponse,
-    AuthorWithMetrics
+    AuthorWithMetrics,
+    AUTHOR_LIST_ADAPTER
 )
 from app.schemas.base import MessageResponse
 
@@ -42,7 +43,9 @@ async def get_authors(
             limit=pagination.limit
         )
     
-    return [AuthorResponse.model_validate(a) for a in authors]
+    return adapter_response(
+        AUTHOR_LIST_ADAPTER, map(AuthorResponse.from_orm_trusted, authors)
+    )
 
 
 @router.get("/top/followers", response_model=List[AuthorResponse])
@@ -60,7 +63,9 @@ async def get_top_authors_by_followers(
         platform=platform,
         limit=limit
     )
-    return [AuthorResponse.model_validate(a) for a in authors]
+    return adapter_response(
+        AUTHOR_LIST_ADAPTER, map(AuthorResponse.from_orm_trusted, authors)
+    )
 
 
 @router.get("/top/pagerank", response_model=List[AuthorResponse])
@@ -78,7 +83,9 @@ async def get_top_authors_by_pagerank(
         platform=platform,
         limit=limit
     )
-    return [AuthorResponse.model_validate(a) for a in authors]
+    return adapter_response(
+        AUTHOR_LIST_ADAPTER, map(AuthorResponse.from_orm_trusted, authors)
+    )
 
 
 @router.get("/top/influence", response_model=List[AuthorResponse])
@@ -96,7 +103,9 @@ async def get_top_authors_by_influence(
         platform=platform,
         limit=limit
     )
-    return [AuthorResponse.model_validate(a) for a in authors]
+    return adapter_response(
+        AUTHOR_LIST_ADAPTER, map(AuthorResponse.from_orm_trusted, authors)
+    )
 
 
 @router.get("/stats")
@@ -132,7 +141,7 @@ async def get_author(
             detail="Author not found"
         )
     
-    return AuthorResponse.model_validate(author)
+    return AuthorResponse.from_orm_trusted(author)
 
 
 @router.post("", response_model=AuthorResponse)
@@ -157,7 +166,7 @@ async def create_author(
         )
     
     author = await author_crud.create(db, obj_in=author_in)
-    return AuthorResponse.model_validate(author)
+    return AuthorResponse.from_orm_trusted(author)
 
 
 @router.put("/{author_id}", response_model=AuthorResponse)
@@ -178,7 +187,7 @@ async def update_author(
         )
     
     updated = await author_crud.update(db, db_obj=author, obj_in=author_in)
-    return AuthorResponse.model_validate(updated)
+    return AuthorResponse.from_orm_trusted(updated)
 
 
 @router.delete("/{author_id}", response_model=MessageResponse)
@@ -103,7 +103,7 @@ async def get_dashboards(
         skip=pagination.skip,
         limit=pagination.limit
     )
-    return [DashboardResponse.model_validate(d) for d in dashboards]
+    return [DashboardResponse.from_orm_trusted(d) for d in dashboards]
 
 
 @router.get("/public", response_model=List[DashboardResponse])
@@ -120,7 +120,7 @@ async def get_public_dashboards(
         skip=pagination.skip,
         limit=pagination.limit
     )
-    return [DashboardResponse.model_validate(d) for d in dashboards]
+    return [DashboardResponse.from_orm_trusted(d) for d in dashboards]
 
 
 @router.get("/default", response_model=DashboardResponse)
@@ -140,7 +140,7 @@ async def get_default_dashboard(
             user_id=current_user.id
         )
     
-    return DashboardResponse.model_validate(dashboard)
+    return DashboardResponse.from_orm_trusted(dashboard)
 
 
 @router.get("/{dashboard_id}", response_model=DashboardResponse)
@@ -166,7 +166,35 @@ async def get_dashboard(
             detail="Access denied"
         )
     
-    return DashboardResponse.model_validate(dashboard)
+    return DashboardResponse.from_orm_trusted(dashboard)
+
+
+@router.get("/{dashboard_id}/data", response_model=List[WidgetData])
+async def get_dashboard_data(
+    dashboard_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get data for every widget of a dashboard, fetched concurrently.
+    """
+    dashboard = await dashboard_crud.get(db, dashboard_id)
+    if not dashboard:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dashboard not found"
+        )
+    
+    if dashboard.user_id != current_user.id and not dashboard.is_public:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    return await dashboard_service.get_widgets_data(
+        db,
+        widgets=dashboard.widgets or []
+    )
 
 
 @router.post("", response_model=DashboardResponse)
@@ -183,7 +211,7 @@ async def create_dashboard(
         obj_in=dashboard_in,
         user_id=current_user.id
     )
-    return DashboardResponse.model_validate(dashboard)
+    return DashboardResponse.from_orm_trusted(dashboard)
 
 
 @router.put("/{dashboard_id}", response_model=DashboardResponse)
@@ -210,7 +238,7 @@ async def update_dashboard(
         )
     
     updated = await dashboard_crud.update(db, db_obj=dashboard, obj_in=dashboard_in)
-    return DashboardResponse.model_validate(updated)
+    return DashboardResponse.from_orm_trusted(updated)
 
 
 @router.post("/{dashboard_id}/set-default", response_model=DashboardResponse)
@@ -234,7 +262,7 @@ async def set_default_dashboard(
             detail="Dashboard not found or not yours"
         )
     
-    return DashboardResponse.model_validate(dashboard)
+    return DashboardResponse.from_orm_trusted(dashboard)
 
 
 @router.post("/{dashboard_id}/duplicate", response_model=DashboardResponse)
@@ -260,7 +288,7 @@ async def duplicate_dashboard(
             detail="Dashboard not found"
         )
     
-    return DashboardResponse.model_validate(dashboard)
+    return DashboardResponse.from_orm_trusted(dashboard)
 
 
 @router.delete("/{dashboard_id}", response_model=MessageResponse)
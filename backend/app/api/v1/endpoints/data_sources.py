@@ -53,7 +53,7 @@ async def get_data_sources(
             limit=pagination.limit
         )
     
-    return [DataSourceResponse.model_validate(s) for s in sources]
+    return [DataSourceResponse.from_orm_trusted(s) for s in sources]
 
 
 @router.get("/{source_id}", response_model=DataSourceResponse)
@@ -72,7 +72,7 @@ async def get_data_source(
             detail="Data source not found"
         )
     
-    return DataSourceResponse.model_validate(source)
+    return DataSourceResponse.from_orm_trusted(source)
 
 
 @router.get("/{source_id}/stats", response_model=DataSourceStats)
@@ -121,7 +121,7 @@ async def create_data_source(
         )
     
     source = await data_source_crud.create(db, obj_in=source_in)
-    return DataSourceResponse.model_validate(source)
+    return DataSourceResponse.from_orm_trusted(source)
 
 
 @router.put("/{source_id}", response_model=DataSourceResponse)
@@ -142,7 +142,7 @@ async def update_data_source(
         )
     
     updated = await data_source_crud.update(db, db_obj=source, obj_in=source_in)
-    return DataSourceResponse.model_validate(updated)
+    return DataSourceResponse.from_orm_trusted(updated)
 
 
 @router.delete("/{source_id}", response_model=MessageResponse)
@@ -181,7 +181,7 @@ async def activate_data_source(
         )
     
     source = await data_source_crud.activate(db, db_obj=source)
-    return DataSourceResponse.model_validate(source)
+    return DataSourceResponse.from_orm_trusted(source)
 
 
 @router.post("/{source_id}/deactivate", response_model=DataSourceResponse)
@@ -201,4 +201,4 @@ async def deactivate_data_source(
         )
     
     source = await data_source_crud.deactivate(db, db_obj=source)
-    return DataSourceResponse.model_validate(source)
+    return DataSourceResponse.from_orm_trusted(source)
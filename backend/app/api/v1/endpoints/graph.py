@@ -43,12 +43,13 @@ async def get_graph_data(
 @router.get("/stats", response_model=GraphStats)
 async def get_graph_stats(
     db: AsyncSession = Depends(get_db),
+    exact: bool = Query(default=False, description="Exact row counts instead of estimates"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get graph statistics.
     """
-    stats = await graph_service.get_stats(db)
+    stats = await graph_service.get_stats(db, exact=exact)
     return stats
 
 
@@ -76,7 +77,7 @@ async def get_nodes(
             limit=pagination.limit
         )
     
-    return [GraphNodeResponse.model_validate(n) for n in nodes]
+    return [GraphNodeResponse.from_orm_trusted(n) for n in nodes]
 
 
 @router.get("/nodes/top/pagerank", response_model=List[GraphNodeResponse])
@@ -94,7 +95,7 @@ async def get_top_nodes_by_pagerank(
         node_type=node_type,
         limit=limit
     )
-    return [GraphNodeResponse.model_validate(n) for n in nodes]
+    return [GraphNodeResponse.from_orm_trusted(n) for n in nodes]
 
 
 @router.get("/nodes/top/degree", response_model=List[GraphNodeResponse])
@@ -112,7 +113,7 @@ async def get_top_nodes_by_degree(
         node_type=node_type,
         limit=limit
     )
-    return [GraphNodeResponse.model_validate(n) for n in nodes]
+    return [GraphNodeResponse.from_orm_trusted(n) for n in nodes]
 
 
 @router.get("/nodes/top/betweenness", response_model=List[GraphNodeResponse])
@@ -125,7 +126,7 @@ async def get_top_nodes_by_betweenness(
     Get top nodes by betweenness centrality.
     """
     nodes = await node_crud.get_top_by_betweenness(db, limit=limit)
-    return [GraphNodeResponse.model_validate(n) for n in nodes]
+    return [GraphNodeResponse.from_orm_trusted(n) for n in nodes]
 
 
 @router.get("/nodes/community/{community_id}", response_model=List[GraphNodeResponse])
@@ -144,7 +145,7 @@ async def get_nodes_by_community(
         skip=pagination.skip,
         limit=pagination.limit
     )
-    return [GraphNodeResponse.model_validate(n) for n in nodes]
+    return [GraphNodeResponse.from_orm_trusted(n) for n in nodes]
 
 
 @router.get("/nodes/{node_id}", response_model=GraphNodeResponse)
@@ -163,7 +164,7 @@ async def get_node(
             detail="Node not found"
         )
     
-    return GraphNodeResponse.model_validate(node)
+    return GraphNodeResponse.from_orm_trusted(node)
 
 
 @router.get("/edges", response_model=List[GraphEdgeResponse])
@@ -176,21 +177,12 @@ async def get_edges(
     """
     Get graph edges.
     """
-    if edge_type:
-        edges = await edge_crud.get_by_type(
-            db,
-            edge_type=edge_type,
-            skip=pagination.skip,
-            limit=pagination.limit
-        )
-    else:
-        edges = await edge_crud.get_multi(
-            db,
-            skip=pagination.skip,
-            limit=pagination.limit
-        )
-    
-    return [GraphEdgeResponse.model_validate(e) for e in edges]
+    return await edge_crud.get_multi_core(
+        db,
+        edge_type=edge_type,
+        skip=pagination.skip,
+        limit=pagination.limit
+    )
 
 
 @router.post("/build/hashtag-network", response_model=MessageResponse)
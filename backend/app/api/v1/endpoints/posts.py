@@ -1,18 +1,29 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_user, get_current_analyst, PaginationParams
+from app.api.deps import (
+    get_db,
+    get_current_user,
+    get_current_analyst,
+    adapter_response,
+    json_body,
+    json_body_openapi,
+    PaginationParams
+)
 from app.crud import post as post_crud
 from app.models.user import User
 from app.schemas.post import (
     PostCreate,
     PostUpdate,
     PostResponse,
+    PostResponseEpoch,
     PostWithRelations,
     PostBulkCreate,
-    PostFilter
+    PostFilter,
+    POST_LIST_ADAPTER
 )
 from app.schemas.base import MessageResponse
 
@@ -31,10 +42,17 @@ async def get_posts(
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
     search: Optional[str] = None,
+    ts_mode: Literal["iso", "epoch"] = Query(
+        default="iso",
+        description="Timestamp format: ISO 8601 strings or integer epoch seconds"
+    ),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get posts with filtering options.
+    
+    With `ts_mode=epoch` timestamps are returned as integer epoch seconds
+    (see PostResponseEpoch) for compact feeds.
     """
     filters = PostFilter(
         platform=platform,
@@ -47,14 +65,16 @@ async def get_posts(
         search=search
     )
     
-    posts = await post_crud.get_filtered(
+    rows = await post_crud.get_filtered_core(
         db,
         filters=filters,
         skip=pagination.skip,
         limit=pagination.limit
     )
-    
-    return [PostResponse.model_validate(p) for p in posts]
+    if ts_mode == "epoch":
+        # Rows are already plain dicts; skip response_model re-validation
+        return ORJSONResponse([PostResponseEpoch.to_epoch(r) for r in rows])
+    return rows
 
 
 @router.get("/stats")
@@ -83,7 +103,9 @@ async def get_unprocessed_posts(
         skip=pagination.skip,
         limit=pagination.limit
     )
-    return [PostResponse.model_validate(p) for p in posts]
+    return adapter_response(
+        POST_LIST_ADAPTER, map(PostResponse.from_orm_trusted, posts)
+    )
 
 
 @router.get("/search", response_model=List[PostResponse])
@@ -97,14 +119,13 @@ async def search_posts(
     """
     Search posts by content.
     """
-    posts = await post_crud.search(
+    return await post_crud.search_core(
         db,
         query_str=q,
         platform=platform,
         skip=pagination.skip,
         limit=pagination.limit
     )
-    return [PostResponse.model_validate(p) for p in posts]
 
 
 @router.get("/by-hashtag/{hashtag}", response_model=List[PostResponse])
@@ -123,7 +144,9 @@ async def get_posts_by_hashtag(
         skip=pagination.skip,
         limit=pagination.limit
     )
-    return [PostResponse.model_validate(p) for p in posts]
+    return adapter_response(
+        POST_LIST_ADAPTER, map(PostResponse.from_orm_trusted, posts)
+    )
 
 
 @router.get("/{post_id}", response_model=PostWithRelations)
@@ -142,7 +165,7 @@ async def get_post(
             detail="Post not found"
         )
     
-    return PostWithRelations.model_validate(post)
+    return PostWithRelations.from_orm_trusted(post)
 
 
 @router.post("", response_model=PostResponse)
@@ -155,23 +178,27 @@ async def create_post(
     Create new post.
     """
     # Check if exists
-    existing = await post_crud.get_by_platform_id(
+    exists = await post_crud.exists_by_platform_id(
         db,
         platform_id=post_in.platform_id
     )
-    if existing:
+    if exists:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Post already exists"
         )
     
     post = await post_crud.create(db, obj_in=post_in)
-    return PostResponse.model_validate(post)
+    return PostResponse.from_orm_trusted(post)
 
 
-@router.post("/bulk", response_model=dict)
+@router.post(
+    "/bulk",
+    response_model=dict,
+    openapi_extra=json_body_openapi(PostBulkCreate)
+)
 async def bulk_create_posts(
-    bulk_in: PostBulkCreate,
+    bulk_in: PostBulkCreate = Depends(json_body(PostBulkCreate)),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_analyst)
 ):
@@ -208,7 +235,7 @@ async def update_post(
         )
     
     updated = await post_crud.update(db, db_obj=post, obj_in=post_in)
-    return PostResponse.model_validate(updated)
+    return PostResponse.from_orm_trusted(updated)
 
 
 @router.delete("/{post_id}", response_model=MessageResponse)
@@ -42,7 +42,7 @@ async def get_trends(
             limit=pagination.limit
         )
     
-    return [TrendResponse.model_validate(t) for t in trends]
+    return [TrendResponse.from_orm_trusted(t) for t in trends]
 
 
 @router.get("/summary")
@@ -142,7 +142,7 @@ async def get_top_trends_by_volume(
     Get top trends by volume.
     """
     trends = await trend_crud.get_top_by_volume(db, limit=limit)
-    return [TrendResponse.model_validate(t) for t in trends]
+    return [TrendResponse.from_orm_trusted(t) for t in trends]
 
 
 @router.get("/top/growth", response_model=List[TrendResponse])
@@ -155,7 +155,7 @@ async def get_top_trends_by_growth(
     Get top trends by growth rate.
     """
     trends = await trend_crud.get_top_by_growth(db, limit=limit)
-    return [TrendResponse.model_validate(t) for t in trends]
+    return [TrendResponse.from_orm_trusted(t) for t in trends]
 
 
 @router.get("/stats")
@@ -186,7 +186,7 @@ async def get_trend(
             detail="Trend not found"
         )
     
-    return TrendWithDetails.model_validate(trend)
+    return TrendWithDetails.from_orm_trusted(trend)
 
 
 @router.post("/detect", response_model=MessageResponse)
@@ -213,7 +213,7 @@ async def create_trend(
     Create new trend manually (analyst only).
     """
     trend = await trend_crud.create(db, obj_in=trend_in)
-    return TrendResponse.model_validate(trend)
+    return TrendResponse.from_orm_trusted(trend)
 
 
 @router.put("/{trend_id}", response_model=TrendResponse)
@@ -234,7 +234,7 @@ async def update_trend(
         )
     
     updated = await trend_crud.update(db, db_obj=trend, obj_in=trend_in)
-    return TrendResponse.model_validate(updated)
+    return TrendResponse.from_orm_trusted(updated)
 
 
 @router.delete("/{trend_id}", response_model=MessageResponse)
@@ -30,12 +30,11 @@ async def get_users(
     """
     Get all users (admin only).
     """
-    users = await user_crud.get_multi(
+    return await user_crud.get_multi_core(
         db,
         skip=pagination.skip,
         limit=pagination.limit
     )
-    return [UserResponse.model_validate(u) for u in users]
 
 
 @router.get("/{user_id}", response_model=UserResponse)
@@ -61,7 +60,7 @@ async def get_user(
             detail="User not found"
         )
     
-    return UserResponse.model_validate(user)
+    return UserResponse.from_orm_trusted(user)
 
 
 @router.post("", response_model=UserResponse)
@@ -73,24 +72,20 @@ async def create_user(
     """
     Create new user (admin only).
     """
-    # Check if email exists
-    existing = await user_crud.get_by_email(db, email=user_in.email)
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
-    # Check if username exists
-    existing = await user_crud.get_by_username(db, username=user_in.username)
-    if existing:
+    user = await user_crud.create(db, obj_in=user_in)
+    if user is None:
+        # Conflict on email or username; one lookup tells which
+        existing = await user_crud.get_by_email(db, email=user_in.email)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken"
+            detail=(
+                "Email already registered"
+                if existing
+                else "Username already taken"
+            )
         )
     
-    user = await user_crud.create(db, obj_in=user_in)
-    return UserResponse.model_validate(user)
+    return UserResponse.from_orm_trusted(user)
 
 
 @router.put("/{user_id}", response_model=UserResponse)
@@ -125,7 +120,7 @@ async def update_user(
         )
     
     updated_user = await user_crud.update(db, db_obj=user, obj_in=user_in)
-    return UserResponse.model_validate(updated_user)
+    return UserResponse.from_orm_trusted(updated_user)
 
 
 @router.delete("/{user_id}", response_model=MessageResponse)
@@ -170,7 +165,7 @@ async def activate_user(
         )
     
     user = await user_crud.activate(db, user=user)
-    return UserResponse.model_validate(user)
+    return UserResponse.from_orm_trusted(user)
 
 
 @router.post("/{user_id}/deactivate", response_model=UserResponse)
@@ -196,4 +191,4 @@ async def deactivate_user(
         )
     
     user = await user_crud.deactivate(db, user=user)
-    return UserResponse.model_validate(user)
+    return UserResponse.from_orm_trusted(user)
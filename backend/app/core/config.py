@@ -28,13 +28,28 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     DATABASE_SYNC_URL: str
+    # Per-process pool. Keep DB_POOL_SIZE + DB_MAX_OVERFLOW at or above the
+    # expected concurrent requests per worker, and (times workers) below
+    # Postgres max_connections.
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    # Per-process pool shared by all requests; extra callers wait for a
+    # free connection instead of opening new ones
+    REDIS_MAX_CONNECTIONS: int = 64
+    REDIS_POOL_TIMEOUT: float = 5.0
     
     # BRAIN Service
     BRAIN_SERVICE_URL: str = "http://localhost:8001"
     BRAIN_SERVICE_TIMEOUT: int = 300
+    # One pooled client per process; idle connections are kept for reuse
+    BRAIN_MAX_CONNECTIONS: int = 100
+    BRAIN_MAX_KEEPALIVE_CONNECTIONS: int = 50
+    BRAIN_KEEPALIVE_EXPIRY: float = 300.0
     
     # JWT
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -47,6 +62,7 @@ class Settings(BaseSettings):
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
+    CELERY_PREFETCH_MULTIPLIER: int = 1
     
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
@@ -57,6 +73,15 @@ class Settings(BaseSettings):
             except json.JSONDecodeError:
                 return [origin.strip() for origin in v.split(",")]
         return v
+    
+    @field_validator("DATABASE_URL")
+    @classmethod
+    def use_asyncpg_driver(cls, v: str) -> str:
+        # A bare or psycopg2 Postgres URL would pick a sync DBAPI
+        for prefix in ("postgresql://", "postgresql+psycopg2://", "postgres://"):
+            if v.startswith(prefix):
+                return "postgresql+asyncpg://" + v[len(prefix):]
+        return v
 
 
 # Create global settings instance
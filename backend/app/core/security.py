@@ -1,5 +1,6 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Any
+from typing import Optional, Any, Tuple
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -18,6 +19,24 @@ def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# Caps concurrent hashes so a signup burst cannot occupy every core
+_HASH_SEMAPHORE = asyncio.Semaphore(4)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password in a worker thread, off the event loop."""
+    async with _HASH_SEMAPHORE:
+        return await asyncio.to_thread(pwd_context.hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in a worker thread, off the event loop."""
+    async with _HASH_SEMAPHORE:
+        return await asyncio.to_thread(
+            pwd_context.verify, plain_password, hashed_password
+        )
+
+
 def create_access_token(
     subject: str | Any,
     expires_delta: Optional[timedelta] = None
@@ -70,6 +89,20 @@ def create_refresh_token(
     return encoded_jwt
 
 
+async def create_token_pair_async(subject: str | Any) -> Tuple[str, str]:
+    """
+    Create access and refresh tokens.
+    
+    HMAC signing takes microseconds and stays inline; RSA/EC signing takes
+    milliseconds and runs in a worker thread, off the event loop.
+    """
+    if settings.ALGORITHM.startswith("HS"):
+        return create_access_token(subject), create_refresh_token(subject)
+    return await asyncio.to_thread(
+        lambda: (create_access_token(subject), create_refresh_token(subject))
+    )
+
+
 def decode_token(token: str) -> Optional[dict]:
     """Decode and verify JWT token."""
     try:
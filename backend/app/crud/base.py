@@ -1,9 +1,108 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from sqlalchemy import select, func, delete
+import asyncio
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Generic, List, Optional,
+    Sequence, Type, TypeVar, Union
+)
+from sqlalchemy.engine import Row
+from sqlalchemy import select, func, delete, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from app.database import Base
+from app.core.config import settings
+from app.database import Base, has_writes
+
+# Below this many rows an exact COUNT(*) is cheap enough to always run
+FAST_ESTIMATE_THRESHOLD = 10000
+
+# Caps the extra sessions fan-out reads hold at once, so a burst of gathered
+# stats queries always leaves a pooled connection for request handlers
+_FANOUT_SLOTS = asyncio.Semaphore(max(1, settings.DB_POOL_SIZE - 1))
+
+
+async def fast_estimate(db: AsyncSession, table: str) -> Optional[int]:
+    """Planner row estimate for a table from pg_class, or None if unavailable."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    query = text(
+        "SELECT reltuples::bigint FROM pg_class WHERE relname = :t"
+    )
+    result = await db.execute(query, {"t": table})
+    estimate = result.scalar()
+    # reltuples is -1 (or 0) until the table has been analyzed
+    if estimate is None or estimate < FAST_ESTIMATE_THRESHOLD:
+        return None
+    return int(estimate)
+
+
+async def fetch_rows(db: AsyncSession, query) -> List[Row]:
+    """
+    Run a read-only query on its own session.
+    
+    AsyncSession is not safe for concurrent use, so independent stats
+    queries that are gathered each get a session on the same engine.
+    """
+    async with _FANOUT_SLOTS, AsyncSession(db.bind) as session:
+        result = await session.execute(query)
+        return result.all()
+
+
+async def gather_reads(
+    db: AsyncSession,
+    calls: Sequence[Callable[[AsyncSession], Awaitable[Any]]],
+    *,
+    limit: bool = True
+) -> List[Any]:
+    """
+    Run independent read calls concurrently, each on its own session.
+    
+    Falls back to running them in order on `db` when it has uncommitted
+    writes, since other sessions could not see those rows. Pass
+    limit=False when the calls fan out through fetch_rows themselves, so
+    no fan-out slot is held while waiting for another.
+    """
+    if has_writes(db):
+        return [await call(db) for call in calls]
+    
+    async def on_own_session(call):
+        if not limit:
+            async with AsyncSession(db.bind) as session:
+                return await call(session)
+        async with _FANOUT_SLOTS, AsyncSession(db.bind) as session:
+            return await call(session)
+    
+    return await asyncio.gather(*(on_own_session(call) for call in calls))
+
+
+def hold_fanout_slot(
+    call: Callable[[AsyncSession], Awaitable[Any]]
+) -> Callable[[AsyncSession], Awaitable[Any]]:
+    """Wrap a read call to hold a fan-out slot, for gather_reads(limit=False)."""
+    async def run(session: AsyncSession) -> Any:
+        async with _FANOUT_SLOTS:
+            return await call(session)
+    
+    return run
+
+
+async def stream_rows(
+    db: AsyncSession,
+    query,
+    *,
+    batch_size: int = 1000
+) -> AsyncIterator[List[Row]]:
+    """Stream a column-level select in row batches, without ORM objects."""
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for batch in result.partitions(batch_size):
+        yield batch
+
+
+async def list_core(db: AsyncSession, query) -> List[Dict[str, Any]]:
+    """Execute a column-level select and return plain dicts, bypassing the ORM."""
+    result = await db.execute(query)
+    return [dict(row) for row in result.mappings()]
+
 
 # Type variables for generic CRUD
 ModelType = TypeVar("ModelType", bound=Base)
@@ -22,6 +121,12 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
     
+    def upsert_stmt(self, db: AsyncSession):
+        """Dialect-specific INSERT that supports ON CONFLICT clauses."""
+        if db.get_bind().dialect.name == "sqlite":
+            return sqlite_insert(self.model)
+        return pg_insert(self.model)
+    
     async def get(
         self,
         db: AsyncSession,
@@ -55,12 +160,18 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     
     async def count(
         self,
-        db: AsyncSession
+        db: AsyncSession,
+        *,
+        exact: bool = True
     ) -> int:
-        """Count all records."""
+        """Count all records, optionally using the planner estimate."""
+        if not exact:
+            estimate = await fast_estimate(db, self.model.__tablename__)
+            if estimate is not None:
+                return estimate
         query = select(func.count()).select_from(self.model)
         result = await db.execute(query)
-        return result.scalar() or 0
+        return result.scalar_one()
     
     async def create(
         self,
@@ -107,4 +218,26 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 setattr(db_obj, field, value)
         
         db.add(db_obj)
-        
+        await db.flush()
+        return db_obj
+    
+    async def delete(
+        self,
+        db: AsyncSession,
+        *,
+        id: int
+    ) -> Optional[ModelType]:
+        """Delete a record by ID. Returns the deleted record, if any."""
+        db_obj = await self.get(db, id)
+        if db_obj:
+            await db.delete(db_obj)
+            await db.flush()
+        return db_obj
+    
+    async def delete_all(
+        self,
+        db: AsyncSession
+    ) -> int:
+        """Delete all records. Returns the number of rows removed."""
+        result = await db.execute(delete(self.model))
+        return result.rowcount
@@ -1,10 +1,10 @@
+import asyncio
 from typing import Optional, List, Dict, Any
-from datetime import datetime
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, fetch_rows
 from app.models.analysis import Analysis, AnalysisType, AnalysisStatus
 from app.schemas.analysis import AnalysisCreate, AnalysisUpdate
 
@@ -126,31 +126,37 @@ class CRUDAnalysis(CRUDBase[Analysis, AnalysisCreate, AnalysisUpdate]):
         analysis_id: int,
         status: AnalysisStatus,
         progress: Optional[float] = None,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        from_status: Optional[AnalysisStatus] = None
     ) -> Optional[Analysis]:
-        """Update analysis status."""
-        analysis = await self.get(db, analysis_id)
-        if not analysis:
-            return None
-        
-        analysis.status = status
+        """Update analysis status, only from `from_status` if given."""
+        values: Dict[str, Any] = {"status": status}
         
         if progress is not None:
-            analysis.progress = progress
+            values["progress"] = progress
         
         if error_message is not None:
-            analysis.error_message = error_message
+            values["error_message"] = error_message
         
-        if status == AnalysisStatus.PROCESSING and not analysis.started_at:
-            analysis.started_at = datetime.utcnow().isoformat()
+        if status == AnalysisStatus.PROCESSING:
+            # Keep the original start time if already set
+            values["started_at"] = func.coalesce(
+                Analysis.started_at, func.now()
+            )
         
         if status in [AnalysisStatus.COMPLETED, AnalysisStatus.FAILED]:
-            analysis.completed_at = datetime.utcnow().isoformat()
+            values["completed_at"] = func.now()
         
-        db.add(analysis)
-        await db.flush()
-        await db.refresh(analysis)
-        return analysis
+        query = update(Analysis).where(Analysis.id == analysis_id)
+        if from_status is not None:
+            query = query.where(Analysis.status == from_status)
+        query = (
+            query.values(**values)
+            .returning(Analysis)
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
     
     async def update_progress(
         self,
@@ -214,30 +220,28 @@ class CRUDAnalysis(CRUDBase[Analysis, AnalysisCreate, AnalysisUpdate]):
         if user_id:
             base_query = base_query.where(Analysis.user_id == user_id)
         
-        # Total count
         total_query = select(func.count()).select_from(base_query.subquery())
-        total_result = await db.execute(total_query)
-        total = total_result.scalar() or 0
-        
-        # By status
         status_query = (
             select(Analysis.status, func.count(Analysis.id))
             .group_by(Analysis.status)
         )
-        if user_id:
-            status_query = status_query.where(Analysis.user_id == user_id)
-        status_result = await db.execute(status_query)
-        by_status = {row[0].value: row[1] for row in status_result.all()}
-        
-        # By type
         type_query = (
             select(Analysis.analysis_type, func.count(Analysis.id))
             .group_by(Analysis.analysis_type)
         )
         if user_id:
+            status_query = status_query.where(Analysis.user_id == user_id)
             type_query = type_query.where(Analysis.user_id == user_id)
-        type_result = await db.execute(type_query)
-        by_type = {row[0].value: row[1] for row in type_result.all()}
+        
+        # Independent queries run concurrently on separate sessions
+        total_rows, status_rows, type_rows = await asyncio.gather(
+            fetch_rows(db, total_query),
+            fetch_rows(db, status_query),
+            fetch_rows(db, type_query)
+        )
+        total = total_rows[0][0]
+        by_status = {row[0].value: row[1] for row in status_rows}
+        by_type = {row[0].value: row[1] for row in type_rows}
         
         return {
             "total": total,
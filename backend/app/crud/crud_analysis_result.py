@@ -1,16 +1,57 @@
+from collections import Counter
+from itertools import chain
 from typing import Optional, List, Dict, Any
-from sqlalchemy import select, func
+from sqlalchemy import select, func, insert, literal, null, true, union_all
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.crud.base import CRUDBase
-from app.models.analysis_result import AnalysisResult
+from app.models.analysis_result import AnalysisResult, AnalysisResultAgg
 from app.schemas.analysis_result import AnalysisResultCreate
 
+# Columns copied when one analysis reuses another's results
+_RESULT_CLONE_COLUMNS = tuple(
+    c for c in AnalysisResult.__table__.columns
+    if c.key not in ("id", "analysis_id", "created_at", "updated_at")
+)
+
+# Numeric columns served column-wise (name -> column)
+_RESULT_NUMERIC_COLUMNS = {
+    "ids": AnalysisResult.id,
+    "post_ids": AnalysisResult.post_id,
+    "sentiment_scores": AnalysisResult.sentiment_score,
+    "node_degrees": AnalysisResult.node_degree,
+    "centrality_scores": AnalysisResult.centrality_score,
+    "community_ids": AnalysisResult.community_id,
+}
+
+
+def clone_results_query(source_analysis_id: int, target_analysis_id: int):
+    """INSERT ... SELECT copying one analysis' results to another."""
+    return insert(AnalysisResult).from_select(
+        [c.key for c in _RESULT_CLONE_COLUMNS] + ["analysis_id"],
+        select(*_RESULT_CLONE_COLUMNS, literal(target_analysis_id))
+        .where(AnalysisResult.analysis_id == source_analysis_id)
+    )
+
 
 class CRUDAnalysisResult(CRUDBase[AnalysisResult, AnalysisResultCreate, AnalysisResultCreate]):
     """CRUD operations for AnalysisResult model."""
     
+    async def clone_results(
+        self,
+        db: AsyncSession,
+        *,
+        source_analysis_id: int,
+        target_analysis_id: int
+    ) -> int:
+        """Copy one analysis' results to another in a single INSERT ... SELECT."""
+        result = await db.execute(
+            clone_results_query(source_analysis_id, target_analysis_id)
+        )
+        return result.rowcount
+    
     async def get_by_post(
         self,
         db: AsyncSession,
@@ -44,6 +85,30 @@ class CRUDAnalysisResult(CRUDBase[AnalysisResult, AnalysisResultCreate, Analysis
         result = await db.execute(query)
         return list(result.scalars().all())
     
+    async def get_columns_by_analysis(
+        self,
+        db: AsyncSession,
+        *,
+        analysis_id: int,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Dict[str, List[Any]]:
+        """Get numeric result columns for an analysis as one list per column."""
+        query = (
+            select(*_RESULT_NUMERIC_COLUMNS.values())
+            .where(AnalysisResult.analysis_id == analysis_id)
+            .order_by(AnalysisResult.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        rows = result.all()
+        columns = zip(*rows) if rows else ([] for _ in _RESULT_NUMERIC_COLUMNS)
+        return {
+            name: list(values)
+            for name, values in zip(_RESULT_NUMERIC_COLUMNS, columns)
+        }
+    
     async def get_with_post(
         self,
         db: AsyncSession,
@@ -65,12 +130,14 @@ class CRUDAnalysisResult(CRUDBase[AnalysisResult, AnalysisResultCreate, Analysis
         *,
         results_in: List[AnalysisResultCreate]
     ) -> List[AnalysisResult]:
-        """Bulk create analysis results."""
-        results = []
-        for result_in in results_in:
-            result = await self.create(db, obj_in=result_in)
-            results.append(result)
-        return results
+        """Bulk create analysis results in one multi-row INSERT ... RETURNING."""
+        if not results_in:
+            return []
+        result = await db.scalars(
+            insert(AnalysisResult).returning(AnalysisResult),
+            [r.model_dump(exclude_unset=True) for r in results_in]
+        )
+        return list(result.all())
     
     async def get_sentiment_distribution(
         self,
@@ -131,6 +198,39 @@ class CRUDAnalysisResult(CRUDBase[AnalysisResult, AnalysisResultCreate, Analysis
         result = await db.execute(query)
         return result.scalar()
     
+    async def get_label_rollup(self, db: AsyncSession) -> List[Row]:
+        """
+        Result totals per (sentiment_label, dominant_emotion) over all analyses.
+        
+        Rows are (sentiment_label, dominant_emotion, result_count, score_sum,
+        score_count) with NULL labels as ''. Postgres reads the
+        trigger-maintained analysis_result_agg table; other dialects
+        aggregate analysis_results directly.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            query = select(
+                AnalysisResultAgg.sentiment_label,
+                AnalysisResultAgg.dominant_emotion,
+                AnalysisResultAgg.result_count,
+                AnalysisResultAgg.score_sum,
+                AnalysisResultAgg.score_count
+            ).where(AnalysisResultAgg.result_count > 0)
+        else:
+            sentiment = func.coalesce(AnalysisResult.sentiment_label, "")
+            emotion = func.coalesce(AnalysisResult.dominant_emotion, "")
+            query = (
+                select(
+                    sentiment,
+                    emotion,
+                    func.count(AnalysisResult.id),
+                    func.coalesce(func.sum(AnalysisResult.sentiment_score), 0.0),
+                    func.count(AnalysisResult.sentiment_score)
+                )
+                .group_by(sentiment, emotion)
+            )
+        result = await db.execute(query)
+        return result.all()
+    
     async def get_by_sentiment(
         self,
         db: AsyncSession,
@@ -191,22 +291,94 @@ class CRUDAnalysisResult(CRUDBase[AnalysisResult, AnalysisResultCreate, Analysis
             )
         )
         result = await db.execute(query)
+        keyword_counts = Counter(
+            chain.from_iterable(row[0] for row in result.all() if row[0])
+        )
         
-        # Count keyword occurrences
-        keyword_counts: Dict[str, int] = {}
-        for row in result.all():
-            keywords = row[0] or []
-            for keyword in keywords:
-                keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
+        return [{"keyword": k, "count": v} for k, v in keyword_counts.most_common(limit)]
+    
+    async def get_summary_bundle(
+        self,
+        db: AsyncSession,
+        *,
+        analysis_id: int,
+        keyword_limit: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Get all summary aggregates for an analysis in one statement.
         
-        # Sort and limit
-        sorted_keywords = sorted(
-            keyword_counts.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:limit]
+        The results are filtered once in a CTE and every aggregate is a
+        UNION ALL branch over it, tagged by `kind`.
+        """
+        base = (
+            select(
+                AnalysisResult.sentiment_label,
+                AnalysisResult.dominant_emotion,
+                AnalysisResult.sentiment_score,
+                AnalysisResult.keywords
+            )
+            .where(AnalysisResult.analysis_id == analysis_id)
+            .cte("base")
+        )
+        # Rows may hold a JSON null instead of SQL NULL; only expand arrays
+        if db.get_bind().dialect.name == "postgresql":
+            elements = func.jsonb_array_elements_text(base.c.keywords)
+            is_array = func.jsonb_typeof(base.c.keywords) == "array"
+        else:
+            elements = func.json_each(base.c.keywords)
+            is_array = func.json_type(base.c.keywords) == "array"
+        keyword = elements.table_valued("value").alias("kw")
+        count = func.count()
+        
+        totals = select(
+            literal("total").label("kind"),
+            null().label("key"),
+            count.label("n"),
+            func.avg(base.c.sentiment_score).label("avg")
+        )
+        sentiments = (
+            select(literal("sentiment"), base.c.sentiment_label, count, null())
+            .where(base.c.sentiment_label.isnot(None))
+            .group_by(base.c.sentiment_label)
+        )
+        emotions = (
+            select(literal("emotion"), base.c.dominant_emotion, count, null())
+            .where(base.c.dominant_emotion.isnot(None))
+            .group_by(base.c.dominant_emotion)
+        )
+        keywords = (
+            select(literal("keyword"), keyword.c.value, count, null())
+            .select_from(base)
+            .join(keyword, true())
+            .where(is_array)
+            .group_by(keyword.c.value)
+            .order_by(count.desc(), keyword.c.value)
+            .limit(keyword_limit)
+            .subquery()
+        )
+        query = union_all(totals, sentiments, emotions, select(keywords))
+        result = await db.execute(query)
         
-        return [{"keyword": k, "count": v} for k, v in sorted_keywords]
+        bundle: Dict[str, Any] = {
+            "total": 0,
+            "average_sentiment": None,
+            "sentiment_distribution": {},
+            "emotion_distribution": {},
+            "top_keywords": []
+        }
+        for kind, key, n, avg in result.all():
+            if kind == "total":
+                bundle["total"] = n
+                bundle["average_sentiment"] = float(avg) if avg is not None else None
+            elif kind == "sentiment":
+                bundle["sentiment_distribution"][key] = n
+            elif kind == "emotion":
+                bundle["emotion_distribution"][key] = n
+            else:
+                bundle["top_keywords"].append({"keyword": key, "count": n})
+        # UNION ALL does not keep branch order on every backend
+        bundle["top_keywords"].sort(key=lambda k: (-k["count"], k["keyword"]))
+        return bundle
     
     async def count_by_analysis(
         self,
@@ -221,7 +393,7 @@ class CRUDAnalysisResult(CRUDBase[AnalysisResult, AnalysisResultCreate, Analysis
             .where(AnalysisResult.analysis_id == analysis_id)
         )
         result = await db.execute(query)
-        return result.scalar() or 0
+        return result.scalar_one()
     
     async def delete_by_analysis(
         self,
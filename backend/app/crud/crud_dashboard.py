@@ -64,7 +64,7 @@ class CRUDDashboard(CRUDBase[Dashboard, DashboardCreate, DashboardUpdate]):
             select(Dashboard)
             .where(
                 Dashboard.user_id == user_id,
-                Dashboard.is_default == True
+                Dashboard.is_default.is_(True)
             )
         )
         result = await db.execute(query)
@@ -80,7 +80,7 @@ class CRUDDashboard(CRUDBase[Dashboard, DashboardCreate, DashboardUpdate]):
         """Get public dashboards."""
         query = (
             select(Dashboard)
-            .where(Dashboard.is_public == True)
+            .where(Dashboard.is_public.is_(True))
             .order_by(Dashboard.name.asc())
             .offset(skip)
             .limit(limit)
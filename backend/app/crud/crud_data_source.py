@@ -1,11 +1,23 @@
+import asyncio
+from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, fetch_rows
 from app.models.data_source import DataSource, SourcePlatform
 from app.schemas.data_source import DataSourceCreate, DataSourceUpdate
 
+# Hot lookups hoisted to module level so they compile once per process
+_Q_SOURCE_BY_NAME = select(DataSource).where(
+    DataSource.name == bindparam("name")
+)
+_Q_SOURCES_BY_PLATFORM = (
+    select(DataSource)
+    .where(DataSource.platform == bindparam("platform"))
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
 
 class CRUDDataSource(CRUDBase[DataSource, DataSourceCreate, DataSourceUpdate]):
     """CRUD operations for DataSource model."""
@@ -17,8 +29,7 @@ class CRUDDataSource(CRUDBase[DataSource, DataSourceCreate, DataSourceUpdate]):
         name: str
     ) -> Optional[DataSource]:
         """Get data source by name."""
-        query = select(DataSource).where(DataSource.name == name)
-        result = await db.execute(query)
+        result = await db.execute(_Q_SOURCE_BY_NAME, {"name": name})
         return result.scalar_one_or_none()
     
     async def get_by_platform(
@@ -30,13 +41,10 @@ class CRUDDataSource(CRUDBase[DataSource, DataSourceCreate, DataSourceUpdate]):
         limit: int = 100
     ) -> List[DataSource]:
         """Get data sources by platform."""
-        query = (
-            select(DataSource)
-            .where(DataSource.platform == platform)
-            .offset(skip)
-            .limit(limit)
+        result = await db.execute(
+            _Q_SOURCES_BY_PLATFORM,
+            {"platform": platform, "skip": skip, "limit": limit}
         )
-        result = await db.execute(query)
         return list(result.scalars().all())
     
     async def get_active(
@@ -49,6 +57,7 @@ class CRUDDataSource(CRUDBase[DataSource, DataSourceCreate, DataSourceUpdate]):
         """Get all active data sources."""
         query = (
             select(DataSource)
+            # Same form as the idx_datasource_active predicate so it matches
             .where(DataSource.is_active == True)
             .offset(skip)
             .limit(limit)
@@ -56,6 +65,24 @@ class CRUDDataSource(CRUDBase[DataSource, DataSourceCreate, DataSourceUpdate]):
         result = await db.execute(query)
         return list(result.scalars().all())
     
+    async def _update_fields(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: DataSource,
+        **values
+    ) -> DataSource:
+        """Apply an UPDATE ... RETURNING in a single round-trip."""
+        query = (
+            update(DataSource)
+            .where(DataSource.id == db_obj.id)
+            .values(**values)
+            .returning(DataSource)
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(query)
+        return result.scalar_one()
+    
     async def activate(
         self,
         db: AsyncSession,
@@ -63,11 +90,7 @@ class CRUDDataSource(CRUDBase[DataSource, DataSourceCreate, DataSourceUpdate]):
         db_obj: DataSource
     ) -> DataSource:
         """Activate a data source."""
-        db_obj.is_active = True
-        db.add(db_obj)
-        await db.flush()
-        await db.refresh(db_obj)
-        return db_obj
+        return await self._update_fields(db, db_obj=db_obj, is_active=True)
     
     async def deactivate(
         self,
@@ -76,25 +99,21 @@ class CRUDDataSource(CRUDBase[DataSource, DataSourceCreate, DataSourceUpdate]):
         db_obj: DataSource
     ) -> DataSource:
         """Deactivate a data source."""
-        db_obj.is_active = False
-        db.add(db_obj)
-        await db.flush()
-        await db.refresh(db_obj)
-        return db_obj
+        return await self._update_fields(db, db_obj=db_obj, is_active=False)
     
     async def update_last_sync(
         self,
         db: AsyncSession,
         *,
         db_obj: DataSource,
-        sync_time: str
+        sync_time: datetime
     ) -> DataSource:
         """Update last sync timestamp."""
-        db_obj.last_sync_at = sync_time
-        db.add(db_obj)
-        await db.flush()
-        await db.refresh(db_obj)
-        return db_obj
+        return await self._update_fields(
+            db,
+            db_obj=db_obj,
+            last_sync_at=sync_time
+        )
     
     async def get_stats(
         self,
@@ -106,22 +125,23 @@ class CRUDDataSource(CRUDBase[DataSource, DataSourceCreate, DataSourceUpdate]):
         from app.models.post import Post
         from app.models.author import Author
         
-        # Count posts
         posts_query = (
             select(func.count())
             .select_from(Post)
             .where(Post.data_source_id == data_source_id)
         )
-        posts_result = await db.execute(posts_query)
-        total_posts = posts_result.scalar() or 0
-        
-        # Count unique authors
         authors_query = (
             select(func.count(func.distinct(Post.author_id)))
             .where(Post.data_source_id == data_source_id)
         )
-        authors_result = await db.execute(authors_query)
-        total_authors = authors_result.scalar() or 0
+        
+        # Independent queries run concurrently on separate sessions
+        posts_rows, authors_rows = await asyncio.gather(
+            fetch_rows(db, posts_query),
+            fetch_rows(db, authors_query)
+        )
+        total_posts = posts_rows[0][0]
+        total_authors = authors_rows[0][0]
         
         return {
             "total_posts": total_posts,
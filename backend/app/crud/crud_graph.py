@@ -1,11 +1,51 @@
-from typing import Optional, List, Dict, Any
-from sqlalchemy import select, func, and_
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from collections import Counter
+from sqlalchemy import (
+    select, func, and_, bindparam, column, update, values, Float, String
+)
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, fetch_rows, list_core, stream_rows
 from app.models.graph import GraphNode, GraphEdge
 from app.schemas.graph import GraphNodeCreate, GraphNodeUpdate, GraphEdgeCreate
 
+# Columns bulk_update_metrics is allowed to write
+_GRAPHNODE_METRIC_COLS = frozenset(
+    c.key for c in GraphNode.__mapper__.columns
+) - {"id", "node_id", "created_at"}
+
+# Columns returned by the Core edge listing (matches GraphEdgeResponse)
+_EDGE_LIST_COLUMNS = (
+    GraphEdge.id, GraphEdge.edge_type, GraphEdge.source_id,
+    GraphEdge.target_id, GraphEdge.weight, GraphEdge.attributes,
+    GraphEdge.occurrence_count, GraphEdge.created_at, GraphEdge.updated_at
+)
+
+# Rows per multi-row upsert, well under asyncpg's 32767 bind-parameter cap
+_UPSERT_BATCH = 1000
+
+# Hot lookups hoisted to module level so they compile once per process
+_Q_NODE_BY_NODE_ID = select(GraphNode).where(
+    GraphNode.node_id == bindparam("node_id")
+)
+_Q_EDGE_BETWEEN = select(GraphEdge).where(
+    GraphEdge.source_id == bindparam("source_id"),
+    GraphEdge.target_id == bindparam("target_id")
+)
+_Q_EDGE_BETWEEN_TYPED = _Q_EDGE_BETWEEN.where(
+    GraphEdge.edge_type == bindparam("edge_type")
+)
+
+# Graph structure fingerprint; also run by the sync Celery tasks
+GRAPH_SIGNATURE_QUERY = select(
+    select(func.count(GraphNode.id)).scalar_subquery(),
+    select(func.max(GraphNode.id)).scalar_subquery(),
+    select(func.count(GraphEdge.id)).scalar_subquery(),
+    select(func.max(GraphEdge.id)).scalar_subquery(),
+    select(func.sum(GraphEdge.weight)).scalar_subquery(),
+)
 
 class CRUDGraphNode(CRUDBase[GraphNode, GraphNodeCreate, GraphNodeUpdate]):
     """CRUD operations for GraphNode model."""
@@ -17,8 +57,7 @@ class CRUDGraphNode(CRUDBase[GraphNode, GraphNodeCreate, GraphNodeUpdate]):
         node_id: str
     ) -> Optional[GraphNode]:
         """Get node by node_id."""
-        query = select(GraphNode).where(GraphNode.node_id == node_id)
-        result = await db.execute(query)
+        result = await db.execute(_Q_NODE_BY_NODE_ID, {"node_id": node_id})
         return result.scalar_one_or_none()
     
     async def get_or_create(
@@ -28,12 +67,19 @@ class CRUDGraphNode(CRUDBase[GraphNode, GraphNodeCreate, GraphNodeUpdate]):
         obj_in: GraphNodeCreate
     ) -> tuple[GraphNode, bool]:
         """Get existing node or create new one."""
-        existing = await self.get_by_node_id(db, node_id=obj_in.node_id)
-        if existing:
-            return existing, False
+        query = (
+            self.upsert_stmt(db)
+            .values(**obj_in.model_dump(exclude_unset=True))
+            .on_conflict_do_nothing(index_elements=["node_id"])
+            .returning(GraphNode)
+        )
+        result = await db.execute(query)
+        new_node = result.scalar_one_or_none()
+        if new_node:
+            return new_node, True
         
-        new_node = await self.create(db, obj_in=obj_in)
-        return new_node, True
+        existing = await self.get_by_node_id(db, node_id=obj_in.node_id)
+        return existing, False
     
     async def get_by_type(
         self,
@@ -124,17 +170,61 @@ class CRUDGraphNode(CRUDBase[GraphNode, GraphNodeCreate, GraphNodeUpdate]):
         result = await db.execute(query)
         return list(result.scalars().all())
     
-    async def bulk_create(
+    async def get_or_create_many(
         self,
         db: AsyncSession,
         *,
         nodes_in: List[GraphNodeCreate]
-    ) -> List[GraphNode]:
-        """Bulk create nodes."""
-        nodes = []
+    ) -> Tuple[Dict[str, GraphNode], int]:
+        """
+        Upsert nodes by node_id with multi-row INSERT ... ON CONFLICT DO NOTHING.
+        
+        Returns every node keyed by node_id, and how many were new.
+        """
+        unique: Dict[str, GraphNodeCreate] = {}
         for node_in in nodes_in:
-            node, _ = await self.get_or_create(db, obj_in=node_in)
-            nodes.append(node)
+            unique.setdefault(node_in.node_id, node_in)
+        rows = [node_in.model_dump() for node_in in unique.values()]
+        
+        created = 0
+        for i in range(0, len(rows), _UPSERT_BATCH):
+            query = (
+                self.upsert_stmt(db)
+                .values(rows[i:i + _UPSERT_BATCH])
+                .on_conflict_do_nothing(index_elements=["node_id"])
+                .returning(GraphNode.id)
+            )
+            result = await db.execute(query)
+            created += len(result.all())
+        
+        node_ids = list(unique)
+        nodes: Dict[str, GraphNode] = {}
+        for i in range(0, len(node_ids), _UPSERT_BATCH):
+            result = await db.execute(
+                select(GraphNode).where(
+                    GraphNode.node_id.in_(node_ids[i:i + _UPSERT_BATCH])
+                )
+            )
+            nodes.update((n.node_id, n) for n in result.scalars())
+        return nodes, created
+    
+    async def bulk_create(
+        self,
+        db: AsyncSession,
+        *,
+        nodes_in: List[GraphNodeCreate],
+        preload_edges: bool = False
+    ) -> List[GraphNode]:
+        """Bulk create nodes, optionally preloading their outgoing edges."""
+        by_node_id, _ = await self.get_or_create_many(db, nodes_in=nodes_in)
+        nodes = [by_node_id[node_in.node_id] for node_in in nodes_in]
+        
+        if preload_edges and nodes:
+            await db.execute(
+                select(GraphEdge).where(
+                    GraphEdge.source_id.in_([n.id for n in nodes])
+                )
+            )
         return nodes
     
     async def bulk_update_metrics(
@@ -144,18 +234,31 @@ class CRUDGraphNode(CRUDBase[GraphNode, GraphNodeCreate, GraphNodeUpdate]):
         metrics: List[Dict[str, Any]]
     ) -> int:
         """Bulk update node metrics. Each dict should have node_id and metrics."""
+        pending = [
+            (metric_data.get("node_id"), metric_data) for metric_data in metrics
+        ]
+        pending = [(node_id, data) for node_id, data in pending if node_id]
+        
+        # Resolve every node up front, one IN query per batch
+        node_ids = list({node_id for node_id, _ in pending})
+        nodes: Dict[str, GraphNode] = {}
+        for start in range(0, len(node_ids), _UPSERT_BATCH):
+            result = await db.execute(
+                select(GraphNode).where(
+                    GraphNode.node_id.in_(node_ids[start:start + _UPSERT_BATCH])
+                )
+            )
+            nodes.update((node.node_id, node) for node in result.scalars())
+        
         updated = 0
-        for metric_data in metrics:
-            node_id = metric_data.pop("node_id", None)
-            if not node_id:
-                continue
-            
-            node = await self.get_by_node_id(db, node_id=node_id)
+        for node_id, metric_data in pending:
+            node = nodes.get(node_id)
             if not node:
                 continue
             
+            # node_id itself is not a metric column, so it is skipped here
             for key, value in metric_data.items():
-                if hasattr(node, key):
+                if key in _GRAPHNODE_METRIC_COLS:
                     setattr(node, key, value)
             
             db.add(node)
@@ -164,43 +267,115 @@ class CRUDGraphNode(CRUDBase[GraphNode, GraphNodeCreate, GraphNodeUpdate]):
         await db.flush()
         return updated
     
+    async def bulk_set_metric(
+        self,
+        db: AsyncSession,
+        *,
+        metric: str,
+        values_by_node_id: List[Tuple[str, Any]]
+    ) -> int:
+        """
+        Set one metric column on many nodes, matched by node_id.
+        
+        Postgres gets one UPDATE ... FROM (VALUES ...) per batch; other
+        dialects an executemany. Runs at Core level, so nodes already
+        loaded into the session keep their old values.
+        """
+        if metric not in _GRAPHNODE_METRIC_COLS:
+            raise ValueError(f"Not a node metric column: {metric}")
+        
+        nodes = GraphNode.__table__
+        target = nodes.c[metric]
+        is_postgres = db.get_bind().dialect.name == "postgresql"
+        updated = 0
+        
+        for start in range(0, len(values_by_node_id), _UPSERT_BATCH):
+            batch = values_by_node_id[start:start + _UPSERT_BATCH]
+            if is_postgres:
+                rows = values(
+                    column("node_id", String),
+                    column("value", target.type),
+                    name="v"
+                ).data(batch)
+                stmt = (
+                    update(nodes)
+                    .where(nodes.c.node_id == rows.c.node_id)
+                    .values({metric: rows.c.value})
+                )
+                result = await db.execute(stmt)
+            else:
+                stmt = (
+                    update(nodes)
+                    .where(nodes.c.node_id == bindparam("b_node_id"))
+                    .values({metric: bindparam("b_value")})
+                )
+                result = await db.execute(
+                    stmt,
+                    [
+                        {"b_node_id": node_id, "b_value": value}
+                        for node_id, value in batch
+                    ]
+                )
+            updated += result.rowcount
+        
+        return updated
+    
     async def get_stats(
         self,
-        db: AsyncSession
+        db: AsyncSession,
+        *,
+        exact: bool = False
     ) -> Dict[str, Any]:
         """Get node statistics."""
-        # Total count
-        total_query = select(func.count()).select_from(GraphNode)
-        total_result = await db.execute(total_query)
-        total = total_result.scalar() or 0
-        
-        # By type
         type_query = (
             select(GraphNode.node_type, func.count(GraphNode.id))
             .group_by(GraphNode.node_type)
         )
-        type_result = await db.execute(type_query)
-        by_type = {row[0]: row[1] for row in type_result.all()}
-        
-        # Community count
         community_query = (
             select(func.count(func.distinct(GraphNode.community_id)))
             .where(GraphNode.community_id.isnot(None))
         )
-        community_result = await db.execute(community_query)
-        communities = community_result.scalar() or 0
+        degree_query = select(
+            func.coalesce(func.avg(GraphNode.degree), 0.0, type_=Float)
+        )
         
-        # Average degree
-        degree_query = select(func.avg(GraphNode.degree))
-        degree_result = await db.execute(degree_query)
-        avg_degree = degree_result.scalar() or 0
+        # Independent queries run concurrently on separate sessions
+        total, type_rows, community_rows, degree_rows = await asyncio.gather(
+            self.count(db, exact=exact),
+            fetch_rows(db, type_query),
+            fetch_rows(db, community_query),
+            fetch_rows(db, degree_query)
+        )
+        by_type = {row[0]: row[1] for row in type_rows}
+        communities = community_rows[0][0]
+        avg_degree = degree_rows[0][0]
         
         return {
             "total_nodes": total,
             "by_type": by_type,
             "communities_count": communities,
-            "average_degree": float(avg_degree)
+            "average_degree": avg_degree
         }
+    
+    def stream_projection(
+        self,
+        db: AsyncSession,
+        *,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[Row]]:
+        """Stream (id, node_id, node_type) for every node in row batches."""
+        query = select(GraphNode.id, GraphNode.node_id, GraphNode.node_type)
+        return stream_rows(db, query, batch_size=batch_size)
+    
+    async def get_signature(self, db: AsyncSession) -> str:
+        """
+        Cheap fingerprint of the graph's structure, in one query.
+        
+        Covers node and edge counts, highest ids and total edge weight;
+        metric columns (pagerank, community_id) do not affect it.
+        """
+        result = await db.execute(GRAPH_SIGNATURE_QUERY)
+        return ":".join(str(value or 0) for value in result.one())
 
 
 class CRUDGraphEdge(CRUDBase[GraphEdge, GraphEdgeCreate, GraphEdgeCreate]):
@@ -215,13 +390,12 @@ class CRUDGraphEdge(CRUDBase[GraphEdge, GraphEdgeCreate, GraphEdgeCreate]):
         edge_type: Optional[str] = None
     ) -> Optional[GraphEdge]:
         """Get edge between two nodes."""
-        query = select(GraphEdge).where(
-            GraphEdge.source_id == source_id,
-            GraphEdge.target_id == target_id
-        )
+        params = {"source_id": source_id, "target_id": target_id}
         if edge_type:
-            query = query.where(GraphEdge.edge_type == edge_type)
-        result = await db.execute(query)
+            params["edge_type"] = edge_type
+            result = await db.execute(_Q_EDGE_BETWEEN_TYPED, params)
+        else:
+            result = await db.execute(_Q_EDGE_BETWEEN, params)
         return result.scalar_one_or_none()
     
     async def get_or_create(
@@ -231,22 +405,23 @@ class CRUDGraphEdge(CRUDBase[GraphEdge, GraphEdgeCreate, GraphEdgeCreate]):
         obj_in: GraphEdgeCreate
     ) -> tuple[GraphEdge, bool]:
         """Get existing edge or create new one."""
-        existing = await self.get_between(
-            db,
-            source_id=obj_in.source_id,
-            target_id=obj_in.target_id,
-            edge_type=obj_in.edge_type
+        # Insert, or bump occurrence_count atomically if the edge exists
+        query = (
+            self.upsert_stmt(db)
+            .values(**obj_in.model_dump(exclude_unset=True))
+            .on_conflict_do_update(
+                index_elements=["source_id", "target_id", "edge_type"],
+                set_={
+                    "occurrence_count": GraphEdge.occurrence_count + 1,
+                    "updated_at": func.now()
+                }
+            )
+            .returning(GraphEdge)
+            .execution_options(populate_existing=True)
         )
-        if existing:
-            # Increment occurrence count
-            existing.occurrence_count += 1
-            db.add(existing)
-            await db.flush()
-            await db.refresh(existing)
-            return existing, False
-        
-        new_edge = await self.create(db, obj_in=obj_in)
-        return new_edge, True
+        result = await db.execute(query)
+        edge = result.scalar_one()
+        return edge, edge.occurrence_count == 1
     
     async def get_by_source(
         self,
@@ -266,6 +441,38 @@ class CRUDGraphEdge(CRUDBase[GraphEdge, GraphEdgeCreate, GraphEdgeCreate]):
         result = await db.execute(query)
         return list(result.scalars().all())
     
+    async def get_among(
+        self,
+        db: AsyncSession,
+        *,
+        node_ids: List[int],
+        per_source_limit: int = 100
+    ) -> List[GraphEdge]:
+        """Edges whose both ends are in `node_ids`, at most N per source node."""
+        if not node_ids:
+            return []
+        ranked = (
+            select(
+                GraphEdge.id,
+                func.row_number().over(
+                    partition_by=GraphEdge.source_id,
+                    order_by=GraphEdge.id
+                ).label("rank")
+            )
+            .where(GraphEdge.source_id.in_(node_ids))
+            .subquery()
+        )
+        query = (
+            select(GraphEdge)
+            .join(ranked, ranked.c.id == GraphEdge.id)
+            .where(
+                ranked.c.rank <= per_source_limit,
+                GraphEdge.target_id.in_(node_ids)
+            )
+        )
+        result = await db.execute(query)
+        return list(result.scalars().all())
+    
     async def get_by_target(
         self,
         db: AsyncSession,
@@ -302,46 +509,165 @@ class CRUDGraphEdge(CRUDBase[GraphEdge, GraphEdgeCreate, GraphEdgeCreate]):
         result = await db.execute(query)
         return list(result.scalars().all())
     
+    async def get_multi_core(
+        self,
+        db: AsyncSession,
+        *,
+        edge_type: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """List edges as plain dicts, optionally filtered by type."""
+        query = select(*_EDGE_LIST_COLUMNS)
+        if edge_type:
+            query = query.where(GraphEdge.edge_type == edge_type)
+        query = query.offset(skip).limit(limit)
+        return await list_core(db, query)
+    
     async def bulk_create(
         self,
         db: AsyncSession,
         *,
-        edges_in: List[GraphEdgeCreate]
+        edges_in: List[GraphEdgeCreate],
+        preload_nodes: bool = False
+    ) -> List[GraphEdge]:
+        """Bulk create edges, merging duplicates into occurrence_count."""
+        if not edges_in:
+            return []
+        
+        # Collapse repeated (source, target, type) triples before hitting the DB
+        counts = Counter(
+            (e.source_id, e.target_id, e.edge_type) for e in edges_in
+        )
+        first_seen = {}
+        for e in edges_in:
+            first_seen.setdefault((e.source_id, e.target_id, e.edge_type), e)
+        
+        values = [
+            {
+                "source_id": source_id,
+                "target_id": target_id,
+                "edge_type": edge_type,
+                "occurrence_count": count,
+                "weight": first_seen[(source_id, target_id, edge_type)].weight,
+                "attributes": first_seen[(source_id, target_id, edge_type)].attributes
+            }
+            for (source_id, target_id, edge_type), count in counts.items()
+        ]
+        
+        return await self._upsert_counted(
+            db, values=values, preload_nodes=preload_nodes
+        )
+    
+    async def bulk_create_counted(
+        self,
+        db: AsyncSession,
+        *,
+        edge_type: str,
+        counts: Dict[Tuple[int, int], int],
+        weight: float = 1.0,
+        preload_nodes: bool = False
+    ) -> List[GraphEdge]:
+        """Bulk create edges from pre-aggregated (source_id, target_id) counts."""
+        return await self._upsert_counted(
+            db,
+            values=[
+                {
+                    "source_id": source_id,
+                    "target_id": target_id,
+                    "edge_type": edge_type,
+                    "occurrence_count": count,
+                    "weight": weight,
+                    "attributes": None
+                }
+                for (source_id, target_id), count in counts.items()
+            ],
+            preload_nodes=preload_nodes
+        )
+    
+    async def _upsert_counted(
+        self,
+        db: AsyncSession,
+        *,
+        values: List[Dict[str, Any]],
+        preload_nodes: bool = False
     ) -> List[GraphEdge]:
-        """Bulk create edges."""
+        """
+        Upsert edge rows, adding occurrence_count onto existing edges.
+        
+        With preload_nodes, the endpoint nodes are loaded too, so later
+        db.get() calls hit the identity map instead of a SELECT per edge.
+        """
         edges = []
-        for edge_in in edges_in:
-            edge, _ = await self.get_or_create(db, obj_in=edge_in)
-            edges.append(edge)
+        for i in range(0, len(values), _UPSERT_BATCH):
+            stmt = self.upsert_stmt(db).values(values[i:i + _UPSERT_BATCH])
+            query = (
+                stmt.on_conflict_do_update(
+                    index_elements=["source_id", "target_id", "edge_type"],
+                    set_={
+                        "occurrence_count": (
+                            GraphEdge.occurrence_count
+                            + stmt.excluded.occurrence_count
+                        ),
+                        "updated_at": func.now()
+                    }
+                )
+                .returning(GraphEdge)
+                .execution_options(populate_existing=True)
+            )
+            result = await db.execute(query)
+            edges.extend(result.scalars())
+        
+        if preload_nodes:
+            node_ids = list(
+                {e.source_id for e in edges} | {e.target_id for e in edges}
+            )
+            for i in range(0, len(node_ids), _UPSERT_BATCH):
+                await db.execute(
+                    select(GraphNode).where(
+                        GraphNode.id.in_(node_ids[i:i + _UPSERT_BATCH])
+                    )
+                )
         return edges
     
+    def stream_projection(
+        self,
+        db: AsyncSession,
+        *,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[Row]]:
+        """Stream (source_id, target_id, weight) for every edge in row batches."""
+        query = select(GraphEdge.source_id, GraphEdge.target_id, GraphEdge.weight)
+        return stream_rows(db, query, batch_size=batch_size)
+    
     async def get_stats(
         self,
-        db: AsyncSession
+        db: AsyncSession,
+        *,
+        exact: bool = False
     ) -> Dict[str, Any]:
         """Get edge statistics."""
-        # Total count
-        total_query = select(func.count()).select_from(GraphEdge)
-        total_result = await db.execute(total_query)
-        total = total_result.scalar() or 0
-        
-        # By type
         type_query = (
             select(GraphEdge.edge_type, func.count(GraphEdge.id))
             .group_by(GraphEdge.edge_type)
         )
-        type_result = await db.execute(type_query)
-        by_type = {row[0]: row[1] for row in type_result.all()}
+        weight_query = select(
+            func.coalesce(func.avg(GraphEdge.weight), 0.0, type_=Float)
+        )
         
-        # Average weight
-        weight_query = select(func.avg(GraphEdge.weight))
-        weight_result = await db.execute(weight_query)
-        avg_weight = weight_result.scalar() or 0
+        # Independent queries run concurrently on separate sessions
+        total, type_rows, weight_rows = await asyncio.gather(
+            self.count(db, exact=exact),
+            fetch_rows(db, type_query),
+            fetch_rows(db, weight_query)
+        )
+        by_type = {row[0]: row[1] for row in type_rows}
+        avg_weight = weight_rows[0][0]
         
         return {
             "total_edges": total,
             "by_type": by_type,
-            "average_weight": float(avg_weight)
+            "average_weight": avg_weight
         }
 
 
@@ -1,13 +1,28 @@
-from typing import Optional, List, Dict, Any
+import asyncio
+from typing import Optional, List, Dict, Any, AsyncIterator
 from datetime import datetime
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, or_, update, bindparam, literal
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, fetch_rows, list_core
 from app.models.post import Post
 from app.schemas.post import PostCreate, PostUpdate, PostFilter
 
+# Columns returned by the Core list variants (matches PostResponse)
+_POST_LIST_COLUMNS = (
+    Post.id, Post.platform_id, Post.platform, Post.content, Post.language,
+    Post.url, Post.media_urls, Post.likes_count, Post.comments_count,
+    Post.shares_count, Post.views_count, Post.posted_at, Post.hashtags,
+    Post.mentions, Post.is_processed, Post.data_source_id, Post.author_id,
+    Post.created_at, Post.updated_at
+)
+
+# Hot lookups hoisted to module level so they compile once per process
+_Q_POST_BY_PLATFORM_ID = select(Post).where(
+    Post.platform_id == bindparam("platform_id")
+)
 
 class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
     """CRUD operations for Post model."""
@@ -19,10 +34,27 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         platform_id: str
     ) -> Optional[Post]:
         """Get post by platform-specific ID."""
-        query = select(Post).where(Post.platform_id == platform_id)
-        result = await db.execute(query)
+        result = await db.execute(
+            _Q_POST_BY_PLATFORM_ID,
+            {"platform_id": platform_id}
+        )
         return result.scalar_one_or_none()
     
+    async def exists_by_platform_id(
+        self,
+        db: AsyncSession,
+        *,
+        platform_id: str
+    ) -> bool:
+        """Check whether a post exists without loading its content."""
+        query = (
+            select(literal(1))
+            .where(Post.platform_id == platform_id)
+            .limit(1)
+        )
+        result = await db.execute(query)
+        return result.scalar() is not None
+    
     async def get_with_relations(
         self,
         db: AsyncSession,
@@ -48,25 +80,25 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         obj_in: PostCreate
     ) -> tuple[Post, bool]:
         """Get existing post or create new one. Returns (post, created)."""
+        query = (
+            self.upsert_stmt(db)
+            .values(**obj_in.model_dump(exclude_unset=True))
+            .on_conflict_do_nothing(index_elements=["platform_id"])
+            .returning(Post)
+        )
+        result = await db.execute(query)
+        new_post = result.scalar_one_or_none()
+        if new_post:
+            return new_post, True
+        
         existing = await self.get_by_platform_id(
             db,
             platform_id=obj_in.platform_id
         )
-        if existing:
-            return existing, False
-        
-        new_post = await self.create(db, obj_in=obj_in)
-        return new_post, True
+        return existing, False
     
-    async def get_filtered(
-        self,
-        db: AsyncSession,
-        *,
-        filters: PostFilter,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[Post]:
-        """Get posts with filters."""
+    def _filtered_query(self, filters: PostFilter):
+        """Build the select for a PostFilter."""
         query = select(Post)
         
         if filters.platform:
@@ -86,15 +118,59 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         if filters.search:
             query = query.where(Post.content.ilike(f"%{filters.search}%"))
         if filters.hashtags:
-            # JSON contains for hashtags
-            for tag in filters.hashtags:
-                query = query.where(Post.hashtags.contains([tag]))
-        
-        query = query.order_by(Post.posted_at.desc())
-        query = query.offset(skip).limit(limit)
+            # Single containment check for all requested hashtags
+            query = query.where(Post.hashtags.contains(filters.hashtags))
         
+        return query.order_by(Post.posted_at.desc())
+    
+    async def get_filtered(
+        self,
+        db: AsyncSession,
+        *,
+        filters: PostFilter,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Post]:
+        """Get posts with filters."""
+        query = self._filtered_query(filters).offset(skip).limit(limit)
         result = await db.execute(query)
-        return list(result.scalars().all())
+        return result.scalars().all()
+    
+    async def get_filtered_core(
+        self,
+        db: AsyncSession,
+        *,
+        filters: PostFilter,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Get filtered posts as plain dicts without building ORM objects."""
+        query = (
+            self._filtered_query(filters)
+            .with_only_columns(*_POST_LIST_COLUMNS)
+            .offset(skip)
+            .limit(limit)
+        )
+        return await list_core(db, query)
+    
+    async def stream_filtered_batches(
+        self,
+        db: AsyncSession,
+        *,
+        filters: PostFilter,
+        columns: tuple,
+        limit: Optional[int] = None,
+        batch_size: int = 256
+    ) -> AsyncIterator[List[Row]]:
+        """Stream the given columns of filtered posts in row batches."""
+        query = self._filtered_query(filters).with_only_columns(*columns)
+        if limit is not None:
+            query = query.limit(limit)
+        query = query.execution_options(yield_per=batch_size)
+        
+        result = await db.stream(query)
+        async for batch in result.partitions(batch_size):
+            yield batch
     
     async def count_filtered(
         self,
@@ -121,7 +197,7 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
             query = query.where(Post.posted_at <= filters.date_to)
         
         result = await db.execute(query)
-        return result.scalar() or 0
+        return result.scalar_one()
     
     async def get_unprocessed(
         self,
@@ -133,13 +209,14 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         """Get unprocessed posts."""
         query = (
             select(Post)
+            # Same form as the idx_post_unprocessed predicate so it matches
             .where(Post.is_processed == False)
             .order_by(Post.created_at.asc())
             .offset(skip)
             .limit(limit)
         )
         result = await db.execute(query)
-        return list(result.scalars().all())
+        return result.scalars().all()
     
     async def mark_processed(
         self,
@@ -149,17 +226,33 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         error: Optional[str] = None
     ) -> Optional[Post]:
         """Mark post as processed."""
-        post = await self.get(db, post_id)
-        if not post:
-            return None
-        
-        post.is_processed = True
-        post.processing_error = error
-        
-        db.add(post)
-        await db.flush()
-        await db.refresh(post)
-        return post
+        query = (
+            update(Post)
+            .where(Post.id == post_id)
+            .values(is_processed=True, processing_error=error)
+            .returning(Post)
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+    
+    async def mark_many_processed(
+        self,
+        db: AsyncSession,
+        *,
+        post_ids: List[int]
+    ) -> int:
+        """Mark posts as processed in a single UPDATE."""
+        if not post_ids:
+            return 0
+        query = (
+            update(Post)
+            .where(Post.id.in_(post_ids))
+            .values(is_processed=True, processing_error=None)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(query)
+        return result.rowcount
     
     async def bulk_create(
         self,
@@ -199,7 +292,7 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
             .limit(limit)
         )
         result = await db.execute(query)
-        return list(result.scalars().all())
+        return result.scalars().all()
     
     async def get_by_hashtag(
         self,
@@ -218,42 +311,39 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
             .limit(limit)
         )
         result = await db.execute(query)
-        return list(result.scalars().all())
+        return result.scalars().all()
     
     async def get_stats(
         self,
         db: AsyncSession
     ) -> Dict[str, Any]:
         """Get post statistics."""
-        # Total count
-        total_query = select(func.count()).select_from(Post)
-        total_result = await db.execute(total_query)
-        total = total_result.scalar() or 0
-        
-        # Processed count
         processed_query = (
             select(func.count())
             .select_from(Post)
-            .where(Post.is_processed == True)
+            .where(Post.is_processed.is_(True))
         )
-        processed_result = await db.execute(processed_query)
-        processed = processed_result.scalar() or 0
-        
-        # By platform
         platform_query = (
             select(Post.platform, func.count(Post.id))
             .group_by(Post.platform)
         )
-        platform_result = await db.execute(platform_query)
-        by_platform = {row[0]: row[1] for row in platform_result.all()}
-        
-        # By language
         language_query = (
             select(Post.language, func.count(Post.id))
             .group_by(Post.language)
         )
-        language_result = await db.execute(language_query)
-        by_language = {row[0]: row[1] for row in language_result.all()}
+        
+        # Independent queries run concurrently on separate sessions
+        processed_rows, platform_rows, language_rows = await asyncio.gather(
+            fetch_rows(db, processed_query),
+            fetch_rows(db, platform_query),
+            fetch_rows(db, language_query)
+        )
+        processed = processed_rows[0][0]
+        by_platform = {row[0]: row[1] for row in platform_rows}
+        by_language = {row[0]: row[1] for row in language_rows}
+        # The platform breakdown already scans every post, so its sum is an
+        # exact total that always agrees with the other counts
+        total = sum(by_platform.values())
         
         return {
             "total": total,
@@ -273,13 +363,35 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         limit: int = 100
     ) -> List[Post]:
         """Search posts by content."""
+        query = self._search_query(query_str, platform)
+        query = query.offset(skip).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+    
+    async def search_core(
+        self,
+        db: AsyncSession,
+        *,
+        query_str: str,
+        platform: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Search posts by content, returning plain dicts."""
+        query = (
+            self._search_query(query_str, platform)
+            .with_only_columns(*_POST_LIST_COLUMNS)
+            .offset(skip)
+            .limit(limit)
+        )
+        return await list_core(db, query)
+    
+    def _search_query(self, query_str: str, platform: Optional[str]):
+        """Build the select for a content search."""
         query = select(Post).where(Post.content.ilike(f"%{query_str}%"))
         if platform:
             query = query.where(Post.platform == platform)
-        query = query.order_by(Post.posted_at.desc())
-        query = query.offset(skip).limit(limit)
-        result = await db.execute(query)
-        return list(result.scalars().all())
+        return query.order_by(Post.posted_at.desc())
 
 
 # Create singleton instance
@@ -1,8 +1,9 @@
+import asyncio
 from typing import Optional, List, Dict, Any
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, Float
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, fetch_rows
 from app.models.trend import Trend
 from app.schemas.trend import TrendCreate, TrendUpdate
 
@@ -128,15 +129,15 @@ class CRUDTrend(CRUDBase[Trend, TrendCreate, TrendUpdate]):
         status: str
     ) -> Optional[Trend]:
         """Update trend status (active, declining, ended)."""
-        trend = await self.get(db, trend_id)
-        if not trend:
-            return None
-        
-        trend.is_active = status
-        db.add(trend)
-        await db.flush()
-        await db.refresh(trend)
-        return trend
+        query = (
+            update(Trend)
+            .where(Trend.id == trend_id)
+            .values(is_active=status)
+            .returning(Trend)
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
     
     async def bulk_create(
         self,
@@ -156,30 +157,31 @@ class CRUDTrend(CRUDBase[Trend, TrendCreate, TrendUpdate]):
         db: AsyncSession
     ) -> Dict[str, Any]:
         """Get trend statistics."""
-        # Total count
         total_query = select(func.count()).select_from(Trend)
-        total_result = await db.execute(total_query)
-        total = total_result.scalar() or 0
-        
-        # Active count
         active_query = (
             select(func.count())
             .select_from(Trend)
             .where(Trend.is_active == "active")
         )
-        active_result = await db.execute(active_query)
-        active = active_result.scalar() or 0
+        avg_query = select(
+            func.coalesce(func.avg(Trend.volume), 0.0, type_=Float)
+        )
         
-        # Average volume
-        avg_query = select(func.avg(Trend.volume))
-        avg_result = await db.execute(avg_query)
-        avg_volume = avg_result.scalar() or 0
+        # Independent queries run concurrently on separate sessions
+        total_rows, active_rows, avg_rows = await asyncio.gather(
+            fetch_rows(db, total_query),
+            fetch_rows(db, active_query),
+            fetch_rows(db, avg_query)
+        )
+        total = total_rows[0][0]
+        active = active_rows[0][0]
+        avg_volume = avg_rows[0][0]
         
         return {
             "total": total,
             "active": active,
             "declining": total - active,
-            "average_volume": float(avg_volume)
+            "average_volume": avg_volume
         }
 
 
@@ -1,15 +1,201 @@
-from typing import Optional, List
-from sqlalchemy import select, or_
+import hmac
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Set, Union
+from sqlalchemy import select, or_, update, bindparam, lambda_stmt, inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, list_core
+from app.database import run_after_commit
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import hash_password, verify_password
+from app.core.security import (
+    hash_password,
+    hash_password_async,
+    verify_password_async
+)
+
+# Checked when the user does not exist so both paths cost one hash verification
+_DUMMY_HASH = hash_password("x" * 16)
+
+# Hot user queries, built once and served from the compiled cache
+_Q_BY_EMAIL = lambda_stmt(
+    lambda: select(User).where(User.email == bindparam("email"))
+)
+_Q_BY_USERNAME = lambda_stmt(
+    lambda: select(User).where(User.username == bindparam("username"))
+)
+_Q_BY_IDENTIFIER = lambda_stmt(
+    lambda: select(User).where(
+        or_(
+            User.email == bindparam("identifier"),
+            User.username == bindparam("identifier")
+        )
+    )
+)
+# Keyset pages: rows after the last seen id, walked via the primary key
+_Q_ACTIVE = lambda_stmt(
+    lambda: select(User)
+    .where(User.is_active.is_(True), User.id > bindparam("after_id"))
+    .order_by(User.id)
+    .limit(bindparam("limit"))
+)
+_Q_BY_ROLE = lambda_stmt(
+    lambda: select(User)
+    .where(User.role == bindparam("role"), User.id > bindparam("after_id"))
+    .order_by(User.id)
+    .limit(bindparam("limit"))
+)
+
+# Columns for list views that never touch relationships (matches UserResponse)
+_USER_LIST_COLUMNS = (
+    User.id, User.email, User.username, User.full_name, User.is_active,
+    User.role, User.created_at, User.updated_at
+)
+
+# Read-through cache for identifier lookups (seconds)
+USER_CACHE_TTL = 60
+
+# Session.info key for lookups already resolved by this session (one request)
+_SESSION_CACHE_KEY = "user_lookups"
+
+
+def _email_key(email: str) -> str:
+    return f"user:email:{email}"
+
+
+def _username_key(username: str) -> str:
+    return f"user:username:{username}"
+
+
+# Cached users never carry the password hash; authenticate reads it fresh
+_CACHED_COLUMNS = tuple(
+    c.key for c in User.__table__.columns if c.key != "hashed_password"
+)
+
+
+def _user_to_cache(user: User) -> Dict[str, Any]:
+    """Serialize a user's non-secret column values for the cache."""
+    return {key: getattr(user, key) for key in _CACHED_COLUMNS}
+
+
+def _session_cache(db: AsyncSession) -> Dict[str, User]:
+    """Identifier lookups memoized for the lifetime of the session."""
+    return db.info.setdefault(_SESSION_CACHE_KEY, {})
+
+
+def _user_from_cache(data: Dict[str, Any]) -> User:
+    """Rebuild a detached, clean User from cached column values."""
+    data["role"] = UserRole(data["role"])
+    for field in ("created_at", "updated_at"):
+        if data.get(field):
+            data[field] = datetime.fromisoformat(data[field])
+    user = User(**data)
+    make_transient_to_detached(user)
+    return user
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
-    """CRUD operations for User model."""
+    """
+    CRUD operations for User model.
+    
+    Emails, usernames and login identifiers are lowercased by the user
+    and auth schemas, so lookups here compare them as given.
+    """
+    
+    async def _cache_get(
+        self,
+        db: AsyncSession,
+        key: str
+    ) -> Optional[User]:
+        """Return a cached user attached to the session, if present."""
+        from app.services.redis_service import redis_service
+        
+        local = _session_cache(db)
+        user = local.get(key)
+        # Updates refresh the same object, so re-check it still owns the key
+        if user is not None and not inspect(user).was_deleted and key in (
+            _email_key(user.email), _username_key(user.username)
+        ):
+            return user
+        
+        if not redis_service.is_connected:
+            return None
+        data = await redis_service.get_json(key)
+        if not data:
+            return None
+        user = await self.load_cached(db, data)
+        local[key] = user
+        return user
+    
+    def dump_cached(self, user: User) -> Dict[str, Any]:
+        """Column values of a user, ready for a JSON cache entry."""
+        return _user_to_cache(user)
+    
+    async def load_cached(
+        self,
+        db: AsyncSession,
+        data: Dict[str, Any]
+    ) -> User:
+        """Attach a user rebuilt from a cache entry to the session."""
+        return await db.merge(_user_from_cache(data), load=False)
+    
+    async def _cache_set(
+        self,
+        db: AsyncSession,
+        user: Optional[User]
+    ) -> None:
+        """Store a user under both its email and username keys."""
+        from app.services.redis_service import redis_service
+        
+        if user is None:
+            return
+        local = _session_cache(db)
+        local[_email_key(user.email)] = user
+        local[_username_key(user.username)] = user
+        if not redis_service.is_connected:
+            return
+        data = _user_to_cache(user)
+        await redis_service.set_json(_email_key(user.email), data, USER_CACHE_TTL)
+        await redis_service.set_json(_username_key(user.username), data, USER_CACHE_TTL)
+    
+    def invalidate_cache(self, db: AsyncSession, user: User) -> None:
+        """
+        Drop cached lookups for a user once the session commits.
+        
+        Dropping before the commit would let a concurrent request re-cache
+        the old row in between.
+        """
+        from app.services.redis_service import redis_service
+        
+        keys = (_email_key(user.email), _username_key(user.username))
+        user_id = user.id
+        
+        async def drop() -> None:
+            if not redis_service.is_connected:
+                return
+            await redis_service.delete_many(*keys)
+            await redis_service.drop_token_users(user_id)
+        
+        run_after_commit(db, drop)
+    
+    async def _update_returning(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        **values
+    ) -> User:
+        """UPDATE a user and get the fresh row back in one round-trip."""
+        query = (
+            update(User)
+            .where(User.id == user_id)
+            .values(**values)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(query)
+        return result.scalar_one()
     
     async def get_by_email(
         self,
@@ -18,9 +204,14 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         email: str
     ) -> Optional[User]:
         """Get user by email."""
-        query = select(User).where(User.email == email.lower())
-        result = await db.execute(query)
-        return result.scalar_one_or_none()
+        cached = await self._cache_get(db, _email_key(email))
+        if cached:
+            return cached
+        
+        result = await db.execute(_Q_BY_EMAIL, {"email": email})
+        user = result.scalar_one_or_none()
+        await self._cache_set(db, user)
+        return user
     
     async def get_by_username(
         self,
@@ -29,9 +220,14 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         username: str
     ) -> Optional[User]:
         """Get user by username."""
-        query = select(User).where(User.username == username.lower())
-        result = await db.execute(query)
-        return result.scalar_one_or_none()
+        cached = await self._cache_get(db, _username_key(username))
+        if cached:
+            return cached
+        
+        result = await db.execute(_Q_BY_USERNAME, {"username": username})
+        user = result.scalar_one_or_none()
+        await self._cache_set(db, user)
+        return user
     
     async def get_by_email_or_username(
         self,
@@ -40,56 +236,105 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         identifier: str
     ) -> Optional[User]:
         """Get user by email or username."""
-        identifier_lower = identifier.lower()
-        query = select(User).where(
-            or_(
-                User.email == identifier_lower,
-                User.username == identifier_lower
-            )
+        # Usernames cannot contain "@", so the identifier picks one key
+        key = (
+            _email_key(identifier)
+            if "@" in identifier
+            else _username_key(identifier)
+        )
+        cached = await self._cache_get(db, key)
+        if cached:
+            return cached
+        
+        result = await db.execute(
+            _Q_BY_IDENTIFIER,
+            {"identifier": identifier}
+        )
+        user = result.scalar_one_or_none()
+        await self._cache_set(db, user)
+        return user
+    
+    async def find_conflicts(
+        self,
+        db: AsyncSession,
+        *,
+        email: str,
+        username: str
+    ) -> Set[str]:
+        """Names of the unique fields ("email", "username") already taken."""
+        query = (
+            select(User.email, User.username)
+            .where(or_(User.email == email, User.username == username))
+            .limit(2)
         )
         result = await db.execute(query)
-        return result.scalar_one_or_none()
+        conflicts = set()
+        for row in result:
+            if row.email == email:
+                conflicts.add("email")
+            if row.username == username:
+                conflicts.add("username")
+        return conflicts
     
     async def create(
         self,
         db: AsyncSession,
         *,
         obj_in: UserCreate
-    ) -> User:
-        """Create a new user with hashed password."""
-        db_obj = User(
-            email=obj_in.email.lower(),
-            username=obj_in.username.lower(),
-            hashed_password=hash_password(obj_in.password),
-            full_name=obj_in.full_name,
-            is_active=True,
+    ) -> Optional[User]:
+        """Create a new user, or return None if the email or username is taken."""
+        return await self._insert_user(
+            db,
+            obj_in=obj_in,
             is_superuser=False,
             role=UserRole.VIEWER
         )
-        db.add(db_obj)
-        await db.flush()
-        await db.refresh(db_obj)
-        return db_obj
     
     async def create_superuser(
         self,
         db: AsyncSession,
         *,
         obj_in: UserCreate
-    ) -> User:
-        """Create a superuser."""
-        db_obj = User(
-            email=obj_in.email.lower(),
-            username=obj_in.username.lower(),
-            hashed_password=hash_password(obj_in.password),
-            full_name=obj_in.full_name,
-            is_active=True,
+    ) -> Optional[User]:
+        """Create a superuser, returning the existing account on conflict."""
+        db_obj = await self._insert_user(
+            db,
+            obj_in=obj_in,
             is_superuser=True,
             role=UserRole.ADMIN
         )
-        db.add(db_obj)
-        await db.flush()
-        await db.refresh(db_obj)
+        if db_obj is None:
+            db_obj = await self.get_by_email(db, email=obj_in.email)
+        return db_obj
+    
+    async def _insert_user(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: UserCreate,
+        is_superuser: bool,
+        role: UserRole
+    ) -> Optional[User]:
+        """INSERT ... ON CONFLICT DO NOTHING RETURNING in one round trip."""
+        hashed_password = await hash_password_async(obj_in.password)
+        query = (
+            self.upsert_stmt(db)
+            .values(
+                email=obj_in.email,
+                username=obj_in.username,
+                hashed_password=hashed_password,
+                full_name=obj_in.full_name,
+                is_active=True,
+                is_superuser=is_superuser,
+                role=role
+            )
+            .on_conflict_do_nothing()
+            .returning(User)
+        )
+        result = await db.execute(query)
+        db_obj = result.scalar_one_or_none()
+        if db_obj is not None:
+            self.invalidate_cache(db, db_obj)
         return db_obj
     
     async def authenticate(
@@ -100,12 +345,32 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         password: str
     ) -> Optional[User]:
         """Authenticate user by email/username and password."""
-        user = await self.get_by_email_or_username(db, identifier=identifier)
-        if not user:
-            return None
-        if not verify_password(password, user.hashed_password):
-            return None
-        return user
+        # Not served from the cache, which never holds the password hash
+        result = await db.execute(
+            _Q_BY_IDENTIFIER,
+            {"identifier": identifier}
+        )
+        user = result.scalar_one_or_none()
+        password_ok = await verify_password_async(
+            password,
+            user.hashed_password if user else _DUMMY_HASH
+        )
+        ok = (user is not None) & password_ok
+        if hmac.compare_digest(b"\x01" if ok else b"\x00", b"\x01"):
+            return user
+        return None
+    
+    async def get_hashed_password(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int
+    ) -> Optional[str]:
+        """Read a user's password hash, which cached users do not carry."""
+        result = await db.execute(
+            select(User.hashed_password).where(User.id == user_id)
+        )
+        return result.scalar_one_or_none()
     
     async def update_password(
         self,
@@ -115,10 +380,13 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         new_password: str
     ) -> User:
         """Update user password."""
-        user.hashed_password = hash_password(new_password)
-        db.add(user)
-        await db.flush()
-        await db.refresh(user)
+        hashed_password = await hash_password_async(new_password)
+        user = await self._update_returning(
+            db,
+            user_id=user.id,
+            hashed_password=hashed_password
+        )
+        self.invalidate_cache(db, user)
         return user
     
     async def activate(
@@ -128,10 +396,12 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         user: User
     ) -> User:
         """Activate a user account."""
-        user.is_active = True
-        db.add(user)
-        await db.flush()
-        await db.refresh(user)
+        user = await self._update_returning(
+            db,
+            user_id=user.id,
+            is_active=True
+        )
+        self.invalidate_cache(db, user)
         return user
     
     async def deactivate(
@@ -141,27 +411,50 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         user: User
     ) -> User:
         """Deactivate a user account."""
-        user.is_active = False
-        db.add(user)
-        await db.flush()
-        await db.refresh(user)
+        user = await self._update_returning(
+            db,
+            user_id=user.id,
+            is_active=False
+        )
+        self.invalidate_cache(db, user)
+        return user
+    
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: User,
+        obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        """Update a user and drop its cached lookups."""
+        # Invalidate under the old email/username before they change
+        self.invalidate_cache(db, db_obj)
+        return await super().update(db, db_obj=db_obj, obj_in=obj_in)
+    
+    async def delete(
+        self,
+        db: AsyncSession,
+        *,
+        id: int
+    ) -> Optional[User]:
+        """Delete a user and drop its cached lookups and token snapshots."""
+        user = await super().delete(db, id=id)
+        if user is not None:
+            self.invalidate_cache(db, user)
         return user
     
     async def get_active_users(
         self,
         db: AsyncSession,
         *,
-        skip: int = 0,
+        after_id: int = 0,
         limit: int = 100
     ) -> List[User]:
-        """Get all active users."""
-        query = (
-            select(User)
-            .where(User.is_active == True)
-            .offset(skip)
-            .limit(limit)
+        """Get active users after `after_id`; the last row's id is the next cursor."""
+        result = await db.execute(
+            _Q_ACTIVE,
+            {"after_id": after_id, "limit": limit}
         )
-        result = await db.execute(query)
         return list(result.scalars().all())
     
     async def get_by_role(
@@ -169,19 +462,35 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         db: AsyncSession,
         *,
         role: UserRole,
-        skip: int = 0,
+        after_id: int = 0,
         limit: int = 100
     ) -> List[User]:
-        """Get users by role."""
-        query = (
-            select(User)
-            .where(User.role == role)
-            .offset(skip)
-            .limit(limit)
+        """Get users by role after `after_id`; the last row's id is the next cursor."""
+        result = await db.execute(
+            _Q_BY_ROLE,
+            {"role": role, "after_id": after_id, "limit": limit}
         )
-        result = await db.execute(query)
         return list(result.scalars().all())
 
+    
+    async def get_multi_core(
+        self,
+        db: AsyncSession,
+        *,
+        role: Optional[UserRole] = None,
+        active_only: bool = False,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """List users as plain dicts of public columns, without ORM objects."""
+        query = select(*_USER_LIST_COLUMNS)
+        if role is not None:
+            query = query.where(User.role == role)
+        if active_only:
+            query = query.where(User.is_active.is_(True))
+        query = query.order_by(User.id).offset(skip).limit(limit)
+        return await list_core(db, query)
+
 
 # Create singleton instance
 user = CRUDUser(User)
@@ -1,22 +1,68 @@
+from itertools import chain
+from typing import Any, Awaitable, Callable, Set, Union
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
     async_sessionmaker
 )
-from sqlalchemy.orm import declarative_base
-from sqlalchemy import create_engine
+from sqlalchemy.orm import declarative_base, Session
+from sqlalchemy import create_engine, event, make_url
 from app.core.config import settings
+from app.utils.json import orjson_dumps_db, orjson_dumps_str, orjson_loads
+
+# orjson for JSON/JSONB columns on every engine (stdlib json is the default)
+JSON_CODECS = {
+    "json_serializer": orjson_dumps_str,
+    "json_deserializer": orjson_loads,
+}
+
+# asyncpg gets orjson bytes straight through its codecs (see below)
+_ASYNCPG = make_url(settings.DATABASE_URL).get_driver_name() == "asyncpg"
+ASYNCPG_JSON_CODECS = {
+    "json_serializer": orjson_dumps_db,
+    "json_deserializer": orjson_loads,
+}
 
 # Async engine for FastAPI
 async_engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     future=True,
-    pool_size=20,
-    max_overflow=10,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
     pool_pre_ping=True,
+    query_cache_size=1200,
+    **(ASYNCPG_JSON_CODECS if _ASYNCPG else JSON_CODECS),
 )
 
+
+async def _register_orjson_codecs(conn) -> None:
+    """Pass JSON/JSONB as bytes, skipping the dialect's str round-trip."""
+    await conn.set_type_codec(
+        "json",
+        encoder=lambda value: value,
+        decoder=orjson_loads,
+        schema="pg_catalog",
+        format="binary",
+    )
+    # Binary JSONB carries a leading version byte (\x01)
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=lambda value: b"\x01" + value,
+        decoder=lambda value: orjson_loads(memoryview(value)[1:]),
+        schema="pg_catalog",
+        format="binary",
+    )
+
+
+if _ASYNCPG:
+    # Runs after the dialect's own connect hook, replacing its codecs
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_json_codecs(dbapi_connection, connection_record) -> None:
+        dbapi_connection.run_async(_register_orjson_codecs)
+
 # Async session factory
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine,
@@ -31,18 +77,70 @@ sync_engine = create_engine(
     settings.DATABASE_SYNC_URL,
     echo=settings.DEBUG,
     pool_pre_ping=True,
+    **JSON_CODECS,
 )
 
 # Base class for models
 Base = declarative_base()
 
 
+@event.listens_for(Session, "after_flush")
+def _mark_flush_writes(session, flush_context) -> None:
+    session.info["has_writes"] = True
+    session.info.setdefault("written_tables", set()).update(
+        obj.__table__.name
+        for obj in chain(session.new, session.dirty, session.deleted)
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        session = orm_execute_state.session
+        session.info["has_writes"] = True
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            session.info.setdefault("written_tables", set()).add(table.name)
+
+
+def pop_written_tables(session: Union[Session, AsyncSession]) -> Set[str]:
+    """Names of tables the session wrote to since the last call."""
+    return session.info.pop("written_tables", set())
+
+
+def run_after_commit(
+    session: AsyncSession,
+    callback: Callable[[], Awaitable[Any]]
+) -> None:
+    """Queue a coroutine function for get_db to await once the session commits."""
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+def has_writes(session: AsyncSession) -> bool:
+    """Whether the session flushed or executed any INSERT/UPDATE/DELETE."""
+    return bool(
+        session.info.get("has_writes")
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+
 async def get_db() -> AsyncSession:
     """Dependency for getting async database session."""
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            # Read-only requests skip the COMMIT round-trip
+            if has_writes(session):
+                await session.commit()
+                await _bump_table_versions(pop_written_tables(session))
+                for callback in session.info.pop("after_commit", ()):
+                    await callback()
         except Exception:
             await session.rollback()
             raise
@@ -50,6 +148,13 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def _bump_table_versions(tables: Set[str]) -> None:
+    """Invalidate caches keyed on the versions of the committed tables."""
+    if tables:
+        from app.services.redis_service import redis_service
+        await redis_service.bump_table_versions(tables)
+
+
 async def init_db() -> None:
     """Initialize database tables."""
     # Import models to ensure they are registered with Base
@@ -5,16 +5,21 @@ from fastapi.responses import ORJSONResponse
 import redis.asyncio as redis
 from loguru import logger
 import sys
+import time
 
 from app.core.config import settings
 from app.database import init_db, close_db
 from app.api.v1.router import api_router
+from app.services.redis_service import redis_service
+from app.services.brain_service import brain_service
+from app.schemas import warmup as warmup_schemas
 
 
 # Configure logging
 logger.remove()
 logger.add(
     sys.stdout,
+    enqueue=True,
     colorize=True,
     format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
     level="DEBUG" if settings.DEBUG else "INFO"
@@ -24,6 +29,11 @@ logger.add(
 # Redis client (global)
 redis_client: redis.Redis = None
 
+# Last Redis ping result reused by /health for this many seconds
+HEALTH_PING_TTL = 1.0
+_last_ping_ok: bool = False
+_last_ping_ts: float = float("-inf")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,6 +42,8 @@ async def lifespan(app: FastAPI):
     
     logger.info("Starting up Persian Social Analytics API...")
     
+    warmup_schemas()
+    
     # Initialize database
     try:
         await init_db()
@@ -47,6 +59,7 @@ async def lifespan(app: FastAPI):
             decode_responses=True
         )
         await redis_client.ping()
+        await redis_service.connect()
         logger.info("Redis connected successfully")
     except Exception as e:
         logger.error(f"Redis connection failed: {e}")
@@ -61,8 +74,11 @@ async def lifespan(app: FastAPI):
     
     if redis_client:
         await redis_client.close()
+        await redis_service.disconnect()
         logger.info("Redis connection closed")
     
+    await brain_service.close()
+    
     await close_db()
     logger.info("Database connection closed")
 
@@ -99,14 +115,20 @@ async def health_check():
         "version": settings.APP_VERSION,
     }
     
-    # Check Redis
-    global redis_client
+    # Check Redis, reusing a recent ping so probes don't hit it every call
+    global redis_client, _last_ping_ok, _last_ping_ts
     if redis_client:
-        try:
-            await redis_client.ping()
-            health_status["redis"] = "connected"
-        except Exception:
-            health_status["redis"] = "disconnected"
+        now = time.monotonic()
+        if now - _last_ping_ts >= HEALTH_PING_TTL:
+            try:
+                await redis_client.ping()
+                _last_ping_ok = True
+            except Exception:
+                _last_ping_ok = False
+            _last_ping_ts = now
+        health_status["redis"] = (
+            "connected" if _last_ping_ok else "disconnected"
+        )
     else:
         health_status["redis"] = "not configured"
     
@@ -132,10 +154,14 @@ app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
 # Request logging middleware
-@app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all incoming requests."""
-    logger.debug(f"Request: {request.method} {request.url.path}")
+    logger.debug("Request: {} {}", request.method, request.url.path)
     response = await call_next(request)
-    logger.debug(f"Response: {response.status_code}")
+    logger.debug("Response: {}", response.status_code)
     return response
+
+
+# Only pay for per-request logging in debug mode
+if settings.DEBUG:
+    app.middleware("http")(log_requests)
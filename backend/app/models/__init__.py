@@ -8,7 +8,7 @@ from app.models.data_source import DataSource, SourcePlatform
 from app.models.author import Author
 from app.models.post import Post
 from app.models.analysis import Analysis, AnalysisType, AnalysisStatus
-from app.models.analysis_result import AnalysisResult
+from app.models.analysis_result import AnalysisResult, AnalysisResultAgg
 from app.models.trend import Trend
 from app.models.graph import GraphNode, GraphEdge
 from app.models.dashboard import Dashboard
@@ -33,6 +33,7 @@ __all__ = [
     "AnalysisType",
     "AnalysisStatus",
     "AnalysisResult",
+    "AnalysisResultAgg",
     # Trend
     "Trend",
     # Graph
@@ -1,9 +1,9 @@
 from sqlalchemy import (
-    Column, String, Integer, Text, JSON,
-    ForeignKey, Enum as SQLEnum, Float
+    Column, String, Integer, Text,
+    ForeignKey, Float, DateTime, Index
 )
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, JSONType, str_enum
 import enum
 
 
@@ -41,20 +41,20 @@ class Analysis(BaseModel):
     
     # Analysis configuration
     analysis_type = Column(
-        SQLEnum(AnalysisType),
+        str_enum(AnalysisType, "ck_analyses_analysis_type"),
         default=AnalysisType.FULL,
         nullable=False,
         index=True
     )
-    config = Column(JSON, nullable=True)  # Analysis parameters
+    config = Column(JSONType, nullable=True)  # Analysis parameters
     
     # Data selection
-    query_filters = Column(JSON, nullable=True)  # Filters for selecting posts
+    query_filters = Column(JSONType, nullable=True)  # Filters for selecting posts
     post_count = Column(Integer, default=0)  # Number of posts to analyze
     
     # Status
     status = Column(
-        SQLEnum(AnalysisStatus),
+        str_enum(AnalysisStatus, "ck_analyses_status"),
         default=AnalysisStatus.PENDING,
         nullable=False,
         index=True
@@ -62,12 +62,12 @@ class Analysis(BaseModel):
     progress = Column(Float, default=0.0)  # 0.0 to 100.0
     
     # Results
-    summary = Column(JSON, nullable=True)  # Summary of results
+    summary = Column(JSONType, nullable=True)  # Summary of results
     error_message = Column(Text, nullable=True)
     
     # Timing
-    started_at = Column(String(50), nullable=True)
-    completed_at = Column(String(50), nullable=True)
+    started_at = Column(DateTime(timezone=True), index=True, nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
     
     # Foreign keys
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -77,15 +77,24 @@ class Analysis(BaseModel):
     results = relationship(
         "AnalysisResult",
         back_populates="analysis",
-        lazy="dynamic",
         cascade="all, delete-orphan"
     )
     trends = relationship(
         "Trend",
         back_populates="analysis",
-        lazy="dynamic",
         cascade="all, delete-orphan"
     )
     
     def __repr__(self):
         return f"<Analysis(id={self.id}, name='{self.name}', type='{self.analysis_type}', status='{self.status}')>"
+
+
+# Composite index for a user's analyses filtered by status
+Index("ix_analyses_user_status", Analysis.user_id, Analysis.status)
+
+# Partial index for the pending-analysis poller
+Index(
+    "idx_analysis_pending",
+    Analysis.created_at,
+    postgresql_where=(Analysis.status == AnalysisStatus.PENDING.value)
+)
@@ -1,9 +1,10 @@
 from sqlalchemy import (
-    Column, String, Integer, Text, JSON,
-    ForeignKey, Float
+    BigInteger, Column, DDL, String, Integer, Text,
+    ForeignKey, Float, Index, event
 )
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.database import Base
+from app.models.base import BaseModel, JSONType
 
 
 class AnalysisResult(BaseModel):
@@ -17,17 +18,17 @@ class AnalysisResult(BaseModel):
     sentiment_confidence = Column(Float, nullable=True)  # 0.0 to 1.0
     
     # Emotion Analysis
-    emotions = Column(JSON, nullable=True)
+    emotions = Column(JSONType, nullable=True)
     # Example: {"joy": 0.8, "sadness": 0.1, "anger": 0.05, "fear": 0.05}
     dominant_emotion = Column(String(50), nullable=True)
     
     # Text Analysis
     summary = Column(Text, nullable=True)
-    keywords = Column(JSON, nullable=True)  # ["keyword1", "keyword2", ...]
-    topics = Column(JSON, nullable=True)  # [{"topic": "politics", "score": 0.85}, ...]
+    keywords = Column(JSONType, nullable=True)  # ["keyword1", "keyword2", ...]
+    topics = Column(JSONType, nullable=True)  # [{"topic": "politics", "score": 0.85}, ...]
     
     # Entity Recognition
-    entities = Column(JSON, nullable=True)
+    entities = Column(JSONType, nullable=True)
     # Example: [{"text": "تهران", "type": "location", "start": 10, "end": 15}]
     
     # Graph metrics (from BRAIN)
@@ -36,7 +37,7 @@ class AnalysisResult(BaseModel):
     community_id = Column(Integer, nullable=True)
     
     # Full raw results from BRAIN
-    raw_results = Column(JSON, nullable=True)
+    raw_results = Column(JSONType, nullable=True)
     
     # Foreign keys
     post_id = Column(Integer, ForeignKey("posts.id"), nullable=False, index=True)
@@ -48,3 +49,118 @@ class AnalysisResult(BaseModel):
     
     def __repr__(self):
         return f"<AnalysisResult(id={self.id}, post_id={self.post_id}, sentiment='{self.sentiment_label}')>"
+
+
+# GIN index for emotions @> containment filters
+Index(
+    "ix_analysis_results_emotions_gin",
+    AnalysisResult.emotions,
+    postgresql_using="gin",
+    postgresql_ops={"emotions": "jsonb_path_ops"}
+)
+
+
+class AnalysisResultAgg(Base):
+    """
+    Running totals of analysis results per (sentiment, dominant emotion).
+    
+    Maintained by triggers on analysis_results (Postgres only), so the
+    dashboard distributions read a handful of rows instead of scanning
+    every result. NULL labels are stored as ''.
+    """
+    
+    __tablename__ = "analysis_result_agg"
+    
+    sentiment_label = Column(String(20), primary_key=True, default="")
+    dominant_emotion = Column(String(50), primary_key=True, default="")
+    result_count = Column(BigInteger, nullable=False, default=0)
+    # Sum and count of non-NULL sentiment scores, for the average
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_count = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return (
+            f"<AnalysisResultAgg(sentiment='{self.sentiment_label}', "
+            f"emotion='{self.dominant_emotion}', count={self.result_count})>"
+        )
+
+
+# Statement-level triggers fold each INSERT/UPDATE/DELETE on
+# analysis_results into the rollup once, however many rows it touched.
+# Mirrored in migration 0010; create_all() installs them via this hook.
+# Rollup rows are inserted, and locked before decrementing, in key order
+# so concurrent writers take them in the same order and cannot deadlock;
+# they still serialize on hot labels.
+AGG_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION analysis_result_agg_apply() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO analysis_result_agg AS a (
+            sentiment_label, dominant_emotion,
+            result_count, score_sum, score_count
+        )
+        SELECT coalesce(sentiment_label, ''), coalesce(dominant_emotion, ''),
+               count(*), coalesce(sum(sentiment_score), 0),
+               count(sentiment_score)
+        FROM new_rows
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+        ON CONFLICT (sentiment_label, dominant_emotion) DO UPDATE SET
+            result_count = a.result_count + EXCLUDED.result_count,
+            score_sum = a.score_sum + EXCLUDED.score_sum,
+            score_count = a.score_count + EXCLUDED.score_count;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        PERFORM 1 FROM analysis_result_agg
+        WHERE (sentiment_label, dominant_emotion) IN (
+            SELECT coalesce(sentiment_label, ''), coalesce(dominant_emotion, '')
+            FROM old_rows
+        )
+        ORDER BY sentiment_label, dominant_emotion
+        FOR UPDATE;
+        UPDATE analysis_result_agg AS a SET
+            result_count = a.result_count - o.result_count,
+            score_sum = a.score_sum - o.score_sum,
+            score_count = a.score_count - o.score_count
+        FROM (
+            SELECT coalesce(sentiment_label, '') AS sentiment_label,
+                   coalesce(dominant_emotion, '') AS dominant_emotion,
+                   count(*) AS result_count,
+                   coalesce(sum(sentiment_score), 0) AS score_sum,
+                   count(sentiment_score) AS score_count
+            FROM old_rows
+            GROUP BY 1, 2
+        ) AS o
+        WHERE a.sentiment_label = o.sentiment_label
+          AND a.dominant_emotion = o.dominant_emotion;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# Transition tables allow only one event per trigger
+AGG_TRIGGERS = (
+    ("analysis_result_agg_ins", "INSERT", "NEW TABLE AS new_rows"),
+    ("analysis_result_agg_upd", "UPDATE",
+     "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    ("analysis_result_agg_del", "DELETE", "OLD TABLE AS old_rows"),
+)
+
+
+def agg_trigger_ddl() -> list:
+    """Statements creating the rollup trigger function and triggers."""
+    return [AGG_TRIGGER_FUNCTION] + [
+        f"CREATE TRIGGER {name} AFTER {op} ON analysis_results "
+        f"REFERENCING {tables} FOR EACH STATEMENT "
+        f"EXECUTE FUNCTION analysis_result_agg_apply()"
+        for name, op, tables in AGG_TRIGGERS
+    ]
+
+
+for _statement in agg_trigger_ddl():
+    event.listen(
+        AnalysisResult.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql")
+    )
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Integer, Text, JSON, ForeignKey, Float
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, Float
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, JSONType
 
 
 class Author(BaseModel):
@@ -29,10 +29,10 @@ class Author(BaseModel):
     pagerank_score = Column(Float, nullable=True)
     
     # Additional data - RENAMED from 'metadata' to 'extra_data'
-    extra_data = Column(JSON, nullable=True)
+    extra_data = Column(JSONType, nullable=True)
     
     # Relationships
-    posts = relationship("Post", back_populates="author", lazy="dynamic")
+    posts = relationship("Post", back_populates="author")
     
     def __repr__(self):
         return f"<Author(id={self.id}, username='{self.username}', platform='{self.platform}')>"
@@ -1,21 +1,38 @@
-from datetime import datetime
-from sqlalchemy import Column, DateTime, Integer
+import enum
+from typing import Type
+from sqlalchemy import JSON, Column, DateTime, Integer, Enum, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declared_attr
 from app.database import Base
 
+# Binary JSONB on Postgres (GIN-indexable, @> containment); plain JSON on SQLite
+JSONType = JSONB().with_variant(JSON(), "sqlite")
+
+
+def str_enum(enum_cls: Type[enum.Enum], name: str) -> Enum:
+    """VARCHAR + CHECK constraint storing enum values, mapped to `enum_cls`."""
+    return Enum(
+        enum_cls,
+        name=name,
+        native_enum=False,
+        create_constraint=True,
+        length=32,
+        values_callable=lambda e: [member.value for member in e]
+    )
+
 
 class TimestampMixin:
     """Mixin that adds created_at and updated_at timestamps."""
     
     created_at = Column(
-        DateTime,
-        default=datetime.utcnow,
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False
     )
     updated_at = Column(
-        DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False
     )
 
@@ -24,12 +41,14 @@ class BaseModel(Base, TimestampMixin):
     """Base model class with id and timestamps."""
     
     __abstract__ = True
+    # Fetch server-generated timestamps via RETURNING instead of a lazy load
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     
-    @declared_attr
+    @declared_attr.directive
     def __tablename__(cls) -> str:
-        """Generate table name from class name."""
+        """Generate table name from class name (fallback; models set their own)."""
         # Convert CamelCase to snake_case
         name = cls.__name__
         return ''.join(
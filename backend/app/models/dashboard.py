@@ -1,9 +1,9 @@
 from sqlalchemy import (
-    Column, String, Integer, Text, JSON,
+    Column, String, Integer, Text,
     ForeignKey, Boolean
 )
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, JSONType
 
 
 class Dashboard(BaseModel):
@@ -16,16 +16,16 @@ class Dashboard(BaseModel):
     description = Column(Text, nullable=True)
     
     # Configuration
-    layout = Column(JSON, nullable=True)
+    layout = Column(JSONType, nullable=True)
     # Example: {"widgets": [...], "grid": {...}}
     
-    widgets = Column(JSON, nullable=True)
+    widgets = Column(JSONType, nullable=True)
     # Example: [
     #     {"type": "sentiment_chart", "position": {"x": 0, "y": 0}, "config": {...}},
     #     {"type": "trend_list", "position": {"x": 1, "y": 0}, "config": {...}}
     # ]
     
-    filters = Column(JSON, nullable=True)
+    filters = Column(JSONType, nullable=True)
     # Default filters for dashboard
     
     refresh_interval = Column(Integer, default=300)  # Seconds
@@ -1,6 +1,8 @@
-from sqlalchemy import Column, String, Boolean, Enum as SQLEnum, Text, JSON
+from sqlalchemy import (
+    Column, String, Boolean, Text, DateTime, Index
+)
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, JSONType, str_enum
 import enum
 
 
@@ -24,7 +26,7 @@ class DataSource(BaseModel):
     # Source identification
     name = Column(String(255), nullable=False)
     platform = Column(
-        SQLEnum(SourcePlatform),
+        str_enum(SourcePlatform, "ck_data_sources_platform"),
         default=SourcePlatform.CUSTOM,
         nullable=False,
         index=True
@@ -32,18 +34,26 @@ class DataSource(BaseModel):
     
     # Connection details
     api_endpoint = Column(String(500), nullable=True)
-    credentials = Column(JSON, nullable=True)  # Encrypted in production
+    credentials = Column(JSONType, nullable=True)  # Encrypted in production
     
     # Configuration
-    collection_config = Column(JSON, nullable=True)
+    collection_config = Column(JSONType, nullable=True)
     description = Column(Text, nullable=True)
     
     # Status
     is_active = Column(Boolean, default=True, nullable=False)
-    last_sync_at = Column(String(50), nullable=True)
+    last_sync_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
-    posts = relationship("Post", back_populates="data_source", lazy="dynamic")
+    posts = relationship("Post", back_populates="data_source")
     
     def __repr__(self):
         return f"<DataSource(id={self.id}, name='{self.name}', platform='{self.platform}')>"
+
+
+# Partial index for active sources
+Index(
+    "idx_datasource_active",
+    DataSource.id,
+    postgresql_where=(DataSource.is_active == True)
+)
@@ -1,9 +1,9 @@
 from sqlalchemy import (
-    Column, String, Integer, Text, JSON,
-    ForeignKey, Float
+    Column, String, Integer, Text,
+    ForeignKey, Float, DateTime, UniqueConstraint, Index
 )
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, JSONType
 
 
 class GraphNode(BaseModel):
@@ -18,7 +18,7 @@ class GraphNode(BaseModel):
     
     # Node attributes
     label = Column(String(255), nullable=True)
-    attributes = Column(JSON, nullable=True)
+    attributes = Column(JSONType, nullable=True)
     
     # Centrality metrics
     degree = Column(Integer, default=0)
@@ -36,14 +36,12 @@ class GraphNode(BaseModel):
     edges_from = relationship(
         "GraphEdge",
         foreign_keys="GraphEdge.source_id",
-        back_populates="source_node",
-        lazy="dynamic"
+        back_populates="source_node"
     )
     edges_to = relationship(
         "GraphEdge",
         foreign_keys="GraphEdge.target_id",
-        back_populates="target_node",
-        lazy="dynamic"
+        back_populates="target_node"
     )
     
     def __repr__(self):
@@ -54,6 +52,12 @@ class GraphEdge(BaseModel):
     """Graph edge for network analysis."""
     
     __tablename__ = "graph_edges"
+    __table_args__ = (
+        UniqueConstraint(
+            "source_id", "target_id", "edge_type",
+            name="uq_graph_edges_source_target_type"
+        ),
+    )
     
     # Edge identification
     edge_type = Column(String(50), index=True, nullable=False)
@@ -61,11 +65,11 @@ class GraphEdge(BaseModel):
     
     # Edge attributes
     weight = Column(Float, default=1.0)
-    attributes = Column(JSON, nullable=True)
+    attributes = Column(JSONType, nullable=True)
     
     # Timestamps
-    first_seen = Column(String(50), nullable=True)
-    last_seen = Column(String(50), nullable=True)
+    first_seen = Column(DateTime(timezone=True), nullable=True)
+    last_seen = Column(DateTime(timezone=True), index=True, nullable=True)
     occurrence_count = Column(Integer, default=1)
     
     # Foreign keys
@@ -86,3 +90,19 @@ class GraphEdge(BaseModel):
     
     def __repr__(self):
         return f"<GraphEdge(id={self.id}, type='{self.edge_type}', source={self.source_id}, target={self.target_id})>"
+
+
+# Partial indexes for the centrality leaderboards
+Index(
+    "idx_graphnode_pagerank",
+    GraphNode.pagerank.desc(),
+    postgresql_where=GraphNode.pagerank.isnot(None)
+)
+Index(
+    "idx_graphnode_betweenness",
+    GraphNode.betweenness_centrality.desc(),
+    postgresql_where=GraphNode.betweenness_centrality.isnot(None)
+)
+
+# Outgoing edges of a node by type
+Index("ix_edges_src_type", GraphEdge.source_id, GraphEdge.edge_type)
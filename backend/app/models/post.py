@@ -1,9 +1,9 @@
 from sqlalchemy import (
-    Column, String, Integer, Text, JSON, 
-    ForeignKey, DateTime, Float, Boolean
+    Column, String, Integer, Text,
+    ForeignKey, DateTime, Float, Boolean, Index
 )
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, JSONType
 
 
 class Post(BaseModel):
@@ -22,7 +22,7 @@ class Post(BaseModel):
     
     # URLs and media
     url = Column(String(500), nullable=True)
-    media_urls = Column(JSON, nullable=True)
+    media_urls = Column(JSONType, nullable=True)
     
     # Engagement metrics
     likes_count = Column(Integer, default=0)
@@ -31,9 +31,9 @@ class Post(BaseModel):
     views_count = Column(Integer, default=0)
     
     # Metadata
-    posted_at = Column(DateTime, index=True, nullable=True)
-    hashtags = Column(JSON, nullable=True)
-    mentions = Column(JSON, nullable=True)
+    posted_at = Column(DateTime(timezone=True), index=True, nullable=True)
+    hashtags = Column(JSONType, nullable=True)
+    mentions = Column(JSONType, nullable=True)
     
     # Processing status
     is_processed = Column(Boolean, default=False, index=True)
@@ -49,10 +49,28 @@ class Post(BaseModel):
     analysis_results = relationship(
         "AnalysisResult",
         back_populates="post",
-        lazy="dynamic",
         cascade="all, delete-orphan"
     )
     
     def __repr__(self):
         content_preview = self.content[:50] if self.content else "No content"
         return f"<Post(id={self.id}, platform='{self.platform}', content='{content_preview}...')>"
+
+
+# Partial index for the unprocessed-post queue
+Index(
+    "idx_post_unprocessed",
+    Post.created_at,
+    postgresql_where=(Post.is_processed == False)
+)
+
+# GIN index for hashtag @> containment filters
+Index(
+    "ix_posts_hashtags_gin",
+    Post.hashtags,
+    postgresql_using="gin",
+    postgresql_ops={"hashtags": "jsonb_path_ops"}
+)
+
+# Worker queue pulls filtered by processing state and platform
+Index("ix_posts_processed_platform", Post.is_processed, Post.platform)
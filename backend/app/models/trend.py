@@ -1,9 +1,9 @@
 from sqlalchemy import (
-    Column, String, Integer, Text, JSON,
-    ForeignKey, Float, DateTime
+    Column, String, Integer, Text,
+    ForeignKey, Float, DateTime, Index
 )
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, JSONType
 
 
 class Trend(BaseModel):
@@ -19,24 +19,24 @@ class Trend(BaseModel):
     volume = Column(Integer, default=0)  # Number of posts
     growth_rate = Column(Float, nullable=True)  # Percentage growth
     velocity = Column(Float, nullable=True)  # Speed of trend
-    peak_time = Column(DateTime, nullable=True)
+    peak_time = Column(DateTime(timezone=True), nullable=True)
     
     # Trend details
-    keywords = Column(JSON, nullable=True)  # Related keywords
-    hashtags = Column(JSON, nullable=True)  # Related hashtags
-    sentiment_distribution = Column(JSON, nullable=True)
+    keywords = Column(JSONType, nullable=True)  # Related keywords
+    hashtags = Column(JSONType, nullable=True)  # Related hashtags
+    sentiment_distribution = Column(JSONType, nullable=True)
     # Example: {"positive": 0.6, "negative": 0.2, "neutral": 0.2}
     
     # Time series data
-    time_series = Column(JSON, nullable=True)
+    time_series = Column(JSONType, nullable=True)
     # Example: [{"time": "2024-01-01T00:00:00", "count": 100}, ...]
     
     # Geographic distribution
-    geo_distribution = Column(JSON, nullable=True)
+    geo_distribution = Column(JSONType, nullable=True)
     
     # Related entities
-    top_authors = Column(JSON, nullable=True)
-    top_posts = Column(JSON, nullable=True)
+    top_authors = Column(JSONType, nullable=True)
+    top_posts = Column(JSONType, nullable=True)
     
     # Status
     is_active = Column(String(10), default="active")  # active, declining, ended
@@ -49,3 +49,26 @@ class Trend(BaseModel):
     
     def __repr__(self):
         return f"<Trend(id={self.id}, name='{self.name}', volume={self.volume})>"
+
+
+# Partial indexes for the active-trend leaderboards
+Index(
+    "idx_trend_active_volume",
+    Trend.volume.desc(),
+    postgresql_where=(Trend.is_active == "active")
+)
+Index(
+    "idx_trend_active_growth",
+    Trend.growth_rate.desc(),
+    postgresql_where=(
+        (Trend.is_active == "active") & Trend.growth_rate.isnot(None)
+    )
+)
+
+# GIN index for keyword @> containment filters
+Index(
+    "ix_trends_keywords_gin",
+    Trend.keywords,
+    postgresql_using="gin",
+    postgresql_ops={"keywords": "jsonb_path_ops"}
+)
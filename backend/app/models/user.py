@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, Index, func
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, str_enum
 import enum
 
 
@@ -28,14 +28,22 @@ class User(BaseModel):
     is_active = Column(Boolean, default=True, nullable=False)
     is_superuser = Column(Boolean, default=False, nullable=False)
     role = Column(
-        SQLEnum(UserRole),
+        str_enum(UserRole, "ck_users_role"),
         default=UserRole.VIEWER,
         nullable=False
     )
     
     # Relationships
-    analyses = relationship("Analysis", back_populates="user", lazy="dynamic")
-    dashboards = relationship("Dashboard", back_populates="user", lazy="dynamic")
+    analyses = relationship("Analysis", back_populates="user")
+    dashboards = relationship("Dashboard", back_populates="user")
     
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}', role='{self.role}')>"
+
+
+# Case-insensitive uniqueness, also the conflict target for user creation
+Index("users_email_lower_idx", func.lower(User.email), unique=True)
+Index("users_username_lower_idx", func.lower(User.username), unique=True)
+
+# Role filter with keyset pagination on id, served index-only
+Index("ix_users_role_id", User.role, User.id)
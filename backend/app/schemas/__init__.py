@@ -48,6 +48,7 @@ from app.schemas.post import (
     PostCreate,
     PostUpdate,
     PostResponse,
+    PostResponseEpoch,
     PostWithRelations,
     PostBrief,
     PostBulkCreate,
@@ -72,6 +73,7 @@ from app.schemas.analysis_result import (
     AnalysisResultBase,
     AnalysisResultCreate,
     AnalysisResultResponse,
+    AnalysisResultColumnar,
     AnalysisResultWithPost,
     AnalysisSummary,
     BulkResultCreate,
@@ -100,6 +102,7 @@ from app.schemas.graph import (
     GraphAnalysisRequest,
 )
 from app.schemas.dashboard import (
+    WidgetPosition,
     WidgetConfig,
     DashboardBase,
     DashboardCreate,
@@ -113,6 +116,7 @@ from app.schemas.brain import (
     TextAnalysisRequest,
     TextAnalysisResponse,
     BatchAnalysisRequest,
+    PostColumns,
     BatchAnalysisResponse,
     GraphAnalysisRequest as BrainGraphRequest,
     GraphAnalysisResponse as BrainGraphResponse,
@@ -162,6 +166,7 @@ __all__ = [
     "PostCreate",
     "PostUpdate",
     "PostResponse",
+    "PostResponseEpoch",
     "PostWithRelations",
     "PostBrief",
     "PostBulkCreate",
@@ -184,6 +189,7 @@ __all__ = [
     "AnalysisResultBase",
     "AnalysisResultCreate",
     "AnalysisResultResponse",
+    "AnalysisResultColumnar",
     "AnalysisResultWithPost",
     "AnalysisSummary",
     "BulkResultCreate",
@@ -209,6 +215,7 @@ __all__ = [
     "PageRankResult",
     "GraphAnalysisRequest",
     # Dashboard
+    "WidgetPosition",
     "WidgetConfig",
     "DashboardBase",
     "DashboardCreate",
@@ -221,9 +228,44 @@ __all__ = [
     "TextAnalysisRequest",
     "TextAnalysisResponse",
     "BatchAnalysisRequest",
+    "PostColumns",
     "BatchAnalysisResponse",
     "BrainGraphRequest",
     "BrainGraphResponse",
     "SummarizationRequest",
     "TrendDetectionRequest",
+    # Startup
+    "warmup",
 ]
+
+# Models returned at the API boundary, or built with model_construct() and
+# only ever serialized; everything else builds on first use
+_API_MODELS = (
+    MessageResponse,
+    UserResponse,
+    AuthResponse,
+    TokenResponse,
+    DataSourceResponse,
+    DataSourceStats,
+    AuthorResponse,
+    PostResponse,
+    PostWithRelations,
+    AnalysisResponse,
+    AnalysisWithUser,
+    AnalysisResultResponse,
+    TrendResponse,
+    TrendWithDetails,
+    GraphNodeResponse,
+    GraphEdgeResponse,
+    DashboardResponse,
+    TextAnalysisRequest,
+    BatchAnalysisRequest,
+    SummarizationRequest,
+    TrendDetectionRequest,
+)
+
+
+def warmup() -> None:
+    """Build the deferred validators of the API response models up front."""
+    for model in _API_MODELS:
+        model.model_rebuild()
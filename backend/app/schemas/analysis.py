@@ -1,10 +1,14 @@
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from pydantic import Field
 from app.schemas.base import BaseSchema, TimestampSchema
 from app.schemas.user import UserBrief
 from app.models.analysis import AnalysisType, AnalysisStatus
 
+# Immutable defaults are shared between instances instead of copied
+DEFAULT_EMOTION_CATEGORIES = ("joy", "sadness", "anger", "fear", "surprise")
+DEFAULT_ENTITY_TYPES = ("person", "location", "organization")
+
 
 class AnalysisBase(BaseSchema):
     """Base analysis schema."""
@@ -41,8 +45,8 @@ class AnalysisResponse(AnalysisBase, TimestampSchema):
     progress: float = 0.0
     summary: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
-    started_at: Optional[str] = None
-    completed_at: Optional[str] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
     user_id: int
 
 
@@ -71,7 +75,7 @@ class AnalysisConfig(BaseSchema):
     
     # Emotion analysis
     emotion_enabled: bool = True
-    emotion_categories: List[str] = ["joy", "sadness", "anger", "fear", "surprise"]
+    emotion_categories: Tuple[str, ...] = DEFAULT_EMOTION_CATEGORIES
     
     # Summarization
     summarization_enabled: bool = True
@@ -87,7 +91,7 @@ class AnalysisConfig(BaseSchema):
     
     # Entity recognition
     ner_enabled: bool = True
-    entity_types: List[str] = ["person", "location", "organization"]
+    entity_types: Tuple[str, ...] = DEFAULT_ENTITY_TYPES
     
     # Graph analysis
     graph_analysis_enabled: bool = True
@@ -1,13 +1,15 @@
-from typing import Optional, Dict, Any, List
-from pydantic import Field
-from app.schemas.base import BaseSchema, TimestampSchema
+from typing import Optional, Dict, Any, List, Literal
+from pydantic import Field, TypeAdapter
+from app.schemas.base import BaseSchema, Float32, TimestampSchema
 from app.schemas.post import PostBrief
 
+SentimentLabel = Literal["positive", "negative", "neutral"]
+
 
 class SentimentResult(BaseSchema):
     """Sentiment analysis result."""
     
-    label: str  # positive, negative, neutral
+    label: SentimentLabel
     score: float = Field(..., ge=-1.0, le=1.0)
     confidence: float = Field(..., ge=0.0, le=1.0)
 
@@ -74,10 +76,21 @@ class AnalysisResultResponse(AnalysisResultBase, TimestampSchema):
     topics: Optional[List[Dict[str, Any]]] = None
     entities: Optional[List[Dict[str, Any]]] = None
     node_degree: Optional[int] = None
-    centrality_score: Optional[float] = None
+    centrality_score: Optional[Float32] = None
     community_id: Optional[int] = None
 
 
+class AnalysisResultColumnar(BaseSchema):
+    """Numeric analysis result fields laid out one list per column."""
+    
+    ids: List[int]
+    post_ids: List[int]
+    sentiment_scores: List[Optional[float]]
+    node_degrees: List[Optional[int]]
+    centrality_scores: List[Optional[float]]
+    community_ids: List[Optional[int]]
+
+
 class AnalysisResultWithPost(AnalysisResultResponse):
     """Analysis result with post info."""
     
@@ -112,3 +125,7 @@ class BulkResultCreate(BaseSchema):
     """Bulk create analysis results."""
     
     results: List[AnalysisResultCreate]
+
+
+# List adapters built once at import and shared by all requests
+ANALYSIS_RESULT_LIST_ADAPTER = TypeAdapter(List[AnalysisResultResponse])
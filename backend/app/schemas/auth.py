@@ -1,5 +1,5 @@
 from typing import Optional
-from pydantic import EmailStr
+from pydantic import EmailStr, field_validator
 from app.schemas.base import BaseSchema
 from app.schemas.user import UserResponse
 
@@ -9,6 +9,11 @@ class LoginRequest(BaseSchema):
     
     username: str  # Can be username or email
     password: str
+    
+    @field_validator("username", mode="before")
+    @classmethod
+    def normalize_case(cls, v):
+        return v.lower() if isinstance(v, str) else v
 
 
 class TokenResponse(BaseSchema):
@@ -1,26 +1,26 @@
-from typing import Optional, Dict, Any
-from pydantic import Field
-from app.schemas.base import BaseSchema, TimestampSchema
+from typing import Optional, Dict, Any, List
+from pydantic import Field, TypeAdapter
+from app.schemas.base import BaseSchema, Float32, TimestampSchema
 
 
 class AuthorBase(BaseSchema):
-    """Base author schema."""
+    """Base author schema (fields shared by create and response)."""
     
     platform_id: str = Field(..., max_length=255)
     platform: str = Field(..., max_length=50)
     username: Optional[str] = Field(None, max_length=255)
     display_name: Optional[str] = Field(None, max_length=255)
-
-
-class AuthorCreate(AuthorBase):
-    """Schema for creating an author."""
-    
     bio: Optional[str] = None
     profile_url: Optional[str] = None
     avatar_url: Optional[str] = None
     followers_count: int = 0
     following_count: int = 0
     posts_count: int = 0
+
+
+class AuthorCreate(AuthorBase):
+    """Schema for creating an author."""
+    
     extra_data: Optional[Dict[str, Any]] = None
 
 
@@ -44,14 +44,8 @@ class AuthorResponse(AuthorBase, TimestampSchema):
     """Author response schema."""
     
     id: int
-    bio: Optional[str] = None
-    profile_url: Optional[str] = None
-    avatar_url: Optional[str] = None
-    followers_count: int = 0
-    following_count: int = 0
-    posts_count: int = 0
-    influence_score: Optional[float] = None
-    pagerank_score: Optional[float] = None
+    influence_score: Optional[Float32] = None
+    pagerank_score: Optional[Float32] = None
 
 
 class AuthorBrief(BaseSchema):
@@ -70,3 +64,7 @@ class AuthorWithMetrics(AuthorResponse):
     average_sentiment: Optional[float] = None
     top_topics: Optional[list] = None
     engagement_rate: Optional[float] = None
+
+
+# List adapters built once at import and shared by all requests
+AUTHOR_LIST_ADAPTER = TypeAdapter(List[AuthorResponse])
@@ -1,22 +1,79 @@
 from datetime import datetime
-from typing import Optional, Generic, TypeVar, List
-from pydantic import BaseModel, ConfigDict
+from functools import lru_cache
+from typing import (
+    Annotated, Any, Dict, Generic, List, Mapping, Optional, Type, TypeVar,
+    get_args, get_origin
+)
+from pydantic import BaseModel, ConfigDict, PlainSerializer
 
 # Generic type for pagination
 T = TypeVar("T")
 
+_MISSING = object()
+
+
+def _float32_digits(value: float) -> float:
+    """Round to the 7 significant digits a float32 can hold."""
+    return float(f"{value:.7g}")
+
+
+# Graph scores need ~float32 precision; emit fewer digits on the wire
+Float32 = Annotated[
+    float, PlainSerializer(_float32_digits, return_type=float, when_used="json")
+]
+
 
 class BaseSchema(BaseModel):
     """Base schema with common configuration."""
     
     model_config = ConfigDict(
         from_attributes=True,
-        populate_by_name=True,
         use_enum_values=True,
-        json_encoders={
-            datetime: lambda v: v.isoformat() if v else None
-        }
+        # Build validators on first use; app startup warms the API models
+        defer_build=True
     )
+    
+    @classmethod
+    def from_orm_trusted(cls, obj: Any):
+        """
+        Build from a database row (ORM object or mapping) without validation.
+        
+        Only for rows read back from our own database, whose values already
+        satisfy the column types; request payloads must use model_validate.
+        """
+        nested = _nested_schemas(cls)
+        values = {}
+        for name in cls.model_fields:
+            if isinstance(obj, Mapping):
+                value = obj.get(name, _MISSING)
+            else:
+                value = getattr(obj, name, _MISSING)
+            if value is _MISSING:
+                continue  # model_construct fills the default
+            schema = nested.get(name)
+            if schema is not None and value is not None:
+                if isinstance(value, (list, tuple)):
+                    value = [schema.from_orm_trusted(v) for v in value]
+                else:
+                    value = schema.from_orm_trusted(value)
+            values[name] = value
+        return cls.model_construct(**values)
+
+
+@lru_cache(maxsize=None)
+def _nested_schemas(cls: Type[BaseSchema]) -> Dict[str, Type[BaseSchema]]:
+    """Map field names to the BaseSchema they hold (directly, Optional or List)."""
+    nested = {}
+    for name, field in cls.model_fields.items():
+        stack = [field.annotation]
+        while stack:
+            tp = stack.pop()
+            if isinstance(tp, type) and issubclass(tp, BaseSchema):
+                nested[name] = tp
+                break
+            if get_origin(tp) is not None:
+                stack.extend(get_args(tp))
+    return nested
 
 
 class TimestampSchema(BaseSchema):
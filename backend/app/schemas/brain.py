@@ -1,7 +1,11 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from pydantic import Field
 from app.schemas.base import BaseSchema
 
+# Immutable defaults are shared between instances instead of copied
+DEFAULT_TEXT_ANALYSIS_TYPES = ("sentiment", "emotion", "keywords")
+DEFAULT_GRAPH_ALGORITHMS = ("pagerank", "community_detection")
+
 
 class BrainHealthResponse(BaseSchema):
     """BRAIN service health response."""
@@ -17,7 +21,7 @@ class TextAnalysisRequest(BaseSchema):
     
     texts: List[str]
     text_ids: List[str]
-    analysis_types: List[str] = ["sentiment", "emotion", "keywords"]
+    analysis_types: Tuple[str, ...] = DEFAULT_TEXT_ANALYSIS_TYPES
     language: str = "fa"
     config: Optional[Dict[str, Any]] = None
 
@@ -34,11 +38,21 @@ class TextAnalysisResponse(BaseSchema):
     topics: Optional[List[Dict[str, Any]]] = None
 
 
+class PostColumns(BaseSchema):
+    """Posts as parallel columns sharing one index (no per-post objects)."""
+    
+    ids: List[int]
+    contents: List[Optional[str]]
+    platforms: List[str]
+    posted_at_ts: List[Optional[int]]  # Epoch seconds
+
+
 class BatchAnalysisRequest(BaseSchema):
-    """Batch analysis request to BRAIN."""
+    """Batch analysis request to BRAIN (row-wise `posts` or `post_columns`)."""
     
     analysis_id: int
-    posts: List[Dict[str, Any]]
+    posts: List[Dict[str, Any]] = Field(default_factory=list)
+    post_columns: Optional[PostColumns] = None
     config: Dict[str, Any]
     callback_url: Optional[str] = None
 
@@ -58,7 +72,7 @@ class GraphAnalysisRequest(BaseSchema):
     analysis_id: int
     nodes: List[Dict[str, Any]]
     edges: List[Dict[str, Any]]
-    algorithms: List[str] = ["pagerank", "community_detection"]
+    algorithms: Tuple[str, ...] = DEFAULT_GRAPH_ALGORITHMS
     config: Optional[Dict[str, Any]] = None
 
 
@@ -1,15 +1,38 @@
-from typing import Optional, Dict, Any, List
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Literal
 from pydantic import Field
 from app.schemas.base import BaseSchema, TimestampSchema
 
+# The widget types DashboardService.get_widget_data can serve
+WidgetType = Literal[
+    "overview",
+    "sentiment_chart",
+    "emotion_chart",
+    "trending_hashtags",
+    "trending_keywords",
+    "volume_chart",
+    "platform_stats",
+    "top_authors",
+    "recent_analyses",
+]
+
+
+class WidgetPosition(BaseSchema):
+    """Widget placement on the dashboard grid."""
+    
+    x: int
+    y: int
+    w: int = 1
+    h: int = 1
+
 
 class WidgetConfig(BaseSchema):
     """Dashboard widget configuration."""
     
     widget_id: str
-    widget_type: str  # chart, table, metric, map, wordcloud
+    widget_type: WidgetType
     title: str
-    position: Dict[str, int]  # {"x": 0, "y": 0, "w": 2, "h": 2}
+    position: WidgetPosition
     config: Optional[Dict[str, Any]] = None
     data_source: Optional[str] = None  # API endpoint or query
 
@@ -72,4 +95,4 @@ class WidgetData(BaseSchema):
     
     widget_id: str
     data: Any
-    updated_at: str
+    updated_at: datetime
@@ -40,7 +40,7 @@ class DataSourceResponse(DataSourceBase, TimestampSchema):
     api_endpoint: Optional[str] = None
     collection_config: Optional[Dict[str, Any]] = None
     is_active: bool
-    last_sync_at: Optional[str] = None
+    last_sync_at: Optional[datetime] = None
 
 
 class DataSourceBrief(BaseSchema):
@@ -60,4 +60,4 @@ class DataSourceStats(BaseSchema):
     platform: SourcePlatform
     total_posts: int = 0
     total_authors: int = 0
-    last_sync_at: Optional[str] = None
+    last_sync_at: Optional[datetime] = None
@@ -1,6 +1,9 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from pydantic import Field
-from app.schemas.base import BaseSchema, TimestampSchema
+from app.schemas.base import BaseSchema, Float32, TimestampSchema
+
+# Immutable default shared between instances instead of copied
+DEFAULT_GRAPH_ALGORITHMS = ("pagerank", "community_detection", "centrality")
 
 
 class GraphNodeBase(BaseSchema):
@@ -43,10 +46,10 @@ class GraphNodeResponse(GraphNodeBase, TimestampSchema):
     degree: int = 0
     in_degree: int = 0
     out_degree: int = 0
-    pagerank: Optional[float] = None
-    betweenness_centrality: Optional[float] = None
-    closeness_centrality: Optional[float] = None
-    eigenvector_centrality: Optional[float] = None
+    pagerank: Optional[Float32] = None
+    betweenness_centrality: Optional[Float32] = None
+    closeness_centrality: Optional[Float32] = None
+    eigenvector_centrality: Optional[Float32] = None
     community_id: Optional[int] = None
 
 
@@ -108,7 +111,7 @@ class PageRankResult(BaseSchema):
     
     node_id: str
     label: Optional[str] = None
-    pagerank_score: float
+    pagerank_score: Float32
     node_type: str
 
 
@@ -117,4 +120,4 @@ class GraphAnalysisRequest(BaseSchema):
     
     nodes: List[Dict[str, Any]]
     edges: List[Dict[str, Any]]
-    algorithms: List[str] = ["pagerank", "community_detection", "centrality"]
+    algorithms: Tuple[str, ...] = DEFAULT_GRAPH_ALGORITHMS
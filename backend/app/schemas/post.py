@@ -1,23 +1,18 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
-from pydantic import Field
+from pydantic import Field, TypeAdapter
 from app.schemas.base import BaseSchema, TimestampSchema
 from app.schemas.author import AuthorBrief
 from app.schemas.data_source import DataSourceBrief
 
 
 class PostBase(BaseSchema):
-    """Base post schema."""
+    """Base post schema (fields shared by create and response)."""
     
     platform_id: str = Field(..., max_length=255)
     platform: str = Field(..., max_length=50)
     content: Optional[str] = None
     language: str = Field(default="fa", max_length=10)
-
-
-class PostCreate(PostBase):
-    """Schema for creating a post."""
-    
     url: Optional[str] = None
     media_urls: Optional[List[str]] = None
     likes_count: int = 0
@@ -31,6 +26,10 @@ class PostCreate(PostBase):
     author_id: Optional[int] = None
 
 
+class PostCreate(PostBase):
+    """Schema for creating a post."""
+
+
 class PostUpdate(BaseSchema):
     """Schema for updating a post."""
     
@@ -52,18 +51,29 @@ class PostResponse(PostBase, TimestampSchema):
     """Post response schema."""
     
     id: int
-    url: Optional[str] = None
-    media_urls: Optional[List[str]] = None
-    likes_count: int = 0
-    comments_count: int = 0
-    shares_count: int = 0
-    views_count: int = 0
-    posted_at: Optional[datetime] = None
-    hashtags: Optional[List[str]] = None
-    mentions: Optional[List[str]] = None
     is_processed: bool = False
-    data_source_id: Optional[int] = None
-    author_id: Optional[int] = None
+
+
+_EPOCH_FIELDS = ("posted_at", "created_at", "updated_at")
+
+
+class PostResponseEpoch(PostResponse):
+    """Post response with timestamps as epoch seconds (ts_mode=epoch)."""
+    
+    posted_at: Optional[int] = None
+    created_at: Optional[int] = None
+    updated_at: Optional[int] = None
+    
+    @staticmethod
+    def to_epoch(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Rewrite a post row's datetime columns to epoch seconds in place."""
+        for name in _EPOCH_FIELDS:
+            value = row.get(name)
+            if value is not None:
+                if value.tzinfo is None:
+                    value = value.replace(tzinfo=timezone.utc)
+                row[name] = int(value.timestamp())
+        return row
 
 
 class PostWithRelations(PostResponse):
@@ -73,6 +83,19 @@ class PostWithRelations(PostResponse):
     data_source: Optional[DataSourceBrief] = None
 
 
+_PREVIEW_LEN = 100
+_PREVIEW_SUFFIX = "..."
+
+
+def _make_preview(
+    content: str,
+    _n: int = _PREVIEW_LEN,
+    _s: str = _PREVIEW_SUFFIX
+) -> str:
+    """Truncate content for previews (constants bound as fast locals)."""
+    return content[:_n] + _s if len(content) > _n else content
+
+
 class PostBrief(BaseSchema):
     """Brief post info for embedding."""
     
@@ -83,15 +106,19 @@ class PostBrief(BaseSchema):
     
     @classmethod
     def from_post(cls, post) -> "PostBrief":
-        content_preview = None
-        if post.content:
-            content_preview = post.content[:100] + "..." if len(post.content) > 100 else post.content
-        return cls(
+        """Build from a trusted Post row without validation."""
+        content = post.content
+        return cls.model_construct(
             id=post.id,
             platform=post.platform,
-            content_preview=content_preview,
+            content_preview=_make_preview(content) if content else None,
             posted_at=post.posted_at
         )
+    
+    @classmethod
+    def from_orm_trusted(cls, obj) -> "PostBrief":
+        """Nested trusted builds go through from_post to fill the preview."""
+        return cls.from_post(obj)
 
 
 class PostBulkCreate(BaseSchema):
@@ -112,3 +139,7 @@ class PostFilter(BaseSchema):
     date_to: Optional[datetime] = None
     search: Optional[str] = None
     hashtags: Optional[List[str]] = None
+
+
+# List adapters built once at import and shared by all requests
+POST_LIST_ADAPTER = TypeAdapter(List[PostResponse])
@@ -1,8 +1,10 @@
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal
 from pydantic import Field
 from app.schemas.base import BaseSchema, TimestampSchema
 
+TrendStatus = Literal["active", "declining", "ended"]
+
 
 class TrendBase(BaseSchema):
     """Base trend schema."""
@@ -35,7 +37,7 @@ class TrendUpdate(BaseSchema):
     description: Optional[str] = None
     volume: Optional[int] = None
     growth_rate: Optional[float] = None
-    is_active: Optional[str] = None
+    is_active: Optional[TrendStatus] = None
 
 
 class TrendResponse(TrendBase, TimestampSchema):
@@ -49,7 +51,7 @@ class TrendResponse(TrendBase, TimestampSchema):
     keywords: Optional[List[str]] = None
     hashtags: Optional[List[str]] = None
     sentiment_distribution: Optional[Dict[str, float]] = None
-    is_active: str = "active"
+    is_active: TrendStatus = "active"
     analysis_id: Optional[int] = None
 
 
@@ -69,7 +71,7 @@ class TrendBrief(BaseSchema):
     name: str
     volume: int
     growth_rate: Optional[float] = None
-    is_active: str
+    is_active: TrendStatus
 
 
 class TrendingItem(BaseSchema):
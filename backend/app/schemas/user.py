@@ -5,6 +5,13 @@ from app.schemas.base import BaseSchema, TimestampSchema
 from app.models.user import UserRole
 import re
 
+# Built once; validators run on every signup/update request.
+# Deleting every allowed character leaves "" only for a valid username.
+_USERNAME_ALLOWED = str.maketrans(
+    "", "", "abcdefghijklmnopqrstuvwxyz0123456789_-"
+)
+_DIGIT_RE = re.compile(r"\d")
+
 
 class UserBase(BaseSchema):
     """Base user schema."""
@@ -13,14 +20,19 @@ class UserBase(BaseSchema):
     username: str = Field(..., min_length=3, max_length=100)
     full_name: Optional[str] = Field(None, max_length=255)
     
+    @field_validator("email", "username", mode="before")
+    @classmethod
+    def normalize_case(cls, v):
+        return v.lower() if isinstance(v, str) else v
+    
     @field_validator("username")
     @classmethod
     def validate_username(cls, v: str) -> str:
-        if not re.match(r"^[a-zA-Z0-9_-]+$", v):
+        if not v or v.translate(_USERNAME_ALLOWED):
             raise ValueError(
                 "Username can only contain letters, numbers, underscores, and hyphens"
             )
-        return v.lower()
+        return v
 
 
 class UserCreate(UserBase):
@@ -31,11 +43,12 @@ class UserCreate(UserBase):
     @field_validator("password")
     @classmethod
     def validate_password(cls, v: str) -> str:
-        if not any(c.isupper() for c in v):
+        # Case round-trips and a compiled search scan in C, not per character
+        if v.lower() == v:
             raise ValueError("Password must contain at least one uppercase letter")
-        if not any(c.islower() for c in v):
+        if v.upper() == v:
             raise ValueError("Password must contain at least one lowercase letter")
-        if not any(c.isdigit() for c in v):
+        if not _DIGIT_RE.search(v):
             raise ValueError("Password must contain at least one digit")
         return v
 
@@ -48,6 +61,11 @@ class UserUpdate(BaseSchema):
     full_name: Optional[str] = Field(None, max_length=255)
     is_active: Optional[bool] = None
     role: Optional[UserRole] = None
+    
+    @field_validator("email", "username", mode="before")
+    @classmethod
+    def normalize_case(cls, v):
+        return v.lower() if isinstance(v, str) else v
 
 
 class UserUpdatePassword(BaseSchema):
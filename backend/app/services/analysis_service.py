@@ -1,4 +1,6 @@
-from typing import Optional, List, Dict, Any
+import asyncio
+import time
+from typing import AsyncIterator, Optional, List, Dict, Any
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,16 +12,34 @@ from app.crud import analysis_result as result_crud
 from app.crud import post as post_crud
 from app.crud import trend as trend_crud
 from app.models.analysis import AnalysisStatus, AnalysisType
+from app.models.post import Post
 from app.schemas.analysis import AnalysisCreate, AnalysisConfig
 from app.schemas.analysis_result import AnalysisResultCreate
+from app.schemas.brain import PostColumns
+from app.schemas.post import PostFilter
 from app.schemas.trend import TrendCreate
 
+# Posts are read and sent to BRAIN in batches of this size
+ANALYSIS_BATCH_SIZE = 256
+_ANALYSIS_POST_COLUMNS = (Post.id, Post.content, Post.platform, Post.posted_at)
+
+_NO_SENTIMENT: Dict[str, Any] = {}
+
+# Shared read-only filter for analyses without query filters
+_NO_POST_FILTER = PostFilter()
+
+# Live summaries are cached this long; past SUMMARY_FRESH_SECONDS a cached
+# one is still served but recomputed in the background
+SUMMARY_CACHE_TTL = 300
+SUMMARY_FRESH_SECONDS = 30
+
 
 class AnalysisService(BaseService):
     """Service for managing analysis jobs."""
     
     def __init__(self):
         super().__init__("AnalysisService")
+        self._summary_refreshes: Dict[int, asyncio.Task] = {}
     
     async def create_analysis(
         self,
@@ -34,7 +54,7 @@ class AnalysisService(BaseService):
             obj_in=analysis_in,
             user_id=user_id
         )
-        self.log_info(f"Created analysis {analysis.id} for user {user_id}")
+        self.log_info("Created analysis {} for user {}", analysis.id, user_id)
         return analysis
     
     async def start_analysis(
@@ -46,11 +66,11 @@ class AnalysisService(BaseService):
         """Start an analysis job."""
         analysis = await analysis_crud.get(db, analysis_id)
         if not analysis:
-            self.log_error(f"Analysis {analysis_id} not found")
+            self.log_error("Analysis {} not found", analysis_id)
             return False
         
         if analysis.status != AnalysisStatus.PENDING:
-            self.log_warning(f"Analysis {analysis_id} is not pending")
+            self.log_warning("Analysis {} is not pending", analysis_id)
             return False
         
         # Update status to processing
@@ -68,7 +88,7 @@ class AnalysisService(BaseService):
             status="processing"
         )
         
-        self.log_info(f"Started analysis {analysis_id}")
+        self.log_info("Started analysis {}", analysis_id)
         return True
     
     async def process_analysis(
@@ -83,55 +103,64 @@ class AnalysisService(BaseService):
         if not analysis:
             return False
         
-        # Get posts based on filters
-        filters = analysis.query_filters or {}
-        posts = await self._get_posts_for_analysis(db, filters, analysis.post_count)
-        
-        if not posts:
-            await analysis_crud.update_status(
-                db,
-                analysis_id=analysis_id,
-                status=AnalysisStatus.FAILED,
-                error_message="No posts found matching filters"
-            )
-            return False
-        
-        # Prepare posts data
-        posts_data = [
-            {
-                "id": p.id,
-                "content": p.content,
-                "platform": p.platform,
-                "posted_at": p.posted_at.isoformat() if p.posted_at else None
-            }
-            for p in posts
-        ]
-        
         # Get config
         if config is None:
             config = AnalysisConfig()
+        config_data = config.model_dump()
         
         try:
             # Check BRAIN availability
             if not await brain_service.is_available():
                 raise BrainServiceError("BRAIN service unavailable")
             
-            # Submit batch analysis
-            batch_response = await brain_service.submit_batch_analysis(
-                analysis_id=analysis_id,
-                posts=posts_data,
-                config=config.model_dump()
-            )
+            # Stream posts in batches; each batch is submitted while the
+            # next one is read, so at most two batches are held in memory
+            submitted = 0
+            pending: Optional[asyncio.Task] = None
+            try:
+                async for batch in self._iter_posts_for_analysis(
+                    db, analysis.query_filters or {}, analysis.post_count
+                ):
+                    # Rows are (id, content, platform, posted_at); send columns
+                    ids, contents, platforms, posted = zip(*batch)
+                    columns = PostColumns.model_construct(
+                        ids=list(ids),
+                        contents=list(contents),
+                        platforms=list(platforms),
+                        posted_at_ts=[
+                            int(t.timestamp()) if t else None for t in posted
+                        ]
+                    )
+                    if pending is not None:
+                        await self._log_submitted(analysis_id, pending)
+                    pending = asyncio.create_task(
+                        brain_service.submit_batch_analysis(
+                            analysis_id=analysis_id,
+                            post_columns=columns,
+                            config=config_data
+                        )
+                    )
+                    submitted += len(ids)
+            except BaseException:
+                if pending is not None:
+                    pending.cancel()
+                raise
             
-            self.log_info(
-                f"Submitted analysis {analysis_id} to BRAIN, "
-                f"task_id: {batch_response.task_id}"
-            )
+            if pending is None:
+                await analysis_crud.update_status(
+                    db,
+                    analysis_id=analysis_id,
+                    status=AnalysisStatus.FAILED,
+                    error_message="No posts found matching filters"
+                )
+                return False
+            await self._log_submitted(analysis_id, pending)
             
+            self.log_info("Submitted {} posts of analysis {}", submitted, analysis_id)
             return True
             
         except BrainServiceError as e:
-            self.log_error(f"BRAIN service error: {e.message}")
+            self.log_error("BRAIN service error: {}", e.message)
             await analysis_crud.update_status(
                 db,
                 analysis_id=analysis_id,
@@ -140,25 +169,33 @@ class AnalysisService(BaseService):
             )
             return False
     
-    async def _get_posts_for_analysis(
+    async def _log_submitted(self, analysis_id: int, task: asyncio.Task):
+        """Wait for a batch submission and log its BRAIN task id."""
+        batch_response = await task
+        self.log_info(
+            "Submitted analysis {} to BRAIN, task_id: {}",
+            analysis_id,
+            batch_response.task_id
+        )
+    
+    def _iter_posts_for_analysis(
         self,
         db: AsyncSession,
         filters: Dict[str, Any],
         limit: Optional[int] = None
-    ) -> List:
-        """Get posts for analysis based on filters."""
-        from app.schemas.post import PostFilter
-        
-        post_filter = PostFilter(**filters) if filters else PostFilter()
+    ) -> AsyncIterator[List]:
+        """Stream posts for analysis based on filters, in batches."""
+        post_filter = (
+            PostFilter.model_validate(filters) if filters else _NO_POST_FILTER
+        )
         
-        posts = await post_crud.get_filtered(
+        return post_crud.stream_filtered_batches(
             db,
             filters=post_filter,
-            skip=0,
-            limit=limit or 1000
+            columns=_ANALYSIS_POST_COLUMNS,
+            limit=limit or 1000,
+            batch_size=ANALYSIS_BATCH_SIZE
         )
-        
-        return posts
     
     async def process_analysis_results(
         self,
@@ -168,38 +205,40 @@ class AnalysisService(BaseService):
         results: List[Dict[str, Any]]
     ) -> int:
         """Process and store analysis results from BRAIN."""
-        stored_count = 0
+        results_in = []
+        append = results_in.append
         
+        # BRAIN output is untrusted, so each row is still validated
         for result_data in results:
+            get = result_data.get
+            sentiment = get("sentiment") or _NO_SENTIMENT
             try:
-                result_in = AnalysisResultCreate(
-                    post_id=result_data.get("post_id") or result_data.get("text_id"),
+                append(AnalysisResultCreate(
+                    post_id=get("post_id") or get("text_id"),
                     analysis_id=analysis_id,
-                    sentiment_label=result_data.get("sentiment", {}).get("label"),
-                    sentiment_score=result_data.get("sentiment", {}).get("score"),
-                    sentiment_confidence=result_data.get("sentiment", {}).get("confidence"),
-                    emotions=result_data.get("emotions"),
-                    dominant_emotion=result_data.get("dominant_emotion"),
-                    summary=result_data.get("summary"),
-                    keywords=result_data.get("keywords"),
-                    topics=result_data.get("topics"),
-                    entities=result_data.get("entities"),
+                    sentiment_label=sentiment.get("label"),
+                    sentiment_score=sentiment.get("score"),
+                    sentiment_confidence=sentiment.get("confidence"),
+                    emotions=get("emotions"),
+                    dominant_emotion=get("dominant_emotion"),
+                    summary=get("summary"),
+                    keywords=get("keywords"),
+                    topics=get("topics"),
+                    entities=get("entities"),
                     raw_results=result_data
-                )
-                
-                await result_crud.create(db, obj_in=result_in)
-                stored_count += 1
-                
-                # Mark post as processed
-                await post_crud.mark_processed(
-                    db,
-                    post_id=result_in.post_id
-                )
-                
+                ))
             except Exception as e:
-                self.log_error(f"Error storing result: {e}")
+                self.log_error("Skipping invalid result: {}", e)
                 continue
         
+        # One INSERT for the results and one UPDATE for their posts
+        stored = await result_crud.bulk_create(db, results_in=results_in)
+        stored_count = len(stored)
+        await post_crud.mark_many_processed(
+            db,
+            post_ids=list({r.post_id for r in results_in})
+        )
+        
         # Update progress
         progress = (stored_count / len(results)) * 100 if results else 100
         await redis_service.set_analysis_progress(
@@ -236,20 +275,58 @@ class AnalysisService(BaseService):
             summary=summary
         )
         
-        # Update Redis
-        await redis_service.set_analysis_progress(
-            analysis_id,
-            progress=100.0,
-            status="completed"
-        )
+        # Final progress and cached summary in one Redis round-trip
+        await redis_service.cache_analysis_completion(analysis_id, summary)
         
-        # Cache summary
-        await redis_service.cache_analysis_result(
+        self.log_info("Completed analysis {}", analysis_id)
+    
+    async def get_summary(
+        self,
+        db: AsyncSession,
+        *,
+        analysis_id: int
+    ) -> Dict[str, Any]:
+        """Summary of an analysis, served from Redis with stale-while-revalidate."""
+        if not redis_service.is_connected:
+            return await self.generate_summary(db, analysis_id=analysis_id)
+        
+        entry = await redis_service.get_cached_analysis_summary(analysis_id)
+        if entry is None:
+            return await self._store_summary(db, analysis_id)
+        
+        if (
+            time.time() - entry["cached_at"] > SUMMARY_FRESH_SECONDS
+            and analysis_id not in self._summary_refreshes
+        ):
+            task = asyncio.create_task(self._refresh_summary(db, analysis_id))
+            self._summary_refreshes[analysis_id] = task
+            task.add_done_callback(
+                lambda _: self._summary_refreshes.pop(analysis_id, None)
+            )
+        return entry["summary"]
+    
+    async def _store_summary(
+        self,
+        db: AsyncSession,
+        analysis_id: int
+    ) -> Dict[str, Any]:
+        """Compute a summary and cache it with its timestamp."""
+        summary = await self.generate_summary(db, analysis_id=analysis_id)
+        await redis_service.cache_analysis_summary(
             analysis_id,
-            summary
+            {"summary": summary, "cached_at": time.time()},
+            expire=SUMMARY_CACHE_TTL
         )
-        
-        self.log_info(f"Completed analysis {analysis_id}")
+        return summary
+    
+    async def _refresh_summary(self, db: AsyncSession, analysis_id: int) -> None:
+        """Recompute a cached summary on a session of its own."""
+        # The request session may be closed before this runs
+        try:
+            async with AsyncSession(db.bind) as session:
+                await self._store_summary(session, analysis_id)
+        except Exception as e:
+            self.log_error("Summary refresh failed for {}: {}", analysis_id, e)
     
     async def generate_summary(
         self,
@@ -258,34 +335,18 @@ class AnalysisService(BaseService):
         analysis_id: int
     ) -> Dict[str, Any]:
         """Generate summary for completed analysis."""
-        # Get counts
-        total_results = await result_crud.count_by_analysis(db, analysis_id=analysis_id)
-        
-        # Get distributions
-        sentiment_dist = await result_crud.get_sentiment_distribution(
-            db, analysis_id=analysis_id
-        )
-        emotion_dist = await result_crud.get_emotion_distribution(
-            db, analysis_id=analysis_id
-        )
-        
-        # Get average sentiment
-        avg_sentiment = await result_crud.get_average_sentiment(
-            db, analysis_id=analysis_id
-        )
-        
-        # Get top keywords
-        top_keywords = await result_crud.aggregate_keywords(
-            db, analysis_id=analysis_id, limit=20
+        # Every aggregate comes from one scan of the analysis' results
+        bundle = await result_crud.get_summary_bundle(
+            db, analysis_id=analysis_id, keyword_limit=20
         )
         
         summary = {
-            "total_posts": total_results,
-            "processed_posts": total_results,
-            "sentiment_distribution": sentiment_dist,
-            "emotion_distribution": emotion_dist,
-            "average_sentiment_score": avg_sentiment,
-            "top_keywords": top_keywords,
+            "total_posts": bundle["total"],
+            "processed_posts": bundle["total"],
+            "sentiment_distribution": bundle["sentiment_distribution"],
+            "emotion_distribution": bundle["emotion_distribution"],
+            "average_sentiment_score": bundle["average_sentiment"],
+            "top_keywords": bundle["top_keywords"],
             "generated_at": datetime.utcnow().isoformat()
         }
         
@@ -312,7 +373,7 @@ class AnalysisService(BaseService):
             status="failed"
         )
         
-        self.log_error(f"Analysis {analysis_id} failed: {error_message}")
+        self.log_error("Analysis {} failed: {}", analysis_id, error_message)
     
     async def get_progress(
         self,
@@ -347,7 +408,7 @@ class AnalysisService(BaseService):
             status="cancelled"
         )
         
-        self.log_info(f"Cancelled analysis {analysis_id}")
+        self.log_info("Cancelled analysis {}", analysis_id)
         return True
 
 
@@ -1,14 +1,16 @@
+import time
+from hashlib import blake2b
 from typing import Optional, Tuple
 from datetime import timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.base import BaseService
+from app.services.redis_service import redis_service
 from app.crud import user as user_crud
 from app.core.security import (
-    create_access_token,
-    create_refresh_token,
+    create_token_pair_async,
     decode_token,
-    verify_password
+    verify_password_async
 )
 from app.core.config import settings
 from app.models.user import User
@@ -16,6 +18,16 @@ from app.schemas.user import UserCreate
 from app.schemas.auth import TokenResponse
 
 
+# Token snapshots are also dropped after user updates commit; the TTL bounds
+# how long a missed invalidation can serve a stale user
+TOKEN_USER_CACHE_TTL = 300
+
+
+def _token_key(token: str) -> str:
+    digest = blake2b(token.encode(), digest_size=16).hexdigest()
+    return f"auth:tok:{digest}"
+
+
 class AuthService(BaseService):
     """Service for authentication operations."""
     
@@ -37,9 +49,9 @@ class AuthService(BaseService):
         )
         
         if user:
-            self.log_info(f"User {user.username} authenticated successfully")
+            self.log_info("User {} authenticated successfully", user.username)
         else:
-            self.log_warning(f"Failed authentication attempt for {identifier}")
+            self.log_warning("Failed authentication attempt for {}", identifier)
         
         return user
     
@@ -48,8 +60,7 @@ class AuthService(BaseService):
         user: User
     ) -> TokenResponse:
         """Create access and refresh tokens for user."""
-        access_token = create_access_token(subject=str(user.id))
-        refresh_token = create_refresh_token(subject=str(user.id))
+        access_token, refresh_token = await create_token_pair_async(str(user.id))
         
         return TokenResponse(
             access_token=access_token,
@@ -81,18 +92,31 @@ class AuthService(BaseService):
         
         user = await user_crud.get(db, int(user_id))
         if not user or not user.is_active:
-            self.log_warning(f"User {user_id} not found or inactive")
+            self.log_warning("User {} not found or inactive", user_id)
             return None
         
         return await self.create_tokens(user)
     
-    async def validate_token(
+    async def get_token_user(
         self,
         db: AsyncSession,
         *,
         token: str
     ) -> Optional[User]:
-        """Validate access token and return user."""
+        """
+        Return the user of a valid access token, active or not.
+        
+        The user's non-secret columns are cached in Redis for a few minutes
+        (never past the token's expiry), so repeat requests skip both JWT
+        verification and the user SELECT. User updates drop the snapshot
+        after commit via `user_crud.invalidate_cache`.
+        """
+        key = _token_key(token)
+        if redis_service.is_connected:
+            data = await redis_service.get_json(key)
+            if data:
+                return await user_crud.load_cached(db, data)
+        
         payload = decode_token(token)
         
         if not payload:
@@ -106,6 +130,25 @@ class AuthService(BaseService):
             return None
         
         user = await user_crud.get(db, int(user_id))
+        if not user:
+            return None
+        
+        ttl = min(int(payload["exp"] - time.time()), TOKEN_USER_CACHE_TTL)
+        if redis_service.is_connected and ttl > 0:
+            await redis_service.cache_token_user(
+                key, user.id, user_crud.dump_cached(user), ttl
+            )
+        
+        return user
+    
+    async def validate_token(
+        self,
+        db: AsyncSession,
+        *,
+        token: str
+    ) -> Optional[User]:
+        """Validate access token and return user."""
+        user = await self.get_token_user(db, token=token)
         if not user or not user.is_active:
             return None
         
@@ -118,22 +161,17 @@ class AuthService(BaseService):
         user_in: UserCreate
     ) -> Tuple[Optional[User], Optional[str]]:
         """Register a new user. Returns (user, error_message)."""
-        # Check if email exists
-        existing_email = await user_crud.get_by_email(db, email=user_in.email)
-        if existing_email:
-            return None, "Email already registered"
-        
-        # Check if username exists
-        existing_username = await user_crud.get_by_username(
-            db, username=user_in.username
-        )
-        if existing_username:
-            return None, "Username already taken"
-        
-        # Create user
+        # Create user; a conflict on email or username yields None
         user = await user_crud.create(db, obj_in=user_in)
+        if user is None:
+            conflicts = await user_crud.find_conflicts(
+                db, email=user_in.email, username=user_in.username
+            )
+            if "email" in conflicts:
+                return None, "Email already registered"
+            return None, "Username already taken"
         
-        self.log_info(f"New user registered: {user.username}")
+        self.log_info("New user registered: {}", user.username)
         return user, None
     
     async def change_password(
@@ -145,12 +183,15 @@ class AuthService(BaseService):
         new_password: str
     ) -> Tuple[bool, Optional[str]]:
         """Change user password. Returns (success, error_message)."""
-        if not verify_password(current_password, user.hashed_password):
+        hashed_password = await user_crud.get_hashed_password(
+            db, user_id=user.id
+        )
+        if not await verify_password_async(current_password, hashed_password):
             return False, "Current password is incorrect"
         
         await user_crud.update_password(db, user=user, new_password=new_password)
         
-        self.log_info(f"Password changed for user {user.username}")
+        self.log_info("Password changed for user {}", user.username)
         return True, None
 
 
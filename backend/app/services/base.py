@@ -3,24 +3,32 @@ from loguru import logger
 
 
 class BaseService:
-    """Base service class with common functionality."""
+    """
+    Base service class with common functionality.
+    
+    The log helpers take loguru `{}` templates plus arguments, which are
+    only formatted if a handler accepts the level, e.g.
+    `self.log_info("Started analysis {}", analysis_id)`.
+    """
     
     def __init__(self, name: str = "BaseService"):
         self.name = name
+        # depth=1 attributes records to the caller, not these helpers
         self.logger = logger.bind(service=name)
+        self._log = self.logger.opt(depth=1)
     
-    def log_info(self, message: str, **kwargs):
+    def log_info(self, message: str, *args: Any, **kwargs: Any):
         """Log info message."""
-        self.logger.info(message, **kwargs)
+        self._log.info(message, *args, **kwargs)
     
-    def log_error(self, message: str, **kwargs):
+    def log_error(self, message: str, *args: Any, **kwargs: Any):
         """Log error message."""
-        self.logger.error(message, **kwargs)
+        self._log.error(message, *args, **kwargs)
     
-    def log_warning(self, message: str, **kwargs):
+    def log_warning(self, message: str, *args: Any, **kwargs: Any):
         """Log warning message."""
-        self.logger.warning(message, **kwargs)
+        self._log.warning(message, *args, **kwargs)
     
-    def log_debug(self, message: str, **kwargs):
+    def log_debug(self, message: str, *args: Any, **kwargs: Any):
         """Log debug message."""
-        self.logger.debug(message, **kwargs)
+        self._log.debug(message, *args, **kwargs)
@@ -1,5 +1,9 @@
-from typing import Optional, Any, Dict, List
+import asyncio
+import time
+from typing import Optional, Any, Dict, List, Union
 import httpx
+import orjson
+from pydantic import BaseModel
 from app.core.config import settings
 from app.services.base import BaseService
 from app.schemas.brain import (
@@ -8,6 +12,7 @@ from app.schemas.brain import (
     TextAnalysisResponse,
     BatchAnalysisRequest,
     BatchAnalysisResponse,
+    PostColumns,
     SummarizationRequest,
     TrendDetectionRequest,
 )
@@ -22,6 +27,10 @@ class BrainServiceError(Exception):
         super().__init__(self.message)
 
 
+# Seconds a BRAIN health probe result is reused by is_available()
+AVAILABILITY_TTL = 3.0
+
+
 class BrainService(BaseService):
     """
     Service for communicating with the BRAIN (RAPIDS Docker) container.
@@ -33,14 +42,28 @@ class BrainService(BaseService):
         self.base_url = settings.BRAIN_SERVICE_URL
         self.timeout = settings.BRAIN_SERVICE_TIMEOUT
         self._client: Optional[httpx.AsyncClient] = None
+        self._available = False
+        self._available_ts = float("-inf")
+        self._available_lock = asyncio.Lock()
     
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(
                 base_url=self.base_url,
-                timeout=httpx.Timeout(self.timeout),
-                headers={"Content-Type": "application/json"}
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+                headers={"Content-Type": "application/json"},
+                # Limits go on the transport: the client ignores its own
+                # limits once an explicit transport is passed. Retries only
+                # cover failed connection attempts, never requests
+                transport=httpx.AsyncHTTPTransport(
+                    retries=2,
+                    limits=httpx.Limits(
+                        max_connections=settings.BRAIN_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.BRAIN_MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=settings.BRAIN_KEEPALIVE_EXPIRY
+                    )
+                )
             )
         return self._client
     
@@ -54,35 +77,44 @@ class BrainService(BaseService):
         self,
         method: str,
         endpoint: str,
-        data: Optional[Dict] = None,
+        data: Optional[Union[Dict, BaseModel]] = None,
         params: Optional[Dict] = None
     ) -> Dict[str, Any]:
         """Make HTTP request to BRAIN service."""
         client = await self._get_client()
         
+        # Request models serialize straight to JSON bytes in pydantic-core
+        # (model_dump_json would decode to str only for httpx to re-encode)
+        if isinstance(data, BaseModel):
+            content = data.__pydantic_serializer__.to_json(data)
+        elif data is not None:
+            content = orjson.dumps(data)
+        else:
+            content = None
+        
         try:
             response = await client.request(
                 method=method,
                 url=endpoint,
-                json=data,
+                content=content,
                 params=params
             )
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except httpx.TimeoutException:
-            self.log_error(f"BRAIN service timeout: {endpoint}")
+            self.log_error("BRAIN service timeout: {}", endpoint)
             raise BrainServiceError("BRAIN service timeout", status_code=504)
         except httpx.HTTPStatusError as e:
-            self.log_error(f"BRAIN service HTTP error: {e.response.status_code}")
+            self.log_error("BRAIN service HTTP error: {}", e.response.status_code)
             raise BrainServiceError(
                 f"BRAIN service error: {e.response.text}",
                 status_code=e.response.status_code
             )
         except httpx.RequestError as e:
-            self.log_error(f"BRAIN service connection error: {e}")
+            self.log_error("BRAIN service connection error: {}", e)
             raise BrainServiceError("BRAIN service unavailable", status_code=503)
         except Exception as e:
-            self.log_error(f"BRAIN service unexpected error: {e}")
+            self.log_error("BRAIN service unexpected error: {}", e)
             raise BrainServiceError(str(e))
     
     async def health_check(self) -> BrainHealthResponse:
@@ -97,12 +129,21 @@ class BrainService(BaseService):
             )
     
     async def is_available(self) -> bool:
-        """Check if BRAIN service is available."""
-        try:
-            health = await self.health_check()
-            return health.status == "healthy"
-        except Exception:
-            return False
+        """Check if BRAIN service is available (cached for AVAILABILITY_TTL)."""
+        if time.monotonic() - self._available_ts < AVAILABILITY_TTL:
+            return self._available
+        
+        # One probe at a time; waiters reuse its result
+        async with self._available_lock:
+            if time.monotonic() - self._available_ts < AVAILABILITY_TTL:
+                return self._available
+            try:
+                health = await self.health_check()
+                self._available = health.status == "healthy"
+            except Exception:
+                self._available = False
+            self._available_ts = time.monotonic()
+        return self._available
     
     # ==========================================
     # Sentiment Analysis
@@ -178,13 +219,13 @@ class BrainService(BaseService):
         if analysis_types is None:
             analysis_types = ["sentiment", "emotion", "keywords", "entities"]
         
-        request_data = TextAnalysisRequest(
+        request_data = TextAnalysisRequest.model_construct(
             texts=texts,
             text_ids=text_ids,
-            analysis_types=analysis_types,
+            analysis_types=tuple(analysis_types),
             language="fa",
             config=config
-        ).model_dump()
+        )
         
         result = await self._request("POST", "/analyze/text", data=request_data)
         
@@ -201,12 +242,12 @@ class BrainService(BaseService):
         min_length: int = 30
     ) -> List[str]:
         """Summarize texts."""
-        request_data = SummarizationRequest(
+        request_data = SummarizationRequest.model_construct(
             texts=texts,
             max_length=max_length,
             min_length=min_length,
             language="fa"
-        ).model_dump()
+        )
         
         result = await self._request("POST", "/analyze/summarize", data=request_data)
         return result.get("summaries", [])
@@ -286,13 +327,13 @@ class BrainService(BaseService):
         min_trend_size: int = 10
     ) -> List[Dict[str, Any]]:
         """Detect trends in posts."""
-        request_data = TrendDetectionRequest(
+        request_data = TrendDetectionRequest.model_construct(
             posts=posts,
             time_field="posted_at",
             content_field="content",
             min_trend_size=min_trend_size,
             time_window=time_window
-        ).model_dump()
+        )
         
         result = await self._request("POST", "/analyze/trends", data=request_data)
         return result.get("trends", [])
@@ -359,17 +400,20 @@ class BrainService(BaseService):
     async def submit_batch_analysis(
         self,
         analysis_id: int,
-        posts: List[Dict[str, Any]],
-        config: Dict[str, Any],
-        callback_url: Optional[str] = None
+        posts: Optional[List[Dict[str, Any]]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        callback_url: Optional[str] = None,
+        post_columns: Optional[PostColumns] = None
     ) -> BatchAnalysisResponse:
-        """Submit batch analysis job to BRAIN."""
-        request_data = BatchAnalysisRequest(
+        """Submit batch analysis job to BRAIN (row-wise or columnar posts)."""
+        # Arguments come from our own code: skip re-validating every post
+        request_data = BatchAnalysisRequest.model_construct(
             analysis_id=analysis_id,
-            posts=posts,
-            config=config,
+            posts=posts or [],
+            post_columns=post_columns,
+            config=config or {},
             callback_url=callback_url
-        ).model_dump()
+        )
         
         result = await self._request("POST", "/batch/analyze", data=request_data)
         return BatchAnalysisResponse(**result)
@@ -24,17 +24,27 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=3600,  # 1 hour max
     task_soft_time_limit=3300,  # 55 minutes soft limit
+    # Ack after the task finishes, and requeue it if the worker dies, so a
+    # restart mid-analysis does not drop the job
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    # Unacked tasks are redelivered after this; keep it above the time limit
+    broker_transport_options={"visibility_timeout": 3900},
     
     # Result settings
     result_expires=86400,  # Results expire after 24 hours
     
     # Worker settings
-    worker_prefetch_multiplier=1,
+    # Tasks run for minutes; with prefetch 1 a busy worker does not hold
+    # reserved tasks that an idle sibling could be running
+    worker_prefetch_multiplier=settings.CELERY_PREFETCH_MULTIPLIER,
     worker_concurrency=4,
     
     # Task routing
     task_routes={
         "app.services.tasks.process_analysis": {"queue": "analysis"},
+        "app.services.tasks.analyze_chunk": {"queue": "analysis"},
+        "app.services.tasks.finalize_analysis": {"queue": "analysis"},
         "app.services.tasks.detect_trends": {"queue": "trends"},
         "app.services.tasks.build_graph": {"queue": "graph"},
     },
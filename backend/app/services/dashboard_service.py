@@ -1,44 +1,164 @@
-from typing import Optional, List, Dict, Any
+import asyncio
+import time
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database import AsyncSessionLocal, has_writes
 from app.services.base import BaseService
 from app.services.redis_service import redis_service
 from app.crud import dashboard as dashboard_crud
+from app.crud.base import gather_reads, hold_fanout_slot
 from app.crud import analysis as analysis_crud
+from app.crud import analysis_result as result_crud
 from app.crud import post as post_crud
 from app.crud import trend as trend_crud
 from app.crud import graph_node as node_crud
 from app.schemas.dashboard import DashboardCreate
 
+# Keys embed the versions of the tables they read, so writes invalidate
+# them; the TTL is only a safety net
+DASHBOARD_CACHE_TTL = 3600
+OVERVIEW_KEY = "dashboard:overview"
+SENTIMENT_KEY = "dashboard:sentiment"
+EMOTION_KEY = "dashboard:emotion"
+RESULT_TABLES = ("analysis_results",)
+OVERVIEW_TABLES = ("posts", "trends", "graph_nodes", "analyses") + RESULT_TABLES
+
+# In-process overview memo; skips the Redis round-trip for hot reads at
+# the cost of up to this many seconds of staleness per process
+OVERVIEW_MEMO_TTL = 5.0
+
+# Widgets on an auto-created dashboard
+DEFAULT_WIDGETS = [
+    {
+        "widget_id": "overview-1",
+        "widget_type": "overview",
+        "title": "Overview",
+        "position": {"x": 0, "y": 0, "w": 4, "h": 2}
+    },
+    {
+        "widget_id": "sentiment-1",
+        "widget_type": "sentiment_chart",
+        "title": "Sentiment Distribution",
+        "position": {"x": 4, "y": 0, "w": 4, "h": 2}
+    },
+    {
+        "widget_id": "emotions-1",
+        "widget_type": "emotion_chart",
+        "title": "Emotion Distribution",
+        "position": {"x": 8, "y": 0, "w": 4, "h": 2}
+    },
+    {
+        "widget_id": "hashtags-1",
+        "widget_type": "trending_hashtags",
+        "title": "Trending Hashtags",
+        "position": {"x": 0, "y": 2, "w": 6, "h": 3}
+    },
+    {
+        "widget_id": "volume-1",
+        "widget_type": "volume_chart",
+        "title": "Post Volume",
+        "position": {"x": 6, "y": 2, "w": 6, "h": 3}
+    }
+]
+
+# Widget types served from the dashboard cache, worth warming ahead of use
+_CACHED_WIDGET_TYPES = frozenset({"overview", "sentiment_chart", "emotion_chart"})
+
+# Widget types whose queries go through fetch_rows, which takes its own
+# fan-out slots; every other widget queries its session directly
+_FANOUT_WIDGET_TYPES = frozenset({"overview", "platform_stats"})
+
+
+def _percentages(distribution: Dict[str, int], total: int) -> Dict[str, float]:
+    """Share of each bucket in percent, rounded to two decimals."""
+    if total <= 0:
+        return {}
+    return {k: round((v / total) * 100, 2) for k, v in distribution.items()}
+
+
+def _versioned_key(prefix: str, versions: List[int]) -> str:
+    """Cache key for a section at the given table versions."""
+    return ":".join([prefix, *map(str, versions)])
+
 
 class DashboardService(BaseService):
     """Service for dashboard operations."""
     
     def __init__(self):
         super().__init__("DashboardService")
+        self._overview: Dict[str, Any] = {}
+        self._overview_ts = float("-inf")
+        self._overview_lock = asyncio.Lock()
     
     async def get_overview_stats(
         self,
         db: AsyncSession
     ) -> Dict[str, Any]:
-        """Get overview statistics for dashboard."""
-        # Try to get from cache
-        cached = await redis_service.get_json("dashboard:overview")
-        if cached:
-            return cached
+        """Get overview statistics (memoized in-process for OVERVIEW_MEMO_TTL)."""
+        # A session with its own uncommitted writes must see them
+        if has_writes(db):
+            return await self._load_overview_stats(db)
         
-        # Get stats from database
-        post_stats = await post_crud.get_stats(db)
+        if time.monotonic() - self._overview_ts < OVERVIEW_MEMO_TTL:
+            return self._overview
         
-        # Count active trends
-        active_trends = await trend_crud.get_active(db, limit=1)
-        trend_stats = await trend_crud.get_stats(db)
+        # One load at a time; waiters reuse its result
+        async with self._overview_lock:
+            if time.monotonic() - self._overview_ts < OVERVIEW_MEMO_TTL:
+                return self._overview
+            self._overview = await self._load_overview_stats(db)
+            self._overview_ts = time.monotonic()
+        return self._overview
+    
+    async def _load_overview_stats(
+        self,
+        db: AsyncSession
+    ) -> Dict[str, Any]:
+        """Overview from the versioned Redis cache, or the database on a miss."""
+        versions = await redis_service.get_table_versions(OVERVIEW_TABLES)
+        result_versions = versions[-len(RESULT_TABLES):]
+        overview_key = _versioned_key(OVERVIEW_KEY, versions)
+        sentiment_key = _versioned_key(SENTIMENT_KEY, result_versions)
+        emotion_key = _versioned_key(EMOTION_KEY, result_versions)
         
-        # Get graph stats
-        graph_stats = await node_crud.get_stats(db)
+        # One MGET covers the overview and the sections it embeds
+        cached, sentiment, emotion = await redis_service.mget_json(
+            [overview_key, sentiment_key, emotion_key]
+        )
+        if cached:
+            return cached
         
-        # Get analysis stats
-        analysis_stats = await analysis_crud.get_stats(db)
+        # Independent stats run concurrently, each on its own session
+        missing = [
+            compute
+            for section, compute in (
+                (sentiment, self._compute_sentiment_overview),
+                (emotion, self._compute_emotion_overview),
+            )
+            if section is None
+        ]
+        (
+            post_stats, trend_stats, graph_stats, analysis_stats, *computed
+        ) = await gather_reads(
+            db,
+            [
+                post_crud.get_stats,
+                trend_crud.get_stats,
+                node_crud.get_stats,
+                analysis_crud.get_stats,
+                *missing,
+            ],
+            limit=False
+        )
+        computed = iter(computed)
+        if sentiment is None:
+            sentiment = next(computed)
+        if emotion is None:
+            emotion = next(computed)
         
         overview = {
             "posts": {
@@ -58,11 +178,20 @@ class DashboardService(BaseService):
             "analyses": {
                 "total": analysis_stats["total"],
                 "by_status": analysis_stats["by_status"]
-            }
+            },
+            "sentiment": sentiment,
+            "emotion": emotion
         }
         
-        # Cache for 5 minutes
-        await redis_service.set_json("dashboard:overview", overview, expire=300)
+        # Cache all three sections in one round-trip
+        await redis_service.set_many_json(
+            {
+                overview_key: overview,
+                sentiment_key: sentiment,
+                emotion_key: emotion,
+            },
+            expire=DASHBOARD_CACHE_TTL
+        )
         
         return overview
     
@@ -71,74 +200,76 @@ class DashboardService(BaseService):
         db: AsyncSession
     ) -> Dict[str, Any]:
         """Get sentiment analysis overview."""
-        from app.models.analysis_result import AnalysisResult
-        from sqlalchemy import select, func
-        
-        # Get sentiment distribution
-        query = (
-            select(
-                AnalysisResult.sentiment_label,
-                func.count(AnalysisResult.id)
-            )
-            .where(AnalysisResult.sentiment_label.isnot(None))
-            .group_by(AnalysisResult.sentiment_label)
+        return await self._cached_section(
+            db, SENTIMENT_KEY, self._compute_sentiment_overview
+        )
+    
+    async def get_emotion_overview(
+        self,
+        db: AsyncSession
+    ) -> Dict[str, Any]:
+        """Get emotion analysis overview."""
+        return await self._cached_section(
+            db, EMOTION_KEY, self._compute_emotion_overview
+        )
+    
+    async def _cached_section(
+        self,
+        db: AsyncSession,
+        prefix: str,
+        compute: Callable[[AsyncSession], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Serve a dashboard section from cache, computing it on a miss."""
+        key = _versioned_key(
+            prefix, await redis_service.get_table_versions(RESULT_TABLES)
         )
-        result = await db.execute(query)
+        cached = await redis_service.get_json(key)
+        if cached is not None:
+            return cached
+        section = await compute(db)
+        await redis_service.set_json(key, section, expire=DASHBOARD_CACHE_TTL)
+        return section
+    
+    async def _compute_sentiment_overview(
+        self,
+        db: AsyncSession
+    ) -> Dict[str, Any]:
+        """Compute the sentiment distribution from the result rollup."""
+        rows = await result_crud.get_label_rollup(db)
         
-        distribution = {row[0]: row[1] for row in result.all()}
+        distribution: Dict[str, int] = {}
+        score_sum = 0.0
+        score_count = 0
+        for label, _, count, row_score_sum, row_score_count in rows:
+            if label:
+                distribution[label] = distribution.get(label, 0) + count
+            score_sum += row_score_sum
+            score_count += row_score_count
         
-        # Calculate percentages
         total = sum(distribution.values())
-        percentages = {}
-        if total > 0:
-            percentages = {
-                k: round((v / total) * 100, 2)
-                for k, v in distribution.items()
-            }
-        
-        # Get average score
-        avg_query = select(func.avg(AnalysisResult.sentiment_score))
-        avg_result = await db.execute(avg_query)
-        avg_score = avg_result.scalar()
-        
         return {
             "distribution": distribution,
-            "percentages": percentages,
-            "average_score": float(avg_score) if avg_score else 0,
+            "percentages": _percentages(distribution, total),
+            "average_score": score_sum / score_count if score_count else 0,
             "total_analyzed": total
         }
     
-    async def get_emotion_overview(
+    async def _compute_emotion_overview(
         self,
         db: AsyncSession
     ) -> Dict[str, Any]:
-        """Get emotion analysis overview."""
-        from app.models.analysis_result import AnalysisResult
-        from sqlalchemy import select, func
-        
-        query = (
-            select(
-                AnalysisResult.dominant_emotion,
-                func.count(AnalysisResult.id)
-            )
-            .where(AnalysisResult.dominant_emotion.isnot(None))
-            .group_by(AnalysisResult.dominant_emotion)
-        )
-        result = await db.execute(query)
+        """Compute the emotion distribution from the result rollup."""
+        rows = await result_crud.get_label_rollup(db)
         
-        distribution = {row[0]: row[1] for row in result.all()}
+        distribution: Dict[str, int] = {}
+        for _, emotion, count, _, _ in rows:
+            if emotion:
+                distribution[emotion] = distribution.get(emotion, 0) + count
         
         total = sum(distribution.values())
-        percentages = {}
-        if total > 0:
-            percentages = {
-                k: round((v / total) * 100, 2)
-                for k, v in distribution.items()
-            }
-        
         return {
             "distribution": distribution,
-            "percentages": percentages,
+            "percentages": _percentages(distribution, total),
             "total_analyzed": total
         }
     
@@ -240,6 +371,58 @@ class DashboardService(BaseService):
         else:
             return {"error": f"Unknown widget type: {widget_type}"}
     
+    async def get_widgets_data(
+        self,
+        db: AsyncSession,
+        *,
+        widgets: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Fetch data for several widgets concurrently, each on its own session."""
+        # Identical widgets share one fetch, which also bounds the
+        # fan-out widgets that run without a slot to one per type
+        fetch_index: Dict[bytes, int] = {}
+        calls = []
+        indexes = []
+        for widget in widgets:
+            key = orjson.dumps(
+                [widget["widget_type"], widget.get("config")],
+                option=orjson.OPT_SORT_KEYS
+            )
+            if key not in fetch_index:
+                fetch_index[key] = len(calls)
+                call = partial(
+                    self.get_widget_data,
+                    widget_type=widget["widget_type"],
+                    config=widget.get("config")
+                )
+                # Direct queries hold a slot, so stored widget lists cannot
+                # open more connections than the fan-out limit
+                if widget["widget_type"] not in _FANOUT_WIDGET_TYPES:
+                    call = hold_fanout_slot(call)
+                calls.append(call)
+            indexes.append(fetch_index[key])
+        data = await gather_reads(db, calls, limit=False)
+        updated_at = datetime.now(timezone.utc)
+        return [
+            {
+                "widget_id": widget["widget_id"],
+                "data": data[index],
+                "updated_at": updated_at
+            }
+            for widget, index in zip(widgets, indexes)
+        ]
+    
+    async def warm_default_widgets(self) -> None:
+        """Populate the cached default-dashboard widgets, e.g. after login."""
+        widgets = [
+            w for w in DEFAULT_WIDGETS if w["widget_type"] in _CACHED_WIDGET_TYPES
+        ]
+        try:
+            async with AsyncSessionLocal() as db:
+                await self.get_widgets_data(db, widgets=widgets)
+        except Exception as e:
+            self.log_warning("Dashboard warmup failed: {}", e)
+    
     async def create_default_dashboard(
         self,
         db: AsyncSession,
@@ -247,43 +430,10 @@ class DashboardService(BaseService):
         user_id: int
     ):
         """Create default dashboard for a user."""
-        default_widgets = [
-            {
-                "widget_id": "overview-1",
-                "widget_type": "overview",
-                "title": "Overview",
-                "position": {"x": 0, "y": 0, "w": 4, "h": 2}
-            },
-            {
-                "widget_id": "sentiment-1",
-                "widget_type": "sentiment_chart",
-                "title": "Sentiment Distribution",
-                "position": {"x": 4, "y": 0, "w": 4, "h": 2}
-            },
-            {
-                "widget_id": "emotions-1",
-                "widget_type": "emotion_chart",
-                "title": "Emotion Distribution",
-                "position": {"x": 8, "y": 0, "w": 4, "h": 2}
-            },
-            {
-                "widget_id": "hashtags-1",
-                "widget_type": "trending_hashtags",
-                "title": "Trending Hashtags",
-                "position": {"x": 0, "y": 2, "w": 6, "h": 3}
-            },
-            {
-                "widget_id": "volume-1",
-                "widget_type": "volume_chart",
-                "title": "Post Volume",
-                "position": {"x": 6, "y": 2, "w": 6, "h": 3}
-            }
-        ]
-        
         dashboard_in = DashboardCreate(
             name="Default Dashboard",
             description="Auto-generated default dashboard",
-            widgets=default_widgets,
+            widgets=DEFAULT_WIDGETS,
             is_default=True
         )
         
@@ -293,7 +443,7 @@ class DashboardService(BaseService):
             user_id=user_id
         )
         
-        self.log_info(f"Created default dashboard for user {user_id}")
+        self.log_info("Created default dashboard for user {}", user_id)
         return dashboard
 
 
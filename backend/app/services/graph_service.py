@@ -1,13 +1,41 @@
-from typing import Optional, List, Dict, Any
+import asyncio
+import time
+from collections import Counter
+from functools import partial
+from itertools import combinations
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.database import has_writes
 from app.services.base import BaseService
 from app.services.brain_service import brain_service, BrainServiceError
+from app.services.redis_service import redis_service
 from app.crud import graph_node as node_crud
 from app.crud import graph_edge as edge_crud
 from app.crud import author as author_crud
 from app.crud import post as post_crud
-from app.schemas.graph import GraphNodeCreate, GraphEdgeCreate
+from app.crud.base import gather_reads
+from app.models.graph import GraphNode
+from app.models.post import Post
+from app.schemas.graph import GraphNodeCreate
+from app.schemas.post import PostFilter
+
+# BRAIN PageRank/community results are keyed by graph signature, so a
+# structural change misses on its own; the TTL just bounds storage
+GRAPH_RESULT_TTL = 86400
+
+# Lock held while one worker computes a BRAIN graph result; outlives the
+# BRAIN request timeout so it cannot expire mid-call
+GRAPH_LOCK_TTL = settings.BRAIN_SERVICE_TIMEOUT + 60
+GRAPH_LOCK_MAX_POLL = 2.0
+
+# Posts scanned per network build, streamed in batches of this size
+NETWORK_POST_LIMIT = 10000
+NETWORK_STREAM_BATCH = 500
+
+# Sleep used while polling a held lock; tests replace it
+_sleep = asyncio.sleep
 
 
 class GraphService(BaseService):
@@ -23,54 +51,46 @@ class GraphService(BaseService):
         platform: Optional[str] = None
     ) -> Dict[str, Any]:
         """Build author interaction network from posts."""
-        # Get all posts with mentions
-        from app.schemas.post import PostFilter
-        
         filters = PostFilter(platform=platform) if platform else PostFilter()
-        posts = await post_crud.get_filtered(db, filters=filters, limit=10000)
         
-        nodes_created = 0
-        edges_created = 0
-        
-        for post in posts:
-            if not post.author_id:
-                continue
-            
-            # Create author node
-            author_node = GraphNodeCreate(
-                node_id=f"author_{post.author_id}",
-                node_type="author",
-                label=str(post.author_id)
-            )
-            await node_crud.get_or_create(db, obj_in=author_node)
-            nodes_created += 1
-            
-            # Process mentions
-            if post.mentions:
-                for mention in post.mentions:
-                    # Create mention node
-                    mention_node = GraphNodeCreate(
-                        node_id=f"mention_{mention}",
-                        node_type="mention",
-                        label=mention
+        # Stream only the needed columns; memory grows with distinct nodes
+        # and pairs, not with the number of posts scanned
+        nodes_in: Dict[str, GraphNodeCreate] = {}
+        pairs: Counter = Counter()
+        async for batch in post_crud.stream_filtered_batches(
+            db,
+            filters=filters,
+            columns=(Post.author_id, Post.mentions),
+            limit=NETWORK_POST_LIMIT,
+            batch_size=NETWORK_STREAM_BATCH
+        ):
+            for post_author_id, mentions in batch:
+                if not post_author_id:
+                    continue
+                
+                author_id = f"author_{post_author_id}"
+                if author_id not in nodes_in:
+                    nodes_in[author_id] = GraphNodeCreate(
+                        node_id=author_id,
+                        node_type="author",
+                        label=str(post_author_id)
                     )
-                    target, _ = await node_crud.get_or_create(db, obj_in=mention_node)
-                    
-                    # Get source node
-                    source = await node_crud.get_by_node_id(
-                        db, node_id=f"author_{post.author_id}"
-                    )
-                    
-                    if source and target:
-                        # Create edge
-                        edge = GraphEdgeCreate(
-                            edge_type="mentions",
-                            source_id=source.id,
-                            target_id=target.id,
-                            weight=1.0
+                for mention in mentions or ():
+                    mention_id = f"mention_{mention}"
+                    if mention_id not in nodes_in:
+                        nodes_in[mention_id] = GraphNodeCreate(
+                            node_id=mention_id,
+                            node_type="mention",
+                            label=mention
                         )
-                        await edge_crud.get_or_create(db, obj_in=edge)
-                        edges_created += 1
+                    pairs[(author_id, mention_id)] += 1
+        
+        nodes, nodes_created = await node_crud.get_or_create_many(
+            db, nodes_in=list(nodes_in.values())
+        )
+        edges_created = await self._upsert_edges(
+            db, edge_type="mentions", pairs=pairs, nodes=nodes
+        )
         
         return {
             "nodes_created": nodes_created,
@@ -84,150 +104,206 @@ class GraphService(BaseService):
         platform: Optional[str] = None
     ) -> Dict[str, Any]:
         """Build hashtag co-occurrence network."""
-        from app.schemas.post import PostFilter
-        
         filters = PostFilter(platform=platform) if platform else PostFilter()
-        posts = await post_crud.get_filtered(db, filters=filters, limit=10000)
-        
-        nodes_created = 0
-        edges_created = 0
         
-        for post in posts:
-            if not post.hashtags or len(post.hashtags) < 2:
-                continue
-            
-            # Create nodes for hashtags
-            hashtag_nodes = []
-            for hashtag in post.hashtags:
-                node = GraphNodeCreate(
-                    node_id=f"hashtag_{hashtag}",
-                    node_type="hashtag",
-                    label=hashtag
+        nodes_in: Dict[str, GraphNodeCreate] = {}
+        pairs: Counter = Counter()
+        async for batch in post_crud.stream_filtered_batches(
+            db,
+            filters=filters,
+            columns=(Post.hashtags,),
+            limit=NETWORK_POST_LIMIT,
+            batch_size=NETWORK_STREAM_BATCH
+        ):
+            for (post_hashtags,) in batch:
+                if not post_hashtags or len(post_hashtags) < 2:
+                    continue
+                
+                # Sorted so (a, b) and (b, a) count toward the same edge
+                hashtags = sorted(set(post_hashtags))
+                for hashtag in hashtags:
+                    node_id = f"hashtag_{hashtag}"
+                    if node_id not in nodes_in:
+                        nodes_in[node_id] = GraphNodeCreate(
+                            node_id=node_id,
+                            node_type="hashtag",
+                            label=hashtag
+                        )
+                pairs.update(
+                    (f"hashtag_{source}", f"hashtag_{target}")
+                    for source, target in combinations(hashtags, 2)
                 )
-                db_node, created = await node_crud.get_or_create(db, obj_in=node)
-                hashtag_nodes.append(db_node)
-                if created:
-                    nodes_created += 1
-            
-            # Create edges between co-occurring hashtags
-            for i, source in enumerate(hashtag_nodes):
-                for target in hashtag_nodes[i+1:]:
-                    edge = GraphEdgeCreate(
-                        edge_type="co_occurrence",
-                        source_id=source.id,
-                        target_id=target.id,
-                        weight=1.0
-                    )
-                    _, created = await edge_crud.get_or_create(db, obj_in=edge)
-                    if created:
-                        edges_created += 1
+        
+        nodes, nodes_created = await node_crud.get_or_create_many(
+            db, nodes_in=list(nodes_in.values())
+        )
+        edges_created = await self._upsert_edges(
+            db, edge_type="co_occurrence", pairs=pairs, nodes=nodes
+        )
         
         return {
             "nodes_created": nodes_created,
             "edges_created": edges_created
         }
     
-    async def calculate_pagerank(
+    async def _upsert_edges(
         self,
-        db: AsyncSession
+        db: AsyncSession,
+        *,
+        edge_type: str,
+        pairs: Counter,
+        nodes: Dict[str, GraphNode]
     ) -> int:
-        """Calculate PageRank for all nodes using BRAIN service."""
-        # Get all nodes and edges
-        nodes = await node_crud.get_all(db)
-        edges = await edge_crud.get_all(db)
-        
-        if not nodes or not edges:
-            return 0
+        """Upsert counted (source, target) node_id pairs as edges; returns how many are new."""
+        counts = Counter()
+        for (source, target), count in pairs.items():
+            counts[(nodes[source].id, nodes[target].id)] += count
+        edges = await edge_crud.bulk_create_counted(
+            db, edge_type=edge_type, counts=counts
+        )
+        # An edge is new when all of its occurrences came from this batch
+        return sum(
+            1 for e in edges
+            if e.occurrence_count == counts[(e.source_id, e.target_id)]
+        )
+    
+    async def _graph_payload(
+        self,
+        db: AsyncSession
+    ) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """Nodes and edges in BRAIN's format, or None if the graph is empty."""
+        # Column projections only: no ORM objects or identity-map entries
+        nodes_data = []
+        node_ids = {}
+        async for batch in node_crud.stream_projection(db):
+            for id_, node_id, node_type in batch:
+                nodes_data.append({"id": node_id, "type": node_type})
+                node_ids[id_] = node_id
+        if not nodes_data:
+            return None
         
-        # Prepare data for BRAIN
-        nodes_data = [
-            {"id": n.node_id, "type": n.node_type}
-            for n in nodes
-        ]
+        # Skip edges whose endpoints were deleted since the node stream
         edges_data = [
             {
-                "source": (await node_crud.get(db, e.source_id)).node_id,
-                "target": (await node_crud.get(db, e.target_id)).node_id,
-                "weight": e.weight
+                "source": node_ids[source_id],
+                "target": node_ids[target_id],
+                "weight": weight
             }
-            for e in edges
+            async for batch in edge_crud.stream_projection(db)
+            for source_id, target_id, weight in batch
+            if source_id in node_ids and target_id in node_ids
         ]
+        if not edges_data:
+            return None
+        
+        return nodes_data, edges_data
+    
+    async def _brain_graph_result(
+        self,
+        db: AsyncSession,
+        *,
+        kind: str,
+        call: Callable[..., Awaitable[Any]]
+    ) -> Optional[Any]:
+        """
+        BRAIN result for the current graph, computed once across workers.
+        
+        Results are cached by graph signature. Concurrent callers for the
+        same signature coalesce on a Redis lock: one calls BRAIN, the rest
+        poll the cache while the lock is held. The lock expires after
+        GRAPH_LOCK_TTL, so a crashed holder hands over to the next poller.
+        Returns None for an empty graph.
+        """
+        signature = await node_crud.get_signature(db)
+        cache_key = f"brain:{kind}:{signature}"
+        lock_key = f"lock:brain:{kind}:{signature}"
+        
+        delay = 0.1
+        deadline = time.monotonic() + GRAPH_LOCK_TTL
+        while True:
+            result = await redis_service.get_json(cache_key)
+            if result is not None:
+                return result
+            token = await redis_service.acquire_lock(lock_key, GRAPH_LOCK_TTL)
+            if token:
+                break
+            if time.monotonic() > deadline:
+                raise BrainServiceError(f"{kind} is still being computed")
+            # End the read transaction so no connection idles while waiting;
+            # sessions are expire_on_commit=False, so loaded objects stay valid
+            if not has_writes(db):
+                await db.commit()
+            await _sleep(delay)
+            delay = min(delay * 2, GRAPH_LOCK_MAX_POLL)
         
         try:
-            # Call BRAIN service
-            results = await brain_service.calculate_pagerank(
-                nodes=nodes_data,
-                edges=edges_data
+            payload = await self._graph_payload(db)
+            if payload is None:
+                return None
+            nodes_data, edges_data = payload
+            result = await call(nodes=nodes_data, edges=edges_data)
+            await redis_service.set_json(
+                cache_key, result, expire=GRAPH_RESULT_TTL
+            )
+            return result
+        finally:
+            if token:
+                await redis_service.release_lock(lock_key, token)
+    
+    async def calculate_pagerank(
+        self,
+        db: AsyncSession
+    ) -> int:
+        """Calculate PageRank for all nodes using BRAIN service."""
+        try:
+            results = await self._brain_graph_result(
+                db, kind="pagerank", call=brain_service.calculate_pagerank
             )
-            
-            # Update nodes with PageRank scores
-            updated = 0
-            for result in results:
-                node = await node_crud.get_by_node_id(db, node_id=result["id"])
-                if node:
-                    await node_crud.update(
-                        db,
-                        db_obj=node,
-                        obj_in={"pagerank": result.get("pagerank", 0)}
-                    )
-                    updated += 1
-            
-            return updated
-            
         except BrainServiceError as e:
-            self.log_error(f"PageRank calculation failed: {e.message}")
+            self.log_error("PageRank calculation failed: {}", e.message)
+            return 0
+        if results is None:
             return 0
+        
+        # Update nodes with PageRank scores in one statement
+        return await node_crud.bulk_set_metric(
+            db,
+            metric="pagerank",
+            values_by_node_id=[
+                (result["id"], result.get("pagerank", 0))
+                for result in results
+            ]
+        )
     
     async def detect_communities(
         self,
         db: AsyncSession
     ) -> Dict[str, Any]:
         """Detect communities using BRAIN service."""
-        nodes = await node_crud.get_all(db)
-        edges = await edge_crud.get_all(db)
-        
-        if not nodes or not edges:
-            return {"communities": 0}
-        
-        nodes_data = [
-            {"id": n.node_id, "type": n.node_type}
-            for n in nodes
-        ]
-        edges_data = [
-            {
-                "source": (await node_crud.get(db, e.source_id)).node_id,
-                "target": (await node_crud.get(db, e.target_id)).node_id,
-                "weight": e.weight
-            }
-            for e in edges
-        ]
-        
         try:
-            result = await brain_service.detect_communities(
-                nodes=nodes_data,
-                edges=edges_data
+            result = await self._brain_graph_result(
+                db, kind="communities", call=brain_service.detect_communities
             )
-            
-            # Update nodes with community IDs
-            for node_result in result.get("nodes", []):
-                node = await node_crud.get_by_node_id(
-                    db, node_id=node_result["id"]
-                )
-                if node:
-                    await node_crud.update(
-                        db,
-                        db_obj=node,
-                        obj_in={"community_id": node_result.get("community_id")}
-                    )
-            
-            return {
-                "communities": len(result.get("communities", [])),
-                "communities_data": result.get("communities", [])
-            }
-            
         except BrainServiceError as e:
-            self.log_error(f"Community detection failed: {e.message}")
+            self.log_error("Community detection failed: {}", e.message)
             return {"communities": 0, "error": e.message}
+        if result is None:
+            return {"communities": 0}
+        
+        # Update nodes with community IDs in one statement
+        await node_crud.bulk_set_metric(
+            db,
+            metric="community_id",
+            values_by_node_id=[
+                (node_result["id"], node_result.get("community_id"))
+                for node_result in result.get("nodes", [])
+            ]
+        )
+        
+        return {
+            "communities": len(result.get("communities", [])),
+            "communities_data": result.get("communities", [])
+        }
     
     async def get_graph_data(
         self,
@@ -242,13 +318,12 @@ class GraphService(BaseService):
         else:
             nodes = await node_crud.get_multi(db, limit=limit)
         
-        node_ids = [n.id for n in nodes]
+        node_ids = {n.id: n.node_id for n in nodes}
         
-        # Get edges for these nodes
-        edges = []
-        for node in nodes:
-            node_edges = await edge_crud.get_by_source(db, source_id=node.id, limit=100)
-            edges.extend([e for e in node_edges if e.target_id in node_ids])
+        # Edges between these nodes, up to 100 per source, in one query
+        edges = await edge_crud.get_among(
+            db, node_ids=list(node_ids), per_source_limit=100
+        )
         
         return {
             "nodes": [
@@ -264,8 +339,8 @@ class GraphService(BaseService):
             ],
             "edges": [
                 {
-                    "source": (await node_crud.get(db, e.source_id)).node_id,
-                    "target": (await node_crud.get(db, e.target_id)).node_id,
+                    "source": node_ids[e.source_id],
+                    "target": node_ids[e.target_id],
                     "type": e.edge_type,
                     "weight": e.weight
                 }
@@ -275,11 +350,19 @@ class GraphService(BaseService):
     
     async def get_stats(
         self,
-        db: AsyncSession
+        db: AsyncSession,
+        *,
+        exact: bool = False
     ) -> Dict[str, Any]:
         """Get graph statistics."""
-        node_stats = await node_crud.get_stats(db)
-        edge_stats = await edge_crud.get_stats(db)
+        node_stats, edge_stats = await gather_reads(
+            db,
+            [
+                partial(node_crud.get_stats, exact=exact),
+                partial(edge_crud.get_stats, exact=exact),
+            ],
+            limit=False
+        )
         
         total_nodes = node_stats["total_nodes"]
         total_edges = edge_stats["total_edges"]
@@ -1,10 +1,28 @@
-from typing import Optional, Any, List
-import json
+from contextlib import asynccontextmanager
+import secrets
+from typing import AsyncIterator, Optional, Any, Dict, Iterable, List, Sequence
+import orjson
 import redis.asyncio as redis
+from redis.utils import HIREDIS_AVAILABLE
 from app.core.config import settings
 from app.services.base import BaseService
 
 
+# Delete the lock only if it still holds our token (it may have expired
+# and been taken by another worker)
+_RELEASE_LOCK = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def _dumps(value: Any) -> bytes:
+    """Encode a cache value; bytes go to Redis without a str round-trip."""
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
 class RedisService(BaseService):
     """Service for Redis cache operations."""
     
@@ -15,21 +33,34 @@ class RedisService(BaseService):
     async def connect(self) -> None:
         """Connect to Redis."""
         if not self._client:
-            self._client = redis.from_url(
+            # redis-py parses replies with hiredis (C) when it is installed
+            pool = redis.BlockingConnectionPool.from_url(
                 settings.REDIS_URL,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
                 encoding="utf-8",
                 decode_responses=True
             )
+            self._client = redis.Redis(connection_pool=pool)
             await self._client.ping()
-            self.log_info("Connected to Redis")
+            self.log_info(
+                "Connected to Redis (hiredis parser: {})", HIREDIS_AVAILABLE
+            )
     
     async def disconnect(self) -> None:
         """Disconnect from Redis."""
         if self._client:
             await self._client.close()
+            # The client does not own an explicitly passed pool
+            await self._client.connection_pool.disconnect()
             self._client = None
             self.log_info("Disconnected from Redis")
     
+    @property
+    def is_connected(self) -> bool:
+        """Whether connect() has succeeded."""
+        return self._client is not None
+    
     @property
     def client(self) -> redis.Redis:
         """Get Redis client."""
@@ -37,12 +68,19 @@ class RedisService(BaseService):
             raise RuntimeError("Redis not connected. Call connect() first.")
         return self._client
     
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncIterator[redis.client.Pipeline]:
+        """Buffer commands and send them in one round-trip on exit."""
+        async with self.client.pipeline(transaction=False) as pipe:
+            yield pipe
+            await pipe.execute()
+    
     async def get(self, key: str) -> Optional[str]:
         """Get value by key."""
         try:
             return await self.client.get(key)
         except Exception as e:
-            self.log_error(f"Redis GET error: {e}")
+            self.log_error("Redis GET error: {}", e)
             return None
     
     async def set(
@@ -53,13 +91,11 @@ class RedisService(BaseService):
     ) -> bool:
         """Set value with optional expiration (seconds)."""
         try:
-            if expire:
-                await self.client.setex(key, expire, value)
-            else:
-                await self.client.set(key, value)
+            # SET ... EX covers both cases; no expiry when expire is falsy
+            await self.client.set(key, value, ex=expire or None)
             return True
         except Exception as e:
-            self.log_error(f"Redis SET error: {e}")
+            self.log_error("Redis SET error: {}", e)
             return False
     
     async def delete(self, key: str) -> bool:
@@ -68,7 +104,16 @@ class RedisService(BaseService):
             await self.client.delete(key)
             return True
         except Exception as e:
-            self.log_error(f"Redis DELETE error: {e}")
+            self.log_error("Redis DELETE error: {}", e)
+            return False
+    
+    async def delete_many(self, *keys: str) -> bool:
+        """Delete several keys in one command."""
+        try:
+            await self.client.delete(*keys)
+            return True
+        except Exception as e:
+            self.log_error("Redis DELETE error: {}", e)
             return False
     
     async def exists(self, key: str) -> bool:
@@ -76,7 +121,7 @@ class RedisService(BaseService):
         try:
             return await self.client.exists(key) > 0
         except Exception as e:
-            self.log_error(f"Redis EXISTS error: {e}")
+            self.log_error("Redis EXISTS error: {}", e)
             return False
     
     async def get_json(self, key: str) -> Optional[Any]:
@@ -84,11 +129,28 @@ class RedisService(BaseService):
         value = await self.get(key)
         if value:
             try:
-                return json.loads(value)
-            except json.JSONDecodeError:
+                return orjson.loads(value)
+            except orjson.JSONDecodeError:
                 return None
         return None
-    
+
+    async def mget_json(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several JSON values in one MGET; misses come back as None."""
+        if not keys:
+            return []
+        try:
+            values = await self.client.mget(keys)
+        except Exception as e:
+            self.log_error("Redis MGET error: {}", e)
+            return [None] * len(keys)
+        results: List[Optional[Any]] = []
+        for value in values:
+            try:
+                results.append(orjson.loads(value) if value else None)
+            except orjson.JSONDecodeError:
+                results.append(None)
+        return results
+
     async def set_json(
         self,
         key: str,
@@ -97,10 +159,21 @@ class RedisService(BaseService):
     ) -> bool:
         """Set JSON value."""
         try:
-            json_str = json.dumps(value, default=str)
-            return await self.set(key, json_str, expire)
+            await self.client.set(key, _dumps(value), ex=expire or None)
+            return True
+        except Exception as e:
+            self.log_error("Redis SET JSON error: {}", e)
+            return False
+
+    async def set_many_json(self, items: Dict[str, Any], expire: int) -> bool:
+        """Set several JSON values with one TTL in a single round-trip."""
+        try:
+            async with self.pipeline() as pipe:
+                for key, value in items.items():
+                    pipe.setex(key, expire, _dumps(value))
+            return True
         except Exception as e:
-            self.log_error(f"Redis SET JSON error: {e}")
+            self.log_error("Redis pipeline error: {}", e)
             return False
     
     async def incr(self, key: str) -> int:
@@ -108,7 +181,7 @@ class RedisService(BaseService):
         try:
             return await self.client.incr(key)
         except Exception as e:
-            self.log_error(f"Redis INCR error: {e}")
+            self.log_error("Redis INCR error: {}", e)
             return 0
     
     async def lpush(self, key: str, *values: str) -> int:
@@ -116,7 +189,7 @@ class RedisService(BaseService):
         try:
             return await self.client.lpush(key, *values)
         except Exception as e:
-            self.log_error(f"Redis LPUSH error: {e}")
+            self.log_error("Redis LPUSH error: {}", e)
             return 0
     
     async def lrange(
@@ -129,15 +202,35 @@ class RedisService(BaseService):
         try:
             return await self.client.lrange(key, start, end)
         except Exception as e:
-            self.log_error(f"Redis LRANGE error: {e}")
+            self.log_error("Redis LRANGE error: {}", e)
             return []
     
+    async def bump_table_versions(self, tables: Iterable[str]) -> bool:
+        """Increment the version counters of tables that were written."""
+        try:
+            async with self.pipeline() as pipe:
+                for table in tables:
+                    pipe.incr(f"ver:{table}")
+            return True
+        except Exception as e:
+            self.log_error("Redis pipeline error: {}", e)
+            return False
+    
+    async def get_table_versions(self, tables: Sequence[str]) -> List[int]:
+        """Current version counters of tables, in one MGET (0 if unset)."""
+        try:
+            values = await self.client.mget([f"ver:{t}" for t in tables])
+        except Exception as e:
+            self.log_error("Redis MGET error: {}", e)
+            return [0] * len(tables)
+        return [int(value) if value else 0 for value in values]
+    
     async def publish(self, channel: str, message: str) -> int:
         """Publish message to channel."""
         try:
             return await self.client.publish(channel, message)
         except Exception as e:
-            self.log_error(f"Redis PUBLISH error: {e}")
+            self.log_error("Redis PUBLISH error: {}", e)
             return 0
     
     async def cache_analysis_result(
@@ -158,6 +251,30 @@ class RedisService(BaseService):
         key = f"analysis:{analysis_id}:result"
         return await self.get_json(key)
     
+    async def cache_analysis_summary(
+        self,
+        analysis_id: int,
+        entry: dict,
+        expire: int = 300
+    ) -> bool:
+        """Cache a live analysis summary and notify subscribers."""
+        key = f"analysis:{analysis_id}:summary"
+        try:
+            async with self.pipeline() as pipe:
+                pipe.setex(key, expire, _dumps(entry))
+                pipe.publish(key, "updated")
+            return True
+        except Exception as e:
+            self.log_error("Redis pipeline error: {}", e)
+            return False
+    
+    async def get_cached_analysis_summary(
+        self,
+        analysis_id: int
+    ) -> Optional[dict]:
+        """Get cached live analysis summary."""
+        return await self.get_json(f"analysis:{analysis_id}:summary")
+    
     async def set_analysis_progress(
         self,
         analysis_id: int,
@@ -169,6 +286,85 @@ class RedisService(BaseService):
         data = {"progress": progress, "status": status}
         return await self.set_json(key, data, expire=3600)
     
+    async def cache_analysis_completion(
+        self,
+        analysis_id: int,
+        result: dict,
+        expire: int = 3600
+    ) -> bool:
+        """Set final progress and cache the result in one round-trip."""
+        progress = {"progress": 100.0, "status": "completed"}
+        try:
+            async with self.pipeline() as pipe:
+                pipe.setex(
+                    f"analysis:{analysis_id}:progress",
+                    3600,
+                    _dumps(progress)
+                )
+                pipe.setex(
+                    f"analysis:{analysis_id}:result",
+                    expire,
+                    _dumps(result)
+                )
+            return True
+        except Exception as e:
+            self.log_error("Redis pipeline error: {}", e)
+            return False
+    
+    async def cache_token_user(
+        self,
+        token_key: str,
+        user_id: int,
+        data: dict,
+        expire: int
+    ) -> bool:
+        """Cache a token's user and track the key for invalidation."""
+        user_key = f"auth:user:{user_id}"
+        try:
+            async with self.pipeline() as pipe:
+                pipe.setex(token_key, expire, _dumps(data))
+                pipe.sadd(user_key, token_key)
+                pipe.expire(user_key, expire)
+            return True
+        except Exception as e:
+            self.log_error("Redis pipeline error: {}", e)
+            return False
+    
+    async def drop_token_users(self, user_id: int) -> bool:
+        """Drop every cached token snapshot of a user."""
+        user_key = f"auth:user:{user_id}"
+        try:
+            token_keys = await self.client.smembers(user_key)
+            await self.client.delete(user_key, *token_keys)
+            return True
+        except Exception as e:
+            self.log_error("Redis DEL error: {}", e)
+            return False
+    
+    async def acquire_lock(self, key: str, expire: int) -> Optional[str]:
+        """
+        Try to take a lock with SET NX EX; returns a token, or None if held.
+        
+        Fails open: on a Redis error a token is returned so callers proceed
+        rather than wait on a lock nobody can take.
+        """
+        token = secrets.token_hex(8)
+        try:
+            if await self.client.set(key, token, nx=True, ex=expire):
+                return token
+            return None
+        except Exception as e:
+            self.log_error("Redis SET NX error: {}", e)
+            return token
+    
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock taken with acquire_lock."""
+        try:
+            return bool(await self.client.eval(_RELEASE_LOCK, 1, key, token))
+        except Exception as e:
+            self.log_error("Redis EVAL error: {}", e)
+            return False
+    
     async def get_analysis_progress(
         self,
         analysis_id: int
@@ -1,21 +1,85 @@
+from collections import Counter
+from hashlib import blake2b
+from itertools import chain
 from typing import Optional, Dict, Any, List
-from celery import current_task
-from sqlalchemy import create_engine
+from celery import chord, current_task
+from sqlalchemy import (
+    bindparam, create_engine, delete, event, func, insert, select, update
+)
 from sqlalchemy.orm import sessionmaker, Session
 import asyncio
+import secrets
+import time
+import orjson
+import redis
 
 from app.services.celery_app import celery_app
 from app.core.config import settings
+from app.database import JSON_CODECS, pop_written_tables
 from app.services.brain_service import brain_service, BrainServiceError
 from loguru import logger
 
 # Create sync engine for Celery tasks
 sync_engine = create_engine(
     settings.DATABASE_SYNC_URL,
-    pool_pre_ping=True
+    pool_pre_ping=True,
+    **JSON_CODECS
 )
 SyncSessionLocal = sessionmaker(bind=sync_engine, autocommit=False, autoflush=False)
 
+# Sync client for bumping table versions from worker commits
+_redis: Optional[redis.Redis] = None
+
+
+def _get_redis() -> redis.Redis:
+    """Lazily create the worker's sync Redis client."""
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis
+
+
+@event.listens_for(SyncSessionLocal, "after_commit")
+def _bump_table_versions(session: Session) -> None:
+    """Invalidate caches keyed on the versions of the committed tables."""
+    tables = pop_written_tables(session)
+    if not tables:
+        return
+    try:
+        pipe = _get_redis().pipeline(transaction=False)
+        for table in tables:
+            pipe.incr(f"ver:{table}")
+        pipe.execute()
+    except Exception as e:
+        logger.error("Redis pipeline error: {}", e)
+
+
+# Posts per analyze_chunk task; chunks of one analysis run in parallel
+ANALYSIS_CHUNK_SIZE = 500
+
+DEFAULT_ANALYSIS_CONFIG = {
+    "sentiment_enabled": True,
+    "emotion_enabled": True,
+    "keyword_extraction_enabled": True,
+}
+
+# An identical analysis reuses a completed one's results for this long
+ANALYSIS_MEMO_TTL = 3600
+
+
+def _analysis_fingerprint(
+    filters: Dict[str, Any],
+    config: Dict[str, Any],
+    post_count: Optional[int],
+    latest_post_id: Optional[int]
+) -> str:
+    """Stable hash of everything that determines an analysis' results."""
+    payload = orjson.dumps(
+        [filters, config, post_count, latest_post_id],
+        option=orjson.OPT_SORT_KEYS
+    )
+    return blake2b(payload, digest_size=16).hexdigest()
+
 
 def get_sync_db() -> Session:
     """Get synchronous database session for Celery tasks."""
@@ -30,9 +94,24 @@ def run_async(coro):
     try:
         return loop.run_until_complete(coro)
     finally:
+        # The BRAIN client is bound to this loop; drop it before closing
+        loop.run_until_complete(brain_service.close())
         loop.close()
 
 
+def _fail_analysis(db: Session, analysis_id: int, message: str) -> None:
+    """Mark an analysis failed, discarding any pending changes first."""
+    from app.models.analysis import Analysis, AnalysisStatus
+    
+    db.rollback()
+    db.execute(
+        update(Analysis)
+        .where(Analysis.id == analysis_id)
+        .values(status=AnalysisStatus.FAILED, error_message=message)
+    )
+    db.commit()
+
+
 @celery_app.task(bind=True, name="app.services.tasks.process_analysis")
 def process_analysis(
     self,
@@ -40,7 +119,11 @@ def process_analysis(
     config: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
-    Process an analysis job.
+    Start an analysis job.
+    
+    Splits the matching posts into chunks of ANALYSIS_CHUNK_SIZE and fans
+    them out as `analyze_chunk` tasks, so one analysis spreads across all
+    analysis workers; `finalize_analysis` runs once every chunk is stored.
     """
     logger.info(f"Starting analysis task for analysis_id={analysis_id}")
     
@@ -49,25 +132,53 @@ def process_analysis(
     try:
         from app.models.analysis import Analysis, AnalysisStatus
         from app.models.post import Post
-        from app.models.analysis_result import AnalysisResult
-        from datetime import datetime
+        from datetime import datetime, timezone
+        
+        # Claim the analysis; a redelivered task (late acks) finds it
+        # already claimed and must not fan out its chunks a second time
+        claimed = db.execute(
+            update(Analysis)
+            .where(
+                Analysis.id == analysis_id,
+                Analysis.status.in_(
+                    [AnalysisStatus.PENDING, AnalysisStatus.QUEUED]
+                )
+            )
+            .values(
+                status=AnalysisStatus.PROCESSING,
+                started_at=datetime.now(timezone.utc),
+                progress=0.0
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
         
-        # Get analysis
         analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
         if not analysis:
             logger.error(f"Analysis {analysis_id} not found")
             return {"status": "error", "message": "Analysis not found"}
+        if not claimed:
+            logger.info(
+                f"Analysis {analysis_id} already {analysis.status.value}, skipping"
+            )
+            return {"status": "skipped", "analysis_id": analysis_id}
         
-        # Update status to processing
-        analysis.status = AnalysisStatus.PROCESSING
-        analysis.started_at = datetime.utcnow().isoformat()
-        analysis.progress = 0.0
-        db.commit()
+        # New posts change the latest id, so stale results are never reused
+        filters = analysis.query_filters or {}
+        fingerprint = _analysis_fingerprint(
+            filters,
+            config or DEFAULT_ANALYSIS_CONFIG,
+            analysis.post_count,
+            db.scalar(select(func.max(Post.id)))
+        )
+        cloned = _reuse_prior_results(db, analysis_id, fingerprint)
+        if cloned:
+            finalize_analysis.delay([{"stored": cloned}], analysis_id)
+            return {"status": "reused", "analysis_id": analysis_id}
         
-        # Get posts based on filters
-        query = db.query(Post)
+        # Get ids of posts matching the filters; chunks load their own rows
+        query = db.query(Post.id)
         
-        filters = analysis.query_filters or {}
         if filters.get("platform"):
             query = query.filter(Post.platform == filters["platform"])
         if filters.get("language"):
@@ -76,118 +187,234 @@ def process_analysis(
             query = query.filter(Post.data_source_id == filters["data_source_id"])
         
         limit = analysis.post_count or 1000
-        posts = query.limit(limit).all()
+        post_ids = [row[0] for row in query.limit(limit)]
         
-        if not posts:
+        if not post_ids:
             analysis.status = AnalysisStatus.FAILED
             analysis.error_message = "No posts found matching filters"
             db.commit()
             return {"status": "error", "message": "No posts found"}
         
-        # Update progress
-        self.update_state(state="PROGRESS", meta={"progress": 10})
-        analysis.progress = 10.0
-        db.commit()
-        
-        # Prepare posts data for BRAIN
-        posts_data = [
-            {
-                "id": str(p.id),
-                "content": p.content or "",
-                "platform": p.platform,
-                "posted_at": p.posted_at.isoformat() if p.posted_at else None
-            }
-            for p in posts
+        chunks = [
+            post_ids[i:i + ANALYSIS_CHUNK_SIZE]
+            for i in range(0, len(post_ids), ANALYSIS_CHUNK_SIZE)
         ]
+        chord([
+            analyze_chunk.s(analysis_id, chunk, config, len(post_ids))
+            for chunk in chunks
+        ])(finalize_analysis.s(analysis_id))
+        
+        logger.info(f"Analysis {analysis_id} split into {len(chunks)} chunks")
+        return {
+            "status": "queued",
+            "analysis_id": analysis_id,
+            "chunks": len(chunks)
+        }
+        
+    except Exception as e:
+        logger.error(f"Analysis task error: {str(e)}")
+        try:
+            _fail_analysis(db, analysis_id, str(e))
+        except Exception:
+            pass
+        return {"status": "error", "message": str(e)}
+    
+    finally:
+        db.close()
+
+
+def _reuse_prior_results(db: Session, analysis_id: int, fingerprint: str) -> int:
+    """
+    Copy the results of a completed identical analysis, if one is known.
+    
+    Returns the number of cloned results; 0 means analyze from scratch, in
+    which case the fingerprint is kept for `finalize_analysis` to publish.
+    """
+    from app.crud.crud_analysis_result import clone_results_query
+    
+    try:
+        client = _get_redis()
+        source_id = client.get(f"analysis:fp:{fingerprint}")
+        if source_id is not None and int(source_id) != analysis_id:
+            cloned = db.execute(
+                clone_results_query(int(source_id), analysis_id)
+            ).rowcount
+            if cloned:
+                db.commit()
+                logger.info(
+                    f"Analysis {analysis_id} reused {cloned} results "
+                    f"of analysis {source_id}"
+                )
+                return cloned
+        client.set(
+            f"analysis:{analysis_id}:fingerprint",
+            fingerprint,
+            ex=ANALYSIS_MEMO_TTL
+        )
+    except redis.RedisError as e:
+        # Memoization is an optimization; never fail the analysis over it
+        logger.warning(f"Analysis memo unavailable: {e}")
+    return 0
+
+
+@celery_app.task(bind=True, name="app.services.tasks.analyze_chunk")
+def analyze_chunk(
+    self,
+    analysis_id: int,
+    post_ids: List[int],
+    config: Optional[Dict[str, Any]],
+    total_posts: int
+) -> Dict[str, Any]:
+    """Analyze one chunk of an analysis's posts with BRAIN and store the results."""
+    db = get_sync_db()
+    
+    try:
+        from app.models.analysis import Analysis, AnalysisStatus
+        from app.models.post import Post
+        from app.models.analysis_result import AnalysisResult
+        
+        # A failed sibling chunk or a cancel stops the remaining chunks
+        status = db.query(Analysis.status).filter(
+            Analysis.id == analysis_id
+        ).scalar()
+        if status != AnalysisStatus.PROCESSING:
+            return {"status": "skipped", "stored": 0}
+        
+        posts = db.query(Post.id, Post.content).filter(
+            Post.id.in_(post_ids)
+        ).all()
         
-        # Analyze with BRAIN service
         try:
-            analysis_config = config or {
-                "sentiment_enabled": True,
-                "emotion_enabled": True,
-                "keyword_extraction_enabled": True,
-            }
-            
-            # Run async BRAIN call
             results = run_async(
                 brain_service.analyze_text(
-                    texts=[p["content"] for p in posts_data],
-                    text_ids=[p["id"] for p in posts_data],
+                    texts=[p.content or "" for p in posts],
+                    text_ids=[str(p.id) for p in posts],
                     analysis_types=["sentiment", "emotion", "keywords"],
-                    config=analysis_config
+                    config=config or DEFAULT_ANALYSIS_CONFIG
                 )
             )
-            
-            # Update progress
-            self.update_state(state="PROGRESS", meta={"progress": 50})
-            analysis.progress = 50.0
-            db.commit()
-            
-            # Store results
-            for i, result in enumerate(results):
-                post_id = int(result.text_id)
-                
-                analysis_result = AnalysisResult(
-                    post_id=post_id,
-                    analysis_id=analysis_id,
-                    sentiment_label=result.sentiment.get("label") if result.sentiment else None,
-                    sentiment_score=result.sentiment.get("score") if result.sentiment else None,
-                    sentiment_confidence=result.sentiment.get("confidence") if result.sentiment else None,
-                    emotions=result.emotions,
-                    dominant_emotion=max(result.emotions, key=result.emotions.get) if result.emotions else None,
-                    keywords=result.keywords,
-                    entities=result.entities,
-                    summary=result.summary,
-                    raw_results=result.model_dump()
-                )
-                db.add(analysis_result)
-                
-                # Mark post as processed
-                post = db.query(Post).filter(Post.id == post_id).first()
-                if post:
-                    post.is_processed = True
-                
-                # Update progress periodically
-                if i % 100 == 0:
-                    progress = 50 + (i / len(results)) * 40
-                    self.update_state(state="PROGRESS", meta={"progress": progress})
-                    analysis.progress = progress
-                    db.commit()
-            
-            db.commit()
-            
-            # Generate summary
-            summary = generate_analysis_summary(db, analysis_id)
-            
-            # Complete analysis
-            analysis.status = AnalysisStatus.COMPLETED
-            analysis.progress = 100.0
-            analysis.completed_at = datetime.utcnow().isoformat()
-            analysis.summary = summary
-            db.commit()
-            
-            logger.info(f"Analysis {analysis_id} completed successfully")
-            return {
-                "status": "completed",
-                "analysis_id": analysis_id,
-                "results_count": len(results)
-            }
-            
         except BrainServiceError as e:
             logger.error(f"BRAIN service error: {e.message}")
-            analysis.status = AnalysisStatus.FAILED
-            analysis.error_message = f"BRAIN service error: {e.message}"
-            db.commit()
+            _fail_analysis(db, analysis_id, f"BRAIN service error: {e.message}")
             return {"status": "error", "message": e.message}
         
+        # Late acks can redeliver a chunk; drop what an earlier attempt stored
+        db.execute(
+            delete(AnalysisResult).where(
+                AnalysisResult.analysis_id == analysis_id,
+                AnalysisResult.post_id.in_(post_ids)
+            )
+        )
+        rows = [
+            {
+                "post_id": int(result.text_id),
+                "analysis_id": analysis_id,
+                "sentiment_label": result.sentiment.get("label") if result.sentiment else None,
+                "sentiment_score": result.sentiment.get("score") if result.sentiment else None,
+                "sentiment_confidence": result.sentiment.get("confidence") if result.sentiment else None,
+                "emotions": result.emotions,
+                "dominant_emotion": max(result.emotions, key=result.emotions.get) if result.emotions else None,
+                "keywords": result.keywords,
+                "entities": result.entities,
+                "summary": result.summary,
+                "raw_results": result.model_dump()
+            }
+            for result in results
+        ]
+        if rows:
+            db.execute(insert(AnalysisResult), rows)
+            db.execute(
+                update(Post)
+                .where(Post.id.in_({row["post_id"] for row in rows}))
+                .values(is_processed=True)
+                .execution_options(synchronize_session=False)
+            )
+        
+        # Progress is recomputed from the stored results, so a redelivered
+        # chunk cannot count twice; GREATEST keeps it monotonic when chunks
+        # commit concurrently. Chunks cover 0-90%, finalize_analysis sets 100%
+        stored = (
+            select(func.count(AnalysisResult.id))
+            .where(AnalysisResult.analysis_id == analysis_id)
+            .scalar_subquery()
+        )
+        db.execute(
+            update(Analysis)
+            .where(Analysis.id == analysis_id)
+            .values(
+                progress=func.greatest(
+                    Analysis.progress,
+                    func.least(90.0 * stored / total_posts, 90.0)
+                )
+            )
+        )
+        db.commit()
+        
+        return {"status": "completed", "stored": len(rows)}
+        
     except Exception as e:
-        logger.error(f"Analysis task error: {str(e)}")
+        logger.error(f"Analysis chunk error: {str(e)}")
         try:
-            analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
-            if analysis:
-                analysis.status = AnalysisStatus.FAILED
-                analysis.error_message = str(e)
-                db.commit()
+            _fail_analysis(db, analysis_id, str(e))
+        except Exception:
+            pass
+        return {"status": "error", "message": str(e)}
+    
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True, name="app.services.tasks.finalize_analysis")
+def finalize_analysis(
+    self,
+    chunk_results: List[Dict[str, Any]],
+    analysis_id: int
+) -> Dict[str, Any]:
+    """Summarize and complete an analysis once all its chunks are stored."""
+    db = get_sync_db()
+    
+    try:
+        from app.models.analysis import Analysis, AnalysisStatus
+        from datetime import datetime, timezone
+        
+        analysis = db.query(Analysis).filter(Analysis.id == analysis_id).first()
+        if not analysis or analysis.status != AnalysisStatus.PROCESSING:
+            return {"status": "skipped", "analysis_id": analysis_id}
+        
+        # Generate summary
+        summary = generate_analysis_summary(db, analysis_id)
+        
+        # Complete analysis
+        analysis.status = AnalysisStatus.COMPLETED
+        analysis.progress = 100.0
+        analysis.completed_at = datetime.now(timezone.utc)
+        analysis.summary = summary
+        db.commit()
+        
+        # Let later analyses with the same fingerprint reuse these results
+        try:
+            client = _get_redis()
+            fingerprint = client.get(f"analysis:{analysis_id}:fingerprint")
+            if fingerprint:
+                client.set(
+                    f"analysis:fp:{fingerprint}",
+                    analysis_id,
+                    ex=ANALYSIS_MEMO_TTL
+                )
+        except redis.RedisError as e:
+            logger.warning(f"Analysis memo unavailable: {e}")
+        
+        logger.info(f"Analysis {analysis_id} completed successfully")
+        return {
+            "status": "completed",
+            "analysis_id": analysis_id,
+            "results_count": sum(r.get("stored", 0) for r in chunk_results)
+        }
+        
+    except Exception as e:
+        logger.error(f"Analysis finalize error: {str(e)}")
+        try:
+            _fail_analysis(db, analysis_id, str(e))
         except Exception:
             pass
         return {"status": "error", "message": str(e)}
@@ -201,10 +428,13 @@ def generate_analysis_summary(db: Session, analysis_id: int) -> Dict[str, Any]:
     from app.models.analysis_result import AnalysisResult
     from sqlalchemy import func
     
-    # Count results
-    total = db.query(func.count(AnalysisResult.id)).filter(
+    # Count results and average sentiment in one pass
+    total, avg_sentiment = db.query(
+        func.count(AnalysisResult.id),
+        func.avg(AnalysisResult.sentiment_score)
+    ).filter(
         AnalysisResult.analysis_id == analysis_id
-    ).scalar() or 0
+    ).one()
     
     # Sentiment distribution
     sentiment_query = db.query(
@@ -228,27 +458,16 @@ def generate_analysis_summary(db: Session, analysis_id: int) -> Dict[str, Any]:
     
     emotion_dist = {row[0]: row[1] for row in emotion_query}
     
-    # Average sentiment
-    avg_sentiment = db.query(func.avg(AnalysisResult.sentiment_score)).filter(
-        AnalysisResult.analysis_id == analysis_id
-    ).scalar()
-    
     # Top keywords
     results = db.query(AnalysisResult.keywords).filter(
         AnalysisResult.analysis_id == analysis_id,
         AnalysisResult.keywords.isnot(None)
     ).all()
     
-    keyword_counts = {}
-    for row in results:
-        for kw in (row[0] or []):
-            keyword_counts[kw] = keyword_counts.get(kw, 0) + 1
-    
-    top_keywords = sorted(
-        keyword_counts.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:20]
+    keyword_counts = Counter(
+        chain.from_iterable(row[0] for row in results if row[0])
+    )
+    top_keywords = keyword_counts.most_common(20)
     
     return {
         "total_posts": total,
@@ -273,9 +492,9 @@ def detect_trends(
     try:
         from app.models.post import Post
         from app.models.trend import Trend
-        from datetime import datetime, timedelta
+        from datetime import datetime, timedelta, timezone
         
-        since = datetime.utcnow() - timedelta(hours=hours)
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
         
         # Get recent posts
         posts = db.query(Post).filter(
@@ -309,7 +528,6 @@ def detect_trends(
             
             if existing:
                 existing.volume = count
-                existing.updated_at = datetime.utcnow()
             else:
                 trend = Trend(
                     name=f"#{tag}",
@@ -350,9 +568,9 @@ def update_trend_status_periodic():
     try:
         from app.models.trend import Trend
         from app.models.post import Post
-        from datetime import datetime, timedelta
+        from datetime import datetime, timedelta, timezone
         
-        since = datetime.utcnow() - timedelta(hours=6)
+        since = datetime.now(timezone.utc) - timedelta(hours=6)
         
         active_trends = db.query(Trend).filter(
             Trend.is_active == "active"
@@ -493,9 +711,9 @@ def cleanup_old_results():
     
     try:
         from app.models.analysis_result import AnalysisResult
-        from datetime import datetime, timedelta
+        from datetime import datetime, timedelta, timezone
         
-        cutoff = datetime.utcnow() - timedelta(days=30)
+        cutoff = datetime.now(timezone.utc) - timedelta(days=30)
         
         deleted = db.query(AnalysisResult).filter(
             AnalysisResult.created_at < cutoff
@@ -514,6 +732,59 @@ def cleanup_old_results():
         db.close()
 
 
+def _cached_graph_result(db: Session, kind: str, compute) -> Any:
+    """
+    Sync counterpart of GraphService._brain_graph_result for workers.
+    
+    Shares its cache and lock keys, so a PageRank run from a worker and one
+    from the API coalesce into a single BRAIN call per graph signature.
+    """
+    from app.crud.crud_graph import GRAPH_SIGNATURE_QUERY
+    from app.services.graph_service import (
+        GRAPH_LOCK_MAX_POLL, GRAPH_LOCK_TTL, GRAPH_RESULT_TTL
+    )
+    from app.services.redis_service import _RELEASE_LOCK
+    
+    signature = ":".join(
+        str(value or 0) for value in db.execute(GRAPH_SIGNATURE_QUERY).one()
+    )
+    cache_key = f"brain:{kind}:{signature}"
+    lock_key = f"lock:brain:{kind}:{signature}"
+    
+    client = _get_redis()
+    token = secrets.token_hex(8)
+    delay = 0.1
+    deadline = time.monotonic() + GRAPH_LOCK_TTL
+    try:
+        while True:
+            cached = client.get(cache_key)
+            if cached is not None:
+                return orjson.loads(cached)
+            if client.set(lock_key, token, nx=True, ex=GRAPH_LOCK_TTL):
+                break
+            if time.monotonic() > deadline:
+                raise BrainServiceError(f"{kind} is still being computed")
+            # Hand the connection back to the pool while waiting
+            db.commit()
+            time.sleep(delay)
+            delay = min(delay * 2, GRAPH_LOCK_MAX_POLL)
+    except redis.RedisError as e:
+        # Fail open like acquire_lock: compute rather than wait forever
+        logger.error(f"Redis lock error: {e}")
+        return compute()
+    
+    try:
+        result = compute()
+        if result is not None:
+            client.set(cache_key, orjson.dumps(result), ex=GRAPH_RESULT_TTL)
+        return result
+    finally:
+        try:
+            client.eval(_RELEASE_LOCK, 1, lock_key, token)
+        except redis.RedisError as e:
+            logger.error(f"Redis lock error: {e}")
+
+
 @celery_app.task(bind=True, name="app.services.tasks.calculate_pagerank")
 def calculate_pagerank(self) -> Dict[str, Any]:
     """Calculate PageRank for graph nodes."""
@@ -524,40 +795,57 @@ def calculate_pagerank(self) -> Dict[str, Any]:
     try:
         from app.models.graph import GraphNode, GraphEdge
         
-        nodes = db.query(GraphNode).all()
-        edges = db.query(GraphEdge).all()
+        def compute():
+            node_ids = {}
+            nodes_data = []
+            for id_, node_id, node_type in db.query(
+                GraphNode.id, GraphNode.node_id, GraphNode.node_type
+            ):
+                node_ids[id_] = node_id
+                nodes_data.append({"id": node_id, "type": node_type})
+            # Skip edges whose endpoints were deleted since the node read
+            edges_data = [
+                {
+                    "source": node_ids[source_id],
+                    "target": node_ids[target_id],
+                    "weight": weight
+                }
+                for source_id, target_id, weight in db.query(
+                    GraphEdge.source_id, GraphEdge.target_id, GraphEdge.weight
+                )
+                if source_id in node_ids and target_id in node_ids
+            ]
+            if not nodes_data or not edges_data:
+                return None
+            
+            # Call BRAIN service
+            return run_async(
+                brain_service.calculate_pagerank(
+                    nodes=nodes_data,
+                    edges=edges_data
+                )
+            )
         
-        if not nodes or not edges:
+        results = _cached_graph_result(db, "pagerank", compute)
+        if results is None:
             return {"status": "no_data"}
         
-        # Prepare data for BRAIN
-        nodes_data = [{"id": n.node_id, "type": n.node_type} for n in nodes]
-        edges_data = [
-            {
-                "source": db.query(GraphNode).get(e.source_id).node_id,
-                "target": db.query(GraphNode).get(e.target_id).node_id,
-                "weight": e.weight
-            }
-            for e in edges
-        ]
-        
-        # Call BRAIN service
-        results = run_async(
-            brain_service.calculate_pagerank(
-                nodes=nodes_data,
-                edges=edges_data
-            )
-        )
-        
-        # Update nodes
+        # Update nodes in one executemany instead of a load per node
         updated = 0
-        for result in results:
-            node = db.query(GraphNode).filter(
-                GraphNode.node_id == result["id"]
-            ).first()
-            if node:
-                node.pagerank = result.get("pagerank", 0)
-                updated += 1
+        if results:
+            nodes_table = GraphNode.__table__
+            updated = db.execute(
+                update(nodes_table)
+                .where(nodes_table.c.node_id == bindparam("b_node_id"))
+                .values(pagerank=bindparam("b_pagerank")),
+                [
+                    {
+                        "b_node_id": result["id"],
+                        "b_pagerank": result.get("pagerank", 0)
+                    }
+                    for result in results
+                ]
+            ).rowcount
         
         db.commit()
         
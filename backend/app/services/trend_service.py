@@ -1,5 +1,5 @@
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
@@ -10,6 +10,7 @@ from app.crud import post as post_crud
 from app.crud import analysis_result as result_crud
 from app.models.post import Post
 from app.schemas.trend import TrendCreate
+from app.utils.datetime import utc_now
 
 
 class TrendService(BaseService):
@@ -28,7 +29,7 @@ class TrendService(BaseService):
     ) -> List[Dict[str, Any]]:
         """Detect trends from recent posts."""
         # Get recent posts
-        since = datetime.utcnow() - timedelta(hours=hours)
+        since = utc_now() - timedelta(hours=hours)
         
         query = (
             select(Post)
@@ -79,11 +80,11 @@ class TrendService(BaseService):
                 stored_trend = await trend_crud.create(db, obj_in=trend_in)
                 stored_trends.append(stored_trend)
             
-            self.log_info(f"Detected and stored {len(stored_trends)} trends")
+            self.log_info("Detected and stored {} trends", len(stored_trends))
             return stored_trends
             
         except BrainServiceError as e:
-            self.log_error(f"Trend detection failed: {e.message}")
+            self.log_error("Trend detection failed: {}", e.message)
             return await self._fallback_trend_detection(db, posts, min_count)
     
     async def _fallback_trend_detection(
@@ -131,7 +132,7 @@ class TrendService(BaseService):
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """Get trending hashtags from recent posts."""
-        since = datetime.utcnow() - timedelta(hours=hours)
+        since = utc_now() - timedelta(hours=hours)
         
         # Aggregate hashtags from posts
         query = (
@@ -169,7 +170,7 @@ class TrendService(BaseService):
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """Get trending keywords from analysis results."""
-        since = datetime.utcnow() - timedelta(hours=hours)
+        since = utc_now() - timedelta(hours=hours)
         
         # Get recent analysis results
         from app.models.analysis_result import AnalysisResult
@@ -208,7 +209,7 @@ class TrendService(BaseService):
         interval: str = "1h"
     ) -> List[Dict[str, Any]]:
         """Get sentiment trends over time."""
-        since = datetime.utcnow() - timedelta(hours=hours)
+        since = utc_now() - timedelta(hours=hours)
         
         from app.models.analysis_result import AnalysisResult
         
@@ -268,7 +269,7 @@ class TrendService(BaseService):
         platform: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Get post volume trends over time."""
-        since = datetime.utcnow() - timedelta(hours=hours)
+        since = utc_now() - timedelta(hours=hours)
         
         query = (
             select(Post.posted_at, Post.platform)
@@ -69,6 +69,8 @@ from app.utils.json import (
     json_dumps,
     json_loads,
     orjson_dumps,
+    orjson_dumps_db,
+    orjson_dumps_str,
     orjson_loads,
     safe_json_loads,
     merge_json,
@@ -134,6 +136,8 @@ __all__ = [
     "json_dumps",
     "json_loads",
     "orjson_dumps",
+    "orjson_dumps_db",
+    "orjson_dumps_str",
     "orjson_loads",
     "safe_json_loads",
     "merge_json",
@@ -43,6 +43,23 @@ def orjson_dumps(obj: Any) -> bytes:
     )
 
 
+def orjson_dumps_db(obj: Any) -> bytes:
+    """orjson serialization as bytes, for the database JSON serializer."""
+    return orjson.dumps(
+        obj,
+        option=(
+            orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_UTC_Z
+            | orjson.OPT_NON_STR_KEYS
+        )
+    )
+
+
+def orjson_dumps_str(obj: Any) -> str:
+    """orjson serialization as str, for the database JSON serializer."""
+    return orjson_dumps_db(obj).decode()
+
+
 def orjson_loads(data: bytes | str) -> Any:
     """Fast JSON deserialization using orjson."""
     return orjson.loads(data)
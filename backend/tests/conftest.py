@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 from sqlalchemy.pool import NullPool
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, JSON_CODECS
 from app.core.config import settings
 from app.core.security import hash_password
 from app.models.user import User, UserRole
@@ -20,6 +20,7 @@ test_engine = create_async_engine(
     TEST_DATABASE_URL,
     echo=False,
     poolclass=NullPool,
+    **JSON_CODECS,
 )
 
 # Create test session factory
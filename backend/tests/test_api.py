@@ -217,6 +217,49 @@ class TestAnalysisEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert data["name"] == "Test Analysis"
+    
+    @pytest.mark.asyncio
+    async def test_start_queued_analysis_after_failed_enqueue(
+        self, client: AsyncClient, analyst_auth_headers: dict, db_session,
+        monkeypatch
+    ):
+        """Test a QUEUED analysis restarts and a failed enqueue resets it."""
+        import importlib
+        from sqlalchemy import select, update
+        from app.models.analysis import Analysis, AnalysisStatus
+        from tests.conftest import TestSessionLocal
+        
+        endpoint = importlib.import_module("app.api.v1.endpoints.analysis")
+        
+        def delay(*args):
+            raise ConnectionError("broker down")
+        
+        monkeypatch.setattr(endpoint.process_analysis, "delay", delay)
+        monkeypatch.setattr(endpoint, "AsyncSessionLocal", TestSessionLocal)
+        
+        response = await client.post(
+            "/api/v1/analysis",
+            headers=analyst_auth_headers,
+            json={"name": "Lost task", "analysis_type": "sentiment"}
+        )
+        analysis_id = response.json()["id"]
+        await db_session.execute(
+            update(Analysis)
+            .where(Analysis.id == analysis_id)
+            .values(status=AnalysisStatus.QUEUED)
+        )
+        await db_session.commit()
+        
+        response = await client.post(
+            f"/api/v1/analysis/{analysis_id}/start",
+            headers=analyst_auth_headers
+        )
+        
+        assert response.status_code == 200
+        result = await db_session.execute(
+            select(Analysis.status).where(Analysis.id == analysis_id)
+        )
+        assert result.scalar_one() == AnalysisStatus.PENDING
 
 
 class TestTrendEndpoints:
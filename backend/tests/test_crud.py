@@ -1,15 +1,28 @@
+from functools import partial
+
+import orjson
 import pytest
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud import user as user_crud
 from app.crud import post as post_crud
 from app.crud import author as author_crud
 from app.crud import data_source as data_source_crud
+from app.crud import analysis_result as result_crud
+from app.crud import graph_node as node_crud
+from app.crud import graph_edge as edge_crud
+from app.crud.base import gather_reads
+from app.database import pop_written_tables
 from app.schemas.user import UserCreate, UserUpdate
 from app.schemas.post import PostCreate, PostFilter
 from app.schemas.author import AuthorCreate
 from app.schemas.data_source import DataSourceCreate
+from app.schemas.analysis_result import AnalysisResultCreate
+from app.schemas.graph import GraphNodeCreate, GraphEdgeCreate
 from app.models.user import UserRole
+from app.models.post import Post
+from app.models.graph import GraphNode
 from app.models.data_source import SourcePlatform
 
 
@@ -31,6 +44,36 @@ class TestUserCRUD:
         assert user.email == "crud@example.com"
         assert user.username == "cruduser"
     
+    @pytest.mark.asyncio
+    async def test_create_user_conflict(self, db_session: AsyncSession, test_user):
+        """Test creating a user with a taken email returns None."""
+        user_in = UserCreate(
+            email=test_user.email.upper(),
+            username="otheruser",
+            password="OtherPass123!"
+        )
+        user = await user_crud.create(db_session, obj_in=user_in)
+        
+        assert user is None
+    
+    @pytest.mark.asyncio
+    async def test_find_conflicts(self, db_session: AsyncSession, test_user):
+        """Test detecting taken emails and usernames in one query."""
+        conflicts = await user_crud.find_conflicts(
+            db_session, email=test_user.email, username="freename"
+        )
+        assert conflicts == {"email"}
+        
+        conflicts = await user_crud.find_conflicts(
+            db_session, email="free@example.com", username=test_user.username
+        )
+        assert conflicts == {"username"}
+        
+        conflicts = await user_crud.find_conflicts(
+            db_session, email="free@example.com", username="freename"
+        )
+        assert conflicts == set()
+    
     @pytest.mark.asyncio
     async def test_get_user(self, db_session: AsyncSession, test_user):
         """Test getting user by ID."""
@@ -47,6 +90,30 @@ class TestUserCRUD:
         assert user is not None
         assert user.email == test_user.email
     
+    @pytest.mark.asyncio
+    async def test_get_by_email_memoized_per_session(
+        self, db_session: AsyncSession, test_user
+    ):
+        """Test repeated lookups in one session are served without a query."""
+        first = await user_crud.get_by_email(db_session, email=test_user.email)
+        
+        statements = []
+        listen_target = db_session.get_bind()
+        
+        def count(*args):
+            statements.append(args)
+        
+        event.listen(listen_target, "before_cursor_execute", count)
+        try:
+            again = await user_crud.get_by_username(
+                db_session, username=test_user.username
+            )
+        finally:
+            event.remove(listen_target, "before_cursor_execute", count)
+        
+        assert again is first
+        assert statements == []
+    
     @pytest.mark.asyncio
     async def test_get_by_username(self, db_session: AsyncSession, test_user):
         """Test getting user by username."""
@@ -76,6 +143,130 @@ class TestUserCRUD:
         assert user is not None
         assert user.username == "authuser"
     
+    @pytest.mark.asyncio
+    async def test_cached_user_omits_password_hash(self, test_user):
+        """Test cache entries never carry the password hash."""
+        data = user_crud.dump_cached(test_user)
+        
+        assert "hashed_password" not in data
+        assert data["username"] == test_user.username
+    
+    @pytest.mark.asyncio
+    async def test_authenticate_after_cached_load(self, test_user):
+        """Test a cache-loaded user in the session still authenticates."""
+        from tests.conftest import TestSessionLocal
+        
+        async with TestSessionLocal() as session:
+            data = orjson.loads(orjson.dumps(user_crud.dump_cached(test_user)))
+            await user_crud.load_cached(session, data)
+            user = await user_crud.authenticate(
+                session,
+                identifier=test_user.username,
+                password="TestPass123!"
+            )
+        
+        assert user is not None
+        assert user.id == test_user.id
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_cache_after_commit(
+        self, db_session: AsyncSession, test_user
+    ):
+        """Test cache invalidation waits for the commit."""
+        db_session.info.pop("after_commit", None)
+        await user_crud.deactivate(db_session, user=test_user)
+        
+        assert len(db_session.info.pop("after_commit")) == 1
+    
+    @pytest.mark.asyncio
+    async def test_token_user_snapshot(
+        self, db_session: AsyncSession, test_user, monkeypatch
+    ):
+        """Test token snapshots are short-lived and carry no password hash."""
+        from app.core.security import create_access_token
+        from app.services.auth_service import auth_service, TOKEN_USER_CACHE_TTL
+        from app.services.redis_service import RedisService, redis_service
+        
+        cached = []
+        
+        async def get_json(key):
+            return None
+        
+        async def cache_token_user(token_key, user_id, data, expire):
+            cached.append((user_id, data, expire))
+            return True
+        
+        monkeypatch.setattr(RedisService, "is_connected", True)
+        monkeypatch.setattr(redis_service, "get_json", get_json)
+        monkeypatch.setattr(redis_service, "cache_token_user", cache_token_user)
+        
+        user = await auth_service.get_token_user(
+            db_session, token=create_access_token(str(test_user.id))
+        )
+        
+        assert user.id == test_user.id
+        [(user_id, data, expire)] = cached
+        assert user_id == test_user.id
+        assert "hashed_password" not in data
+        assert 0 < expire <= TOKEN_USER_CACHE_TTL
+    
+    @pytest.mark.asyncio
+    async def test_deleted_user_token_rejected(self, test_user, monkeypatch):
+        """Test a deleted user's cached access token stops authenticating."""
+        from app import database
+        from app.core.security import create_access_token
+        from app.services.auth_service import auth_service
+        from app.services.redis_service import RedisService, redis_service
+        from tests.conftest import TestSessionLocal
+        
+        store = {}
+        
+        async def get_json(key):
+            return store.get(key)
+        
+        async def cache_token_user(token_key, user_id, data, expire):
+            store[token_key] = orjson.loads(orjson.dumps(data))
+            store.setdefault(f"auth:user:{user_id}", set()).add(token_key)
+            return True
+        
+        async def drop_token_users(user_id):
+            for key in store.pop(f"auth:user:{user_id}", set()):
+                store.pop(key, None)
+            return True
+        
+        async def delete_many(*keys):
+            for key in keys:
+                store.pop(key, None)
+            return True
+        
+        async def bump_table_versions(tables):
+            return True
+        
+        monkeypatch.setattr(RedisService, "is_connected", True)
+        for name, fake in [
+            ("get_json", get_json),
+            ("cache_token_user", cache_token_user),
+            ("drop_token_users", drop_token_users),
+            ("delete_many", delete_many),
+            ("bump_table_versions", bump_table_versions),
+        ]:
+            monkeypatch.setattr(redis_service, name, fake)
+        monkeypatch.setattr(database, "AsyncSessionLocal", TestSessionLocal)
+        
+        token = create_access_token(str(test_user.id))
+        async with TestSessionLocal() as session:
+            assert await auth_service.get_token_user(session, token=token)
+        
+        # Delete through the request session dependency, which commits
+        session_gen = database.get_db()
+        session = await session_gen.__anext__()
+        await user_crud.delete(session, id=test_user.id)
+        with pytest.raises(StopAsyncIteration):
+            await session_gen.__anext__()
+        
+        async with TestSessionLocal() as session:
+            assert await auth_service.get_token_user(session, token=token) is None
+    
     @pytest.mark.asyncio
     async def test_authenticate_wrong_password(self, db_session: AsyncSession, test_user):
         """Test authentication with wrong password."""
@@ -98,6 +289,21 @@ class TestUserCRUD:
         )
         
         assert updated.full_name == "Updated Name"
+    
+    @pytest.mark.asyncio
+    async def test_get_active_users_keyset(
+        self, db_session: AsyncSession, test_user, test_admin, test_analyst
+    ):
+        """Test keyset pagination over active users."""
+        first = await user_crud.get_active_users(db_session, limit=2)
+        rest = await user_crud.get_active_users(
+            db_session, after_id=first[-1].id, limit=2
+        )
+        
+        ids = [u.id for u in first + rest]
+        assert ids == sorted(
+            [test_user.id, test_admin.id, test_analyst.id]
+        )
 
 
 class TestPostCRUD:
@@ -182,6 +388,93 @@ class TestPostCRUD:
         updated = await post_crud.mark_processed(db_session, post_id=post.id)
         
         assert updated.is_processed is True
+    
+    @pytest.mark.asyncio
+    async def test_written_tables_tracked(self, db_session: AsyncSession):
+        """Writes record their table for cache version bumps."""
+        pop_written_tables(db_session)
+        post_in = PostCreate(
+            platform_id="tracked_post",
+            platform="twitter",
+            content="Content"
+        )
+        await post_crud.create(db_session, obj_in=post_in)
+        
+        assert pop_written_tables(db_session) == {"posts"}
+        assert pop_written_tables(db_session) == set()
+    
+    @pytest.mark.asyncio
+    async def test_api_commit_bumps_table_versions(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        """A commit through the API session dependency bumps ver:posts."""
+        from app.api import deps
+        from app import database
+        from app.services.redis_service import redis_service
+        from tests.conftest import TestSessionLocal
+        
+        bumped = []
+        
+        async def bump_table_versions(tables):
+            bumped.append(set(tables))
+            return True
+        
+        monkeypatch.setattr(database, "AsyncSessionLocal", TestSessionLocal)
+        monkeypatch.setattr(
+            redis_service, "bump_table_versions", bump_table_versions
+        )
+        
+        assert deps.get_db is database.get_db
+        session_gen = deps.get_db()
+        session = await session_gen.__anext__()
+        await post_crud.create(
+            session,
+            obj_in=PostCreate(platform_id="bumped_post", platform="twitter")
+        )
+        # Resuming past the yield runs the request teardown (commit)
+        with pytest.raises(StopAsyncIteration):
+            await session_gen.__anext__()
+        
+        assert bumped == [{"posts"}]
+    
+    @pytest.mark.asyncio
+    async def test_get_stats_totals_agree(self, db_session: AsyncSession):
+        """Test the post total matches its platform breakdown."""
+        for i, platform in enumerate(["twitter", "twitter", "telegram"]):
+            await post_crud.create(
+                db_session,
+                obj_in=PostCreate(platform_id=f"stats_{i}", platform=platform)
+            )
+        await db_session.commit()
+        
+        stats = await post_crud.get_stats(db_session)
+        
+        assert stats["by_platform"] == {"twitter": 2, "telegram": 1}
+        assert stats["total"] == 3
+        assert stats["unprocessed"] == 3 - stats["processed"]
+    
+    @pytest.mark.asyncio
+    async def test_stream_filtered_batches(self, db_session: AsyncSession):
+        """Test filtered posts stream as bounded row batches."""
+        for i in range(5):
+            await post_crud.create(
+                db_session,
+                obj_in=PostCreate(platform_id=f"stream_{i}", platform="stream")
+            )
+        
+        batches = [
+            batch
+            async for batch in post_crud.stream_filtered_batches(
+                db_session,
+                filters=PostFilter(platform="stream"),
+                columns=(Post.id, Post.platform),
+                limit=4,
+                batch_size=3
+            )
+        ]
+        
+        assert [len(b) for b in batches] == [3, 1]
+        assert batches[0][0].platform == "stream"
 
 
 class TestAuthorCRUD:
@@ -261,3 +554,295 @@ class TestDataSourceCRUD:
         sources = await data_source_crud.get_active(db_session)
         
         assert len(sources) >= 1
+
+
+class TestAnalysisResultCRUD:
+    """Tests for AnalysisResult CRUD operations."""
+    
+    @pytest.mark.asyncio
+    async def test_bulk_create(self, db_session: AsyncSession):
+        """Test results are bulk inserted and posts marked processed."""
+        posts = [
+            await post_crud.create(
+                db_session,
+                obj_in=PostCreate(platform_id=f"bulk_{i}", platform="twitter")
+            )
+            for i in range(3)
+        ]
+        
+        results = await result_crud.bulk_create(
+            db_session,
+            results_in=[
+                AnalysisResultCreate(post_id=p.id, analysis_id=1, sentiment_score=0.1)
+                for p in posts
+            ]
+        )
+        marked = await post_crud.mark_many_processed(
+            db_session, post_ids=[p.id for p in posts]
+        )
+        
+        assert [r.post_id for r in results] == [p.id for p in posts]
+        assert all(r.id is not None for r in results)
+        assert marked == 3
+        assert await result_crud.bulk_create(db_session, results_in=[]) == []
+    
+    @pytest.mark.asyncio
+    async def test_clone_results(self, db_session: AsyncSession):
+        """Test an analysis' results are copied to another analysis."""
+        post = await post_crud.create(
+            db_session,
+            obj_in=PostCreate(platform_id="clone_1", platform="twitter")
+        )
+        await result_crud.bulk_create(
+            db_session,
+            results_in=[
+                AnalysisResultCreate(
+                    post_id=post.id,
+                    analysis_id=1,
+                    sentiment_label="positive",
+                    keywords=["a", "b"]
+                )
+            ]
+        )
+        
+        cloned = await result_crud.clone_results(
+            db_session, source_analysis_id=1, target_analysis_id=2
+        )
+        copies = await result_crud.get_by_analysis(db_session, analysis_id=2)
+        
+        assert cloned == 1
+        assert [(r.post_id, r.sentiment_label, r.keywords) for r in copies] == [
+            (post.id, "positive", ["a", "b"])
+        ]
+        assert await result_crud.clone_results(
+            db_session, source_analysis_id=3, target_analysis_id=4
+        ) == 0
+    
+    @pytest.mark.asyncio
+    async def test_get_columns_by_analysis(self, db_session: AsyncSession):
+        """Test numeric result fields are returned one list per column."""
+        post = await post_crud.create(
+            db_session,
+            obj_in=PostCreate(platform_id="columnar_1", platform="twitter")
+        )
+        for score in (0.5, None):
+            await result_crud.create(
+                db_session,
+                obj_in=AnalysisResultCreate(
+                    post_id=post.id,
+                    analysis_id=1,
+                    sentiment_score=score,
+                    node_degree=3
+                )
+            )
+        
+        columns = await result_crud.get_columns_by_analysis(
+            db_session, analysis_id=1
+        )
+        empty = await result_crud.get_columns_by_analysis(
+            db_session, analysis_id=2
+        )
+        
+        assert columns["post_ids"] == [post.id, post.id]
+        assert columns["sentiment_scores"] == [0.5, None]
+        assert columns["node_degrees"] == [3, 3]
+        assert empty["ids"] == [] and empty["community_ids"] == []
+    
+    @pytest.mark.asyncio
+    async def test_summary_reads_see_uncommitted_results(
+        self, db_session: AsyncSession
+    ):
+        """Test gathered summary reads see rows written in the same session."""
+        post = await post_crud.create(
+            db_session,
+            obj_in=PostCreate(platform_id="summary_1", platform="twitter")
+        )
+        await result_crud.bulk_create(
+            db_session,
+            results_in=[
+                AnalysisResultCreate(
+                    post_id=post.id,
+                    analysis_id=5,
+                    sentiment_label="positive",
+                    keywords=["a", "b"]
+                )
+            ]
+        )
+        
+        total, keywords = await gather_reads(db_session, [
+            partial(result_crud.count_by_analysis, analysis_id=5),
+            partial(result_crud.aggregate_keywords, analysis_id=5)
+        ])
+        
+        assert total == 1
+        assert [k["keyword"] for k in keywords] == ["a", "b"]
+    
+    @pytest.mark.asyncio
+    async def test_get_summary_bundle(self, db_session: AsyncSession):
+        """Test all summary aggregates come back from one statement."""
+        post = await post_crud.create(
+            db_session,
+            obj_in=PostCreate(platform_id="bundle_1", platform="twitter")
+        )
+        await result_crud.bulk_create(
+            db_session,
+            results_in=[
+                AnalysisResultCreate(
+                    post_id=post.id,
+                    analysis_id=6,
+                    sentiment_label=label,
+                    sentiment_score=score,
+                    dominant_emotion="joy",
+                    keywords=keywords
+                )
+                for label, score, keywords in (
+                    ("positive", 0.8, ["x", "y"]),
+                    ("negative", -0.4, ["y"]),
+                    ("positive", None, None)
+                )
+            ]
+        )
+        
+        bundle = await result_crud.get_summary_bundle(db_session, analysis_id=6)
+        
+        assert bundle["total"] == 3
+        assert bundle["average_sentiment"] == pytest.approx(0.2)
+        assert bundle["sentiment_distribution"] == {"positive": 2, "negative": 1}
+        assert bundle["emotion_distribution"] == {"joy": 3}
+        assert bundle["top_keywords"] == [
+            {"keyword": "y", "count": 2},
+            {"keyword": "x", "count": 1}
+        ]
+
+    
+    @pytest.mark.asyncio
+    async def test_get_label_rollup(self, db_session: AsyncSession):
+        """Test totals per (sentiment, emotion), with NULL labels as ''."""
+        post = await post_crud.create(
+            db_session,
+            obj_in=PostCreate(platform_id="rollup_1", platform="twitter")
+        )
+        await result_crud.bulk_create(
+            db_session,
+            results_in=[
+                AnalysisResultCreate(
+                    post_id=post.id,
+                    analysis_id=7,
+                    sentiment_label=label,
+                    sentiment_score=score,
+                    dominant_emotion=emotion
+                )
+                for label, score, emotion in (
+                    ("positive", 0.8, "joy"),
+                    ("positive", None, "joy"),
+                    (None, None, "anger")
+                )
+            ]
+        )
+        
+        rows = await result_crud.get_label_rollup(db_session)
+        
+        assert sorted(tuple(row) for row in rows) == [
+            ("", "anger", 1, 0.0, 0),
+            ("positive", "joy", 2, pytest.approx(0.8), 1)
+        ]
+
+
+class TestGraphNodeCRUD:
+    """Tests for GraphNode CRUD operations."""
+    
+    @pytest.mark.asyncio
+    async def test_bulk_set_metric(self, db_session: AsyncSession):
+        """Test setting one metric on many nodes by node_id."""
+        await node_crud.bulk_create(
+            db_session,
+            nodes_in=[
+                GraphNodeCreate(node_id=f"author:{i}", node_type="author")
+                for i in range(3)
+            ]
+        )
+        
+        updated = await node_crud.bulk_set_metric(
+            db_session,
+            metric="pagerank",
+            values_by_node_id=[
+                ("author:0", 0.5), ("author:2", 0.25), ("missing", 1.0)
+            ]
+        )
+        
+        assert updated == 2
+        result = await db_session.execute(
+            select(GraphNode.node_id, GraphNode.pagerank)
+            .order_by(GraphNode.node_id)
+        )
+        assert result.all() == [
+            ("author:0", 0.5), ("author:1", None), ("author:2", 0.25)
+        ]
+        with pytest.raises(ValueError):
+            await node_crud.bulk_set_metric(
+                db_session, metric="node_id", values_by_node_id=[]
+            )
+    
+    @pytest.mark.asyncio
+    async def test_bulk_update_metrics(self, db_session: AsyncSession):
+        """Test metric dicts are applied by node_id and left unchanged."""
+        await node_crud.bulk_create(
+            db_session,
+            nodes_in=[
+                GraphNodeCreate(node_id=f"tag:{i}", node_type="hashtag")
+                for i in range(2)
+            ]
+        )
+        metrics = [
+            {"node_id": "tag:1", "pagerank": 0.75, "community_id": 3},
+            {"node_id": "missing", "pagerank": 1.0},
+            {"pagerank": 1.0},
+        ]
+        
+        updated = await node_crud.bulk_update_metrics(
+            db_session, metrics=metrics
+        )
+        
+        assert updated == 1
+        assert metrics[0]["node_id"] == "tag:1"
+        node = await node_crud.get_by_node_id(db_session, node_id="tag:1")
+        assert (node.pagerank, node.community_id) == (0.75, 3)
+    
+    @pytest.mark.asyncio
+    async def test_edge_bulk_create_preload_is_opt_in(
+        self, db_session: AsyncSession
+    ):
+        """Test edge upserts only load endpoint nodes when asked to."""
+        nodes = await node_crud.bulk_create(
+            db_session,
+            nodes_in=[
+                GraphNodeCreate(node_id=f"user:{i}", node_type="author")
+                for i in range(2)
+            ]
+        )
+        source_id, target_id = (n.id for n in nodes)
+        edges_in = [
+            GraphEdgeCreate(
+                source_id=source_id, target_id=target_id, edge_type="mention"
+            )
+        ] * 2
+        statements = []
+        
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+        
+        sync_engine = db_session.get_bind()
+        event.listen(sync_engine, "before_cursor_execute", count)
+        try:
+            [edge] = await edge_crud.bulk_create(db_session, edges_in=edges_in)
+            occurrences = edge.occurrence_count
+            without_preload = len(statements)
+            await edge_crud.bulk_create(
+                db_session, edges_in=edges_in, preload_nodes=True
+            )
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", count)
+        
+        assert occurrences == 2
+        assert without_preload == 1
+        assert len(statements) == 3
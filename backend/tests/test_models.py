@@ -1,6 +1,8 @@
 import pytest
 from datetime import datetime
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.models.user import User, UserRole
 from app.models.data_source import DataSource, SourcePlatform
@@ -165,6 +167,31 @@ class TestAnalysisModel:
         assert analysis.name == "Test Analysis"
         assert analysis.status == AnalysisStatus.PENDING
     
+    @pytest.mark.asyncio
+    async def test_user_analyses_selectinload(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        """Test user analyses can be eager-loaded as a collection."""
+        db_session.add_all([
+            Analysis(
+                name=f"Analysis {i}",
+                analysis_type=AnalysisType.SENTIMENT,
+                user_id=test_user.id
+            )
+            for i in range(2)
+        ])
+        await db_session.commit()
+        
+        result = await db_session.execute(
+            select(User)
+            .where(User.id == test_user.id)
+            .options(selectinload(User.analyses))
+            .execution_options(populate_existing=True)
+        )
+        user = result.scalar_one()
+        
+        assert len(user.analyses) == 2
+    
     @pytest.mark.asyncio
     async def test_analysis_status_enum(self, db_session: AsyncSession):
         """Test analysis status values."""
@@ -1,10 +1,27 @@
+import json
+from datetime import datetime, timezone
+from typing import get_args
+
 import pytest
 from pydantic import ValidationError
 
 from app.schemas.user import UserCreate, UserUpdate
-from app.schemas.post import PostCreate, PostFilter
-from app.schemas.analysis import AnalysisCreate, AnalysisConfig
-from app.models.analysis import AnalysisType
+from app.schemas.post import (
+    PostCreate,
+    PostFilter,
+    PostBrief,
+    PostResponse,
+    PostResponseEpoch,
+    POST_LIST_ADAPTER
+)
+from app.schemas.analysis import AnalysisCreate, AnalysisConfig, AnalysisWithUser
+from app.schemas.user import UserBrief
+from app.schemas.graph import PageRankResult
+from app.schemas.dashboard import DashboardCreate, WidgetType
+from app.models.analysis import Analysis, AnalysisType, AnalysisStatus
+from app.models.user import User
+from app.models.post import Post
+from app.services.dashboard_service import DEFAULT_WIDGETS, dashboard_service
 
 
 class TestUserSchemas:
@@ -93,6 +110,53 @@ class TestPostSchemas:
         
         assert filter.platform == "twitter"
         assert filter.is_processed is False
+    
+    def test_post_brief_preview(self):
+        """Test post brief truncates long content into a preview."""
+        long_post = Post(id=1, platform="twitter", content="x" * 150)
+        short_post = Post(id=2, platform="twitter", content="short")
+        
+        assert PostBrief.from_post(long_post).content_preview == "x" * 100 + "..."
+        assert PostBrief.from_post(short_post).content_preview == "short"
+        assert PostBrief.from_orm_trusted(short_post).content_preview == "short"
+    
+    def test_post_response_epoch(self):
+        """Test epoch mode rewrites post timestamps to integer seconds."""
+        row = {
+            "id": 1,
+            "posted_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            "created_at": datetime(2024, 1, 1),
+            "updated_at": None
+        }
+        
+        PostResponseEpoch.to_epoch(row)
+        
+        assert row["posted_at"] == 1704067200
+        assert row["created_at"] == 1704067200
+        assert row["updated_at"] is None
+    
+    def test_post_list_adapter_dumps_trusted(self):
+        """Test the shared list adapter serializes trusted post rows."""
+        post = Post(
+            id=1,
+            platform_id="p1",
+            platform="twitter",
+            content="hello",
+            language="fa",
+            likes_count=0,
+            comments_count=0,
+            shares_count=0,
+            views_count=0,
+            is_processed=False,
+            posted_at=datetime(2024, 1, 1, tzinfo=timezone.utc)
+        )
+        
+        data = json.loads(
+            POST_LIST_ADAPTER.dump_json([PostResponse.from_orm_trusted(post)])
+        )
+        
+        assert data[0]["id"] == 1
+        assert data[0]["posted_at"] == "2024-01-01T00:00:00Z"
 
 
 class TestAnalysisSchemas:
@@ -126,3 +190,74 @@ class TestAnalysisSchemas:
         
         assert config.sentiment_enabled is False
         assert config.num_topics == 20
+    
+    def test_analysis_config_shares_default_lists(self):
+        """Test list defaults are shared immutable tuples."""
+        first = AnalysisConfig()
+        second = AnalysisConfig(entity_types=["person"])
+        
+        assert first.emotion_categories is AnalysisConfig().emotion_categories
+        assert second.entity_types == ("person",)
+        assert first.model_dump()["emotion_categories"][0] == "joy"
+    
+    def test_from_orm_trusted_nested(self):
+        """Test trusted construction builds nested schemas from ORM rows."""
+        analysis = Analysis(
+            id=1,
+            name="Trusted",
+            analysis_type=AnalysisType.FULL,
+            status=AnalysisStatus.PENDING,
+            progress=0.0,
+            post_count=0,
+            user_id=2,
+            user=User(id=2, username="owner", full_name="Owner")
+        )
+        response = AnalysisWithUser.from_orm_trusted(analysis)
+        
+        assert isinstance(response.user, UserBrief)
+        assert response.user.username == "owner"
+        assert AnalysisWithUser.model_validate(
+            response.model_dump()
+        ) == AnalysisWithUser.model_validate(analysis)
+
+
+class TestDashboardSchemas:
+    """Tests for dashboard schemas."""
+    
+    def test_default_widgets_validate(self):
+        """Test the auto-created dashboard's widgets pass validation."""
+        dashboard = DashboardCreate(name="x", widgets=DEFAULT_WIDGETS)
+        
+        assert [w.widget_type for w in dashboard.widgets] == [
+            w["widget_type"] for w in DEFAULT_WIDGETS
+        ]
+    
+    def test_unknown_widget_type_rejected(self):
+        """Test widget types the service cannot serve are rejected."""
+        widget = {**DEFAULT_WIDGETS[0], "widget_type": "chart"}
+        with pytest.raises(ValidationError):
+            DashboardCreate(name="x", widgets=[widget])
+    
+    @pytest.mark.asyncio
+    async def test_every_widget_type_is_served(self, db_session):
+        """Test get_widget_data handles every allowed widget type."""
+        for widget_type in get_args(WidgetType):
+            data = await dashboard_service.get_widget_data(
+                db_session, widget_type=widget_type
+            )
+            assert not (isinstance(data, dict) and "error" in data), widget_type
+
+
+class TestBaseSchemas:
+    """Tests for shared base schemas."""
+    
+    def test_float32_serializes_fewer_digits(self):
+        """Test Float32 scores keep full precision in Python, not in JSON."""
+        result = PageRankResult(
+            node_id="n1",
+            pagerank_score=0.123456789123,
+            node_type="user"
+        )
+        
+        assert result.pagerank_score == 0.123456789123
+        assert json.loads(result.model_dump_json())["pagerank_score"] == 0.1234568
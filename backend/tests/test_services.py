@@ -0,0 +1,147 @@
+import importlib
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services import tasks
+from app.services.brain_service import BrainService, BrainServiceError
+from app.services.dashboard_service import DEFAULT_WIDGETS, dashboard_service
+from app.services.redis_service import redis_service
+
+# The package re-exports the service singleton under the module name
+graph_module = importlib.import_module("app.services.graph_service")
+
+
+class TestBrainService:
+    """Tests for the BRAIN HTTP client."""
+    
+    @pytest.mark.asyncio
+    async def test_client_pool_limits(self):
+        """Test the configured pool limits reach the transport."""
+        service = BrainService()
+        client = await service._get_client()
+        try:
+            pool = client._transport._pool
+            assert pool._max_connections == settings.BRAIN_MAX_CONNECTIONS
+            assert (
+                pool._max_keepalive_connections
+                == settings.BRAIN_MAX_KEEPALIVE_CONNECTIONS
+            )
+            assert pool._keepalive_expiry == settings.BRAIN_KEEPALIVE_EXPIRY
+        finally:
+            await service.close()
+
+
+class TestAnalysisMemo:
+    """Tests for reusing identical analyses in the Celery pipeline."""
+    
+    def test_fingerprint(self):
+        """Test fingerprints ignore key order but see new posts."""
+        fingerprint = tasks._analysis_fingerprint(
+            {"platform": "twitter", "language": "fa"}, {}, 100, 7
+        )
+        assert fingerprint == tasks._analysis_fingerprint(
+            {"language": "fa", "platform": "twitter"}, {}, 100, 7
+        )
+        assert fingerprint != tasks._analysis_fingerprint(
+            {"platform": "twitter", "language": "fa"}, {}, 100, 8
+        )
+    
+    def test_unknown_fingerprint_kept_for_publishing(self, monkeypatch):
+        """Test a new fingerprint is stored for finalize_analysis."""
+        store = {}
+        
+        class FakeRedis:
+            def get(self, key):
+                return store.get(key)
+            
+            def set(self, key, value, ex=None):
+                store[key] = value
+        
+        monkeypatch.setattr(tasks, "_get_redis", FakeRedis)
+        
+        assert tasks._reuse_prior_results(None, 5, "abc") == 0
+        assert store == {"analysis:5:fingerprint": "abc"}
+
+
+class TestGraphService:
+    """Tests for coalescing BRAIN graph calls across workers."""
+    
+    @pytest.mark.asyncio
+    async def test_waiter_releases_connection(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        """Test waiting on another worker's BRAIN call holds no transaction."""
+        cached = [None, None, {"done": True}]
+        in_transaction = []
+        
+        async def get_json(key):
+            return cached.pop(0)
+        
+        async def acquire_lock(key, expire):
+            return None
+        
+        async def sleep(delay):
+            in_transaction.append(db_session.in_transaction())
+        
+        monkeypatch.setattr(redis_service, "get_json", get_json)
+        monkeypatch.setattr(redis_service, "acquire_lock", acquire_lock)
+        monkeypatch.setattr(graph_module, "_sleep", sleep)
+        
+        result = await graph_module.graph_service._brain_graph_result(
+            db_session, kind="pagerank", call=None
+        )
+        
+        assert result == {"done": True}
+        assert in_transaction == [False, False]
+    
+    @pytest.mark.asyncio
+    async def test_waiter_never_recomputes(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        """Test a waiter gives up after the lock TTL instead of computing."""
+        async def get_json(key):
+            return None
+        
+        async def acquire_lock(key, expire):
+            return None
+        
+        async def call(**kwargs):
+            raise AssertionError("waiter called BRAIN")
+        
+        monkeypatch.setattr(redis_service, "get_json", get_json)
+        monkeypatch.setattr(redis_service, "acquire_lock", acquire_lock)
+        # Already past the deadline on the first poll
+        monkeypatch.setattr(graph_module, "GRAPH_LOCK_TTL", -1)
+        
+        with pytest.raises(BrainServiceError):
+            await graph_module.graph_service._brain_graph_result(
+                db_session, kind="pagerank", call=call
+            )
+
+
+class TestDashboardService:
+    """Tests for dashboard widget data."""
+    
+    @pytest.mark.asyncio
+    async def test_identical_widgets_fetched_once(self, db_session, monkeypatch):
+        """Test repeated widgets share one fetch and keep their order."""
+        fetched = []
+        
+        async def get_widget_data(db, *, widget_type, config=None):
+            fetched.append(widget_type)
+            return widget_type
+        
+        monkeypatch.setattr(dashboard_service, "get_widget_data", get_widget_data)
+        widgets = [
+            {**DEFAULT_WIDGETS[1], "widget_id": f"s{i}"} for i in range(3)
+        ] + [DEFAULT_WIDGETS[0]]
+        
+        data = await dashboard_service.get_widgets_data(
+            db_session, widgets=widgets
+        )
+        
+        assert sorted(fetched) == ["overview", "sentiment_chart"]
+        assert [d["widget_id"] for d in data] == ["s0", "s1", "s2", "overview-1"]
+        assert [d["data"] for d in data] == ["sentiment_chart"] * 3 + ["overview"]
@@ -36,6 +36,8 @@ from app.utils.security import (
 from app.utils.json import (
     json_dumps,
     json_loads,
+    orjson_dumps_str,
+    orjson_loads,
     safe_json_loads,
     flatten_json,
     unflatten_json
@@ -270,6 +272,14 @@ class TestJsonUtils:
         
         assert "2024-01-15" in json_str
     
+    def test_orjson_dumps_str_roundtrip(self):
+        """Test the database JSON serializer returns str and keeps data."""
+        data = {"joy": 0.8, 1: ["a", "b"]}
+        json_str = orjson_dumps_str(data)
+        
+        assert isinstance(json_str, str)
+        assert orjson_loads(json_str) == {"joy": 0.8, "1": ["a", "b"]}
+    
     def test_safe_json_loads(self):
         """Test safe JSON loading."""
         valid = safe_json_loads('{"key": "value"}')
@@ -14,11 +14,33 @@ router = APIRouter(prefix="/batch", tags=["Batch Processing"])
 batch_jobs: Dict[str, Dict[str, Any]] = {}
 
 
+class PostColumns(BaseModel):
+    ids: List[int]
+    contents: List[Optional[str]]
+    platforms: List[str]
+    posted_at_ts: List[Optional[int]]  # Epoch seconds
+
+
 class BatchAnalysisRequest(BaseModel):
     analysis_id: int
-    posts: List[Dict[str, Any]]
+    posts: List[Dict[str, Any]] = []
+    post_columns: Optional[PostColumns] = None
     config: Dict[str, Any]
     callback_url: Optional[str] = None
+    
+    def iter_posts(self):
+        """Yield (post_id, content) from row-wise posts or columnar posts."""
+        if self.post_columns is not None:
+            columns = self.post_columns
+            for post_id, content in zip(columns.ids, columns.contents):
+                yield str(post_id), content or ""
+        for i, post in enumerate(self.posts):
+            yield str(post.get("id", i)), post.get("content", "")
+    
+    @property
+    def post_count(self) -> int:
+        columnar = len(self.post_columns.ids) if self.post_columns else 0
+        return columnar + len(self.posts)
 
 
 class TrendDetectionRequest(BaseModel):
@@ -35,15 +57,12 @@ async def process_batch_job(task_id: str, request: BatchAnalysisRequest):
     batch_jobs[task_id]["progress"] = 0
     
     results = []
-    total = len(request.posts)
+    total = request.post_count
     
-    for i, post in enumerate(request.posts):
+    for i, (post_id, content) in enumerate(request.iter_posts()):
         # Simulate processing delay
         await asyncio.sleep(random.uniform(0.01, 0.05))
         
-        post_id = str(post.get("id", i))
-        content = post.get("content", "")
-        
         result = generate_full_analysis(post_id, content)
         results.append(result)
         
@@ -68,7 +87,7 @@ async def submit_batch_analysis(
         "analysis_id": request.analysis_id,
         "status": "queued",
         "progress": 0,
-        "total_posts": len(request.posts),
+        "total_posts": request.post_count,
         "results": None
     }
     
@@ -79,7 +98,7 @@ async def submit_batch_analysis(
         "analysis_id": request.analysis_id,
         "task_id": task_id,
         "status": "queued",
-        "message": f"Batch job queued for {len(request.posts)} posts"
+        "message": f"Batch job queued for {request.post_count} posts"
     }
 
 